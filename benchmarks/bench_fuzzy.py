@@ -0,0 +1,76 @@
+# benchmarks/bench_fuzzy.py
+#
+# Micro-benchmark: fuzzy.suggest (linear scan) vs fuzzy.SuggestionIndex
+# as the number of candidate columns grows.
+#
+#   python -m benchmarks.bench_fuzzy [--sizes 1000,10000,100000] [--queries 50]
+
+import argparse
+import random
+import string
+import time
+from src.fuzzy import suggest, SuggestionIndex
+
+WORDS = [
+    "employee", "department", "name", "id", "salary", "email", "location", "created",
+    "updated", "at", "user", "order", "total", "amount", "status", "code", "type",
+    "first", "last", "address", "city", "country", "zip", "phone", "account", "balance",
+]
+
+
+def make_candidates(n, rng):
+    cands = []
+    for i in range(n):
+        parts = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        cands.append("_".join(parts) + (f"_{i % 97}" if i % 3 == 0 else ""))
+    return cands
+
+
+def make_typo(name, rng):
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return "".join(chars) or "x"
+
+
+def run(sizes, n_queries, seed=0):
+    rng = random.Random(seed)
+    print(f"{'candidates':>10} {'build ms':>9} {'linear ms/q':>12} {'index ms/q':>11} {'speedup':>8}")
+
+    for size in sizes:
+        cands = make_candidates(size, rng)
+        queries = [make_typo(rng.choice(cands), rng) for _ in range(n_queries)]
+
+        start = time.perf_counter()
+        index = SuggestionIndex(cands)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [suggest(q, cands) for q in queries]
+        linear = (time.perf_counter() - start) / n_queries
+
+        start = time.perf_counter()
+        actual = [index.suggest(q) for q in queries]
+        indexed = (time.perf_counter() - start) / n_queries
+
+        if actual != expected:
+            raise SystemExit(f"❌ SuggestionIndex results differ from suggest() at size {size}")
+
+        print(
+            f"{size:>10} {build * 1000:>9.1f} {linear * 1000:>12.2f} "
+            f"{indexed * 1000:>11.2f} {linear / indexed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    run([int(s) for s in args.sizes.split(",")], args.queries, args.seed)
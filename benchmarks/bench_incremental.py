@@ -0,0 +1,83 @@
+# benchmarks/bench_incremental.py
+#
+# Update latency of IncrementalDocument on a large module: one full analysis,
+# then single-line edits inside methods (each re-analyzing only the edit),
+# compared with re-parsing the whole buffer every time.
+#
+#   python -m benchmarks.bench_incremental [--classes 25] [--methods 28] [--edits 200]
+
+import argparse
+import time
+from pathlib import Path
+from src.ast_parser import PythonSQLParser
+from src.incremental import IncrementalDocument
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+METHOD = '''    def method_{m}(self, db, x):
+        """Load row {m}."""
+        y = x + {m}
+        if y > 3:
+            db.execute("SELECT employee_name FROM employees WHERE employee_id = {m}")
+        return y
+
+'''
+
+
+def make_module(n_classes, n_methods):
+    parts = []
+    for c in range(n_classes):
+        parts.append(f"class Repository{c}:\n")
+        parts.extend(METHOD.format(m=m) for m in range(n_methods))
+        parts.append("\n")
+    return "".join(parts)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(n_classes, n_methods, n_edits):
+    validator = SQLValidator(str(ROOT / "schema.json"), str(ROOT / "default_config.yaml"))
+    lines = make_module(n_classes, n_methods).splitlines(True)
+    anchors = [i for i, line in enumerate(lines) if "y = x +" in line]
+
+    doc = IncrementalDocument(validator, "module.py")
+    start = time.perf_counter()
+    doc.update("".join(lines))
+    initial = time.perf_counter() - start
+
+    incremental, full = [], []
+    for n in range(min(n_edits, len(anchors))):
+        at = anchors[n] + n  # earlier edits each inserted one line above
+        lines.insert(at + 1, "        z = 'SELECT employe_name FROM employees'\n")
+        text = "".join(lines)
+
+        start = time.perf_counter()
+        doc.update(text, at + 2, at + 2)
+        incremental.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for q in PythonSQLParser("module.py").parse_source(text):
+            validator.validate(q["query"], "module.py", q["line"])
+        full.append(time.perf_counter() - start)
+
+    if doc.syntax_error is not None:
+        raise SystemExit(f"❌ Unexpected syntax error: {doc.syntax_error}")
+
+    print(f"{len(lines)} lines, {len(doc.queries)} queries, initial analysis {initial * 1000:.1f} ms")
+    for name, times in (("full re-parse", full), ("incremental", incremental)):
+        print(f"  {name:<14} median {percentile(times, 0.5) * 1000:>7.2f} ms   "
+              f"p95 {percentile(times, 0.95) * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--classes", type=int, default=25)
+    ap.add_argument("--methods", type=int, default=28, help="methods per class")
+    ap.add_argument("--edits", type=int, default=200)
+    args = ap.parse_args()
+
+    run(args.classes, args.methods, args.edits)
@@ -0,0 +1,120 @@
+# benchmarks/bench_memory.py
+#
+# Memory of the in-memory model (src/model.py) against the plain dicts it
+# replaced: a synthetic schema loaded as dicts vs Tables/Columns, and
+# diagnostics fanned out to many call sites as eight-key dicts vs
+# Diagnostics. Retained bytes are measured with tracemalloc.
+#
+#   python -m benchmarks.bench_memory [--columns 100000] [--diagnostics 100000]
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from benchmarks.synthetic import make_query, make_schema, write_schema
+from src.model import Diagnostic, schema_object
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(build):
+    """(retained bytes, seconds) of build(); the result is kept alive while measuring."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, seconds
+
+
+def issue_templates(schema_path, schema, rng, count=500):
+    """Memoized issues of a validator, as validate() fans them out."""
+    validator = SQLValidator(str(schema_path), str(ROOT / "default_config.yaml"))
+    tables = list(schema)
+    templates = []
+    while len(templates) < count:
+        query = make_query(schema, tables, rng, typo_share=1.0, mismatch_share=0.3)
+        templates.extend(validator._collect_issues(query))
+    return templates[:count]
+
+
+def report(name, dict_result, model_result):
+    (dict_bytes, dict_seconds), (model_bytes, model_seconds) = dict_result, model_result
+    print(f"{name}")
+    print(f"  dicts   {dict_bytes / 1e6:>8.1f} MB  {dict_seconds * 1000:>8.1f} ms")
+    print(f"  model   {model_bytes / 1e6:>8.1f} MB  {model_seconds * 1000:>8.1f} ms"
+          f"   ({model_bytes / dict_bytes:.0%} of the memory)")
+
+
+def run(n_columns, n_diagnostics, seed):
+    rng = random.Random(seed)
+    schema = make_schema(n_columns, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_path = Path(tmp) / "schema.json"
+        write_schema(schema_path, schema)
+
+        def load_dicts():
+            with open(schema_path) as f:
+                return json.load(f)
+
+        def load_model():
+            with open(schema_path) as f:
+                return json.load(f, object_pairs_hook=schema_object)
+
+        report(f"schema: {len(schema)} tables, {n_columns} columns",
+               measure(load_dicts), measure(load_model))
+
+        templates = issue_templates(schema_path, schema, rng)
+
+    sites = [(f"app/module_{i % 1000}.py", i) for i in range(n_diagnostics)]
+    issue_dicts = [
+        {"message": t.message, "offending": t.offending, "suggestion": t.suggestion, "severity": t.severity,
+         "line": None, "start_col": None, "end_col": None}
+        for t in templates
+    ]
+
+    def fan_out_dicts():
+        # The former validate() output: one eight-key dict per diagnostic
+        return [
+            {
+                "file": file,
+                "line": line,
+                "offending": e.get("offending"),
+                "start_col": e.get("start_col"),
+                "end_col": e.get("end_col"),
+                "message": e["message"],
+                "suggestion": e.get("suggestion"),
+                "severity": e.get("severity", "error"),
+            }
+            for (file, line), e in zip(sites, issue_dicts * (n_diagnostics // len(issue_dicts) + 1))
+        ]
+
+    def fan_out_model():
+        return [t.at(file, line) for (file, line), t in zip(sites, templates * (n_diagnostics // len(templates) + 1))]
+
+    report(f"diagnostics: {n_diagnostics} from {len(templates)} distinct issues",
+           measure(fan_out_dicts), measure(fan_out_model))
+
+    # Serialization at the output boundary, for reference
+    diagnostics = fan_out_model()
+    start = time.perf_counter()
+    json.dumps({"errors": [d.to_dict() for d in diagnostics]})
+    print(f"  JSON output of the model: {(time.perf_counter() - start) * 1000:.1f} ms")
+    assert isinstance(diagnostics[0], Diagnostic)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--columns", type=int, default=100_000)
+    ap.add_argument("--diagnostics", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    run(args.columns, args.diagnostics, args.seed)
@@ -0,0 +1,101 @@
+# benchmarks/bench_parser.py
+#
+# Files/sec of PythonSQLParser.parse_file on a synthetic corpus, compared with
+# the previous implementation (ast.parse + ast.walk + upper() on every string).
+#
+#   python -m benchmarks.bench_parser [--files 2000] [--sql-share 0.1]
+
+import argparse
+import ast
+import random
+import tempfile
+import time
+from pathlib import Path
+from src.ast_parser import PythonSQLParser
+
+PLAIN_FUNCTION = '''
+def handler_{i}(request, items):
+    """Process request {i} and return a summary of the items."""
+    total = 0
+    for item in items:
+        if item.get("kind") == "widget":
+            total += item["price"] * item.get("qty", 1)
+    message = "processed %d items for %s" % (len(items), request.user)
+    return {{"total": total, "message": message, "id": {i}}}
+'''
+
+SQL_FUNCTION = '''
+def query_{i}(db, employee_id):
+    """Fetch employee {i}."""
+    return db.execute("SELECT employee_name, email FROM employees WHERE employee_id = %s", (employee_id,))
+'''
+
+
+def previous_parse_file(file_path):
+    """The parser before the pre-scan: always parse, upper() every string."""
+    sql_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "TRUNCATE"]
+    with open(file_path, "r") as f:
+        source_code = f.read()
+    try:
+        tree = ast.parse(source_code, filename=file_path)
+    except SyntaxError:
+        return []
+
+    queries = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            upper_string = node.value.lstrip().upper()
+            if any(upper_string.startswith(k) for k in sql_keywords):
+                queries.append({"query": node.value, "line": node.lineno, "file": file_path})
+    return queries
+
+
+def make_corpus(root, n_files, sql_share, functions_per_file, rng):
+    files = []
+    for n in range(n_files):
+        has_sql = rng.random() < sql_share
+        body = []
+        for i in range(functions_per_file):
+            body.append(PLAIN_FUNCTION.format(i=i))
+        if has_sql:
+            body.insert(rng.randrange(len(body) + 1), SQL_FUNCTION.format(i=n))
+
+        path = Path(root) / f"module_{n}.py"
+        path.write_text("".join(body))
+        files.append(str(path))
+    return files
+
+
+def files_per_second(parse, files):
+    start = time.perf_counter()
+    found = 0
+    for file_path in files:
+        found += len(parse(file_path))
+    return len(files) / (time.perf_counter() - start), found
+
+
+def run(n_files, sql_share, functions_per_file, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as root:
+        files = make_corpus(root, n_files, sql_share, functions_per_file, rng)
+
+        before, found_before = files_per_second(previous_parse_file, files)
+        after, found_after = files_per_second(lambda p: PythonSQLParser(p).parse_file(), files)
+
+    if found_before != found_after:
+        raise SystemExit(f"❌ Query counts differ: before={found_before} after={found_after}")
+
+    print(f"{n_files} files, {sql_share:.0%} with SQL, {found_after} queries")
+    print(f"  before: {before:>10.0f} files/sec")
+    print(f"  after:  {after:>10.0f} files/sec  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--sql-share", type=float, default=0.1)
+    ap.add_argument("--functions", type=int, default=20, help="functions per file")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    run(args.files, args.sql_share, args.functions, args.seed)
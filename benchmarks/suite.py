@@ -0,0 +1,304 @@
+# benchmarks/suite.py
+#
+# Stage-by-stage benchmark on a synthetic schema and codebase
+# (benchmarks/synthetic.py), with machine-readable results and a regression
+# check against a stored baseline.
+#
+#   python -m benchmarks.suite [--preset smoke|default|large] [--columns N] [--files N]
+#                              [--output results.json] [--baseline benchmarks/baseline.json]
+#                              [--threshold 0.25] [--repeat 5] [--min-time 2]
+#                              [--min-delta 0.02] [--confirm 2] [--save-baseline]
+#
+# Stages: parse_file, analyze, check_tables, check_columns, fuzzy.suggest and
+# end-to-end check (check_files, one process, no cache). Each stage runs at
+# least --repeat times and until --min-time seconds are spent on it, with the
+# garbage collector off while timing. Wall clock is noisy on shared machines
+# (runs of one tree vary by over 50%, in stretches of seconds), so stages are
+# run in interleaved rounds, spreading each stage's runs over the whole
+# benchmark, and the best run is compared with the baseline; the median is
+# reported alongside. A stage may exceed the threshold by --min-delta seconds,
+# which keeps short stages from failing on a few milliseconds; a slowdown
+# beyond that is re-measured up to --confirm times (keeping each stage's best)
+# before it counts, and --save-baseline records the best of as many runs.
+# Exit status is 1 when a stage is still slower than the baseline, 2 when the
+# baseline was recorded with different workload parameters.
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.synthetic import make_schema, make_typo, write_schema, write_tree
+from src.ast_parser import PythonSQLParser
+from src.fuzzy import suggest
+from src.runner import check_files, discover_files
+from src.sql_analyzer import SQLAnalyzer
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = str(ROOT / "default_config.yaml")
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SUITE_VERSION = 2
+MAX_RUNS = 100
+
+PRESETS = {
+    "smoke": {"columns": 1_000, "files": 100},
+    "default": {"columns": 10_000, "files": 1_000},
+    "large": {"columns": 100_000, "files": 50_000},
+}
+
+
+# Parameters that only change how stages are timed, not what they measure
+TIMING_PARAMS = ("repeat", "min_time")
+
+
+def timed_run(fn):
+    """(wall time, result) of one call, with the garbage collector off."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_stages(params):
+    rng = random.Random(params["seed"])
+    runs = {}  # stage -> (fn, items, wall times)
+
+    def measure(name, fn, items):
+        """First run of a stage (its result feeds the next stages); more runs follow in rounds."""
+        elapsed, result = timed_run(fn)
+        runs[name] = (fn, items, [elapsed])
+        return result
+
+    def needs_runs(times):
+        return len(times) < params["repeat"] or (sum(times) < params["min_time"] and len(times) < MAX_RUNS)
+
+    with tempfile.TemporaryDirectory() as root:
+        schema = make_schema(params["columns"], rng)
+        schema_path = str(Path(root) / "schema.json")
+        write_schema(schema_path, schema)
+        files = write_tree(
+            Path(root) / "src", schema, params["files"], rng,
+            sql_share=params["sql_share"], typo_share=params["typo_share"],
+            mismatch_share=params["mismatch_share"],
+        )
+        validator = SQLValidator(schema_path, CONFIG_PATH)
+
+        # ---------------- parse_file ----------------
+        queries = measure("parse_file", lambda: [
+            q for f in files for q in PythonSQLParser(f).parse_file()
+        ], len(files))
+
+        # ---------------- analyze ----------------
+        engine = validator.analyzer_engine
+        analyzed = measure("analyze", lambda: [
+            SQLAnalyzer(q["query"], engine=engine).analyze() for q in queries
+        ], len(queries))
+
+        # ---------------- check_tables / check_columns ----------------
+        measure("check_tables", lambda: [validator.check_tables(a["tables"]) for a in analyzed], len(analyzed))
+
+        resolved = [
+            ([t for t in a["tables"] if t in validator.index.tables], a["columns"])
+            for a in analyzed
+        ]
+        measure("check_columns", lambda: [validator.check_columns(t, c) for t, c in resolved], len(resolved))
+
+        # ---------------- fuzzy.suggest ----------------
+        # The two lookups check_columns makes for an unknown column:
+        # the referenced table's columns, then the schema-wide index
+        tables = list(schema)
+        probes = []
+        for _ in range(params["fuzzy_probes"]):
+            table = rng.choice(tables)
+            column = rng.choice(schema[table]["columns"])["name"]
+            probes.append((make_typo(column, rng), validator.index.columns_of([table])))
+        column_index = validator.index.column_suggestions
+        measure("fuzzy.suggest", lambda: [
+            suggest(bad, candidates) or column_index.suggest(bad) for bad, candidates in probes
+        ], len(probes))
+
+        # ---------------- end-to-end check ----------------
+        def end_to_end():
+            discovered = discover_files(Path(root) / "src")
+            return sum(len(errors) for _, errors in check_files(
+                discovered, params["jobs"], schema_path=schema_path, config_path=CONFIG_PATH))
+
+        diagnostics = measure("check", end_to_end, len(files))
+
+        # Further rounds over every stage still short of runs
+        while True:
+            pending = [(fn, times) for fn, _, times in runs.values() if needs_runs(times)]
+            if not pending:
+                break
+            for fn, times in pending:
+                times.append(timed_run(fn)[0])
+
+    stages = {}
+    for name, (_, items, times) in runs.items():
+        seconds = min(times)
+        stages[name] = {
+            "seconds": round(seconds, 6),
+            "median_seconds": round(statistics.median(times), 6),
+            "runs": len(times),
+            "items": items,
+            "us_per_item": round(seconds / items * 1e6, 3) if items else None,
+        }
+    return stages, {"queries": len(queries), "diagnostics": diagnostics}
+
+
+def workload(params):
+    """The params that decide what is measured (all but TIMING_PARAMS)."""
+    return {k: v for k, v in params.items() if k not in TIMING_PARAMS}
+
+
+def compare(results, baseline, threshold, min_delta=0.0):
+    """
+    Print a per-stage comparison; returns the names of regressed stages, or
+    None when the baseline measured a different workload (nothing comparable).
+    """
+    ours, theirs = workload(results["params"]), workload(baseline.get("params", {}))
+    if baseline.get("suite_version") != results["suite_version"] or ours != theirs:
+        differing = sorted(k for k in ours.keys() | theirs.keys() if ours.get(k) != theirs.get(k))
+        print(f"❌ Baseline was recorded with a different suite version or parameters "
+              f"({', '.join(differing) or 'suite_version'}); record it again with --save-baseline.")
+        return None
+
+    regressions = []
+    print(f"{'stage':<15} {'baseline s':>11} {'current s':>10} {'change':>8}  {'median s':>9} {'runs':>5}")
+    for name, stage in results["stages"].items():
+        spread = f"{stage['median_seconds']:>9.4f} {stage['runs']:>5}"
+        base = baseline["stages"].get(name)
+        if base is None or not base["seconds"]:
+            print(f"{name:<15} {'-':>11} {stage['seconds']:>10.4f} {'':>8}  {spread}")
+            continue
+        change = stage["seconds"] / base["seconds"] - 1
+        regressed = stage["seconds"] - base["seconds"] > threshold * base["seconds"] + min_delta
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<15} {base['seconds']:>11.4f} {stage['seconds']:>10.4f} "
+              f"{change:>+7.0%} {'❌' if regressed else '✅'} {spread}")
+    return regressions
+
+
+def keep_best(stages, again):
+    """Fold a re-measurement into stages, keeping each stage's best attempt."""
+    for name, stage in again.items():
+        runs = stages[name]["runs"] + stage["runs"]
+        if stage["seconds"] < stages[name]["seconds"]:
+            stages[name] = stage
+        stages[name]["runs"] = runs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="PySchemaGuard benchmark suite")
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    ap.add_argument("--columns", type=int, help="total schema columns (10 .. 100000)")
+    ap.add_argument("--files", type=int, help="Python files to generate (10 .. 50000)")
+    ap.add_argument("--sql-share", type=float, default=0.3, help="share of files with SQL")
+    ap.add_argument("--typo-share", type=float, default=0.1, help="share of queries with a typo")
+    ap.add_argument("--mismatch-share", type=float, default=0.05,
+                    help="share of queries comparing a column with a literal of the wrong type")
+    ap.add_argument("--fuzzy-probes", type=int, default=200)
+    ap.add_argument("--jobs", type=int, default=1, help="processes for the end-to-end stage")
+    ap.add_argument("--repeat", type=int, default=5, help="minimum runs per stage")
+    ap.add_argument("--min-time", type=float, default=2.0,
+                    help="keep repeating a stage until this many seconds are spent on it")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--output", help="write results JSON here")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed slowdown per stage before failing (0.25 = 25%%)")
+    ap.add_argument("--min-delta", type=float, default=0.02,
+                    help="seconds a stage may add on top of the threshold (noise floor for short stages)")
+    ap.add_argument("--confirm", type=int, default=2,
+                    help="re-measure up to this many times before reporting a regression")
+    ap.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    args = ap.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    params = {
+        "columns": args.columns or preset["columns"],
+        "files": args.files or preset["files"],
+        "sql_share": args.sql_share,
+        "typo_share": args.typo_share,
+        "mismatch_share": args.mismatch_share,
+        "fuzzy_probes": args.fuzzy_probes,
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "seed": args.seed,
+    }
+
+    stages, counts = run_stages(params)
+    results = {
+        "suite_version": SUITE_VERSION,
+        "params": params,
+        "counts": counts,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "stages": stages,
+    }
+
+    print(f"{params['columns']} columns, {params['files']} files, "
+          f"{counts['queries']} queries, {counts['diagnostics']} diagnostics")
+
+    baseline = None
+    if not args.save_baseline:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    if args.save_baseline:
+        # Same best-of as the gate, so a slow stretch does not loosen it
+        for _ in range(args.confirm):
+            keep_best(stages, run_stages(params)[0])
+    regressions = compare(results, baseline, args.threshold, args.min_delta) if baseline else []
+    # A slow stretch of the machine can outlast a whole run; a real regression
+    # survives re-measuring, a noisy one does not
+    for attempt in range(1, args.confirm + 1):
+        if not regressions:
+            break
+        print(f"↻ Re-measuring ({attempt}/{args.confirm}): {', '.join(regressions)}")
+        keep_best(stages, run_stages(params)[0])
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        for name, stage in stages.items():
+            print(f"{name:<15} {stage['seconds']:>10.4f} s")
+        print(f"⚠️  No baseline at {args.baseline} (create one with --save-baseline)")
+        return 0
+    if regressions is None:
+        return 2
+    if regressions:
+        print(f"❌ Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/synthetic.py
+#
+# Reproducible synthetic inputs for the benchmark suite: a schema of a given
+# column count and a tree of Python modules embedding SQL, with a chosen share
+# of files containing SQL, of typo'd identifiers and of type mismatches.
+# Everything is derived from the seed, so two runs see the same inputs.
+
+import json
+import random
+import string
+from pathlib import Path
+
+WORDS = [
+    "employee", "department", "name", "id", "salary", "email", "location", "created",
+    "updated", "at", "customer", "invoice", "total", "amount", "state", "code", "kind",
+    "first", "last", "address", "city", "country", "zip", "phone", "account", "balance",
+    "product", "price", "quantity", "shipment", "region", "manager", "note", "rating",
+]
+
+# declared type → literal that matches it
+TYPES = {
+    "integer": "42",
+    "bigint": "7",
+    "numeric": "3",
+    "character varying": "'abc'",
+    "text": "'hello'",
+    "boolean": "true",
+}
+
+# literal that does not match the declared type's group
+MISMATCHED = {
+    "integer": "'oops'",
+    "bigint": "'oops'",
+    "numeric": "'oops'",
+    "character varying": "12",
+    "text": "12",
+    "boolean": "'yes'",
+}
+
+PLAIN_FUNCTION = '''
+def helper_{i}(items):
+    """Summarize {i} items."""
+    total = 0
+    for item in items:
+        total += item.get("value", 0)
+    return {{"total": total, "label": "batch %d" % {i}}}
+'''
+
+SQL_FUNCTION = '''
+def query_{i}(db):
+    return db.execute("{query}")
+'''
+
+
+def make_typo(name, rng):
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        if rng.random() < 0.5 and len(chars) > 1:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def make_schema(n_columns, rng, min_columns=4, max_columns=40):
+    """{table: {"columns": [...]}} with n_columns columns in total."""
+    schema = {}
+    remaining = n_columns
+    while remaining > 0:
+        name = "_".join(rng.sample(WORDS, 2)) + f"_{len(schema)}"
+        size = min(remaining, rng.randint(min_columns, max_columns))
+        columns = []
+        seen = set()
+        while len(columns) < size:
+            col = "_".join(rng.sample(WORDS, rng.randint(1, 2)))
+            if col in seen:
+                col += f"_{len(columns)}"
+            seen.add(col)
+            columns.append({"name": col, "type": rng.choice(list(TYPES)), "nullable": rng.random() < 0.5})
+        schema[name] = {"columns": columns}
+        remaining -= size
+    return schema
+
+
+def make_query(schema, tables, rng, typo_share, mismatch_share):
+    table = rng.choice(tables)
+    columns = schema[table]["columns"]
+    picked = rng.sample(columns, min(len(columns), rng.randint(1, 3)))
+    names = [c["name"] for c in picked]
+    where = rng.choice(columns)
+    literal = (MISMATCHED if rng.random() < mismatch_share else TYPES)[where["type"]]
+
+    if rng.random() < typo_share:
+        if rng.random() < 0.3:
+            table = make_typo(table, rng)
+        else:
+            i = rng.randrange(len(names))
+            names[i] = make_typo(names[i], rng)
+
+    kind = rng.random()
+    if kind < 0.6:
+        return f"SELECT {', '.join(names)} FROM {table} WHERE {where['name']} = {literal}"
+    if kind < 0.8:
+        return f"UPDATE {table} SET {names[0]} = {TYPES[picked[0]['type']]} WHERE {where['name']} = {literal}"
+    values = ", ".join(TYPES[c["type"]] for c in picked)
+    return f"INSERT INTO {table} ({', '.join(names)}) VALUES ({values})"
+
+
+def write_tree(root, schema, n_files, rng, sql_share=0.3, typo_share=0.1, mismatch_share=0.05,
+               functions_per_file=10, queries_per_file=3):
+    """Write n_files modules under root (100 per package directory); returns their paths."""
+    tables = list(schema)
+    files = []
+    for n in range(n_files):
+        body = [PLAIN_FUNCTION.format(i=i) for i in range(functions_per_file)]
+        if rng.random() < sql_share:
+            for i in range(rng.randint(1, queries_per_file)):
+                query = make_query(schema, tables, rng, typo_share, mismatch_share)
+                body.insert(rng.randrange(len(body) + 1), SQL_FUNCTION.format(i=i, query=query))
+
+        path = Path(root) / f"pkg_{n // 100}" / f"module_{n}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(body))
+        files.append(str(path))
+    return files
+
+
+def write_schema(path, schema):
+    with open(path, "w") as f:
+        json.dump(schema, f, indent=2)
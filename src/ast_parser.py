@@ -1,4 +1,43 @@
 import ast
+import re
+
+SQL_KEYWORDS = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "TRUNCATE"]
+
+# Cheap pre-scan over the raw file: a file can only hold a SQL string if one
+# of the keywords occurs somewhere in it. Not anchored on word boundaries, since
+# in source the keyword may directly follow a quote, prefix or escape (e.g. "\nSELECT").
+# One lower() of the buffer plus substring searches is several times faster
+# than a case-insensitive regex alternation.
+PRE_SCAN_KEYWORDS = [k.lower() for k in SQL_KEYWORDS]
+PRE_SCAN_KEYWORDS_BYTES = [k.encode() for k in PRE_SCAN_KEYWORDS]
+
+# Without a keyword in the source, a string value can still start with one:
+# - an escape may spell a letter ("\x53ELECT", "\123", "\u0053", "\N{...}")
+# - the keyword may be split across implicitly concatenated literals
+#   ("SEL" "ECT", also over lines and comments) or a backslash-newline
+# Checked (on the lowered source) only when the substring test fails.
+_LETTER_ESCAPE = r"\\(?:x|u|n\{|[0-7])"
+_SPLIT = r"(?:['\"]+(?:\s|\\\r?\n|#[^\n]*)*[rbu]{0,2}['\"]+|\\\r?\n)"
+_PRE_SCAN_FALLBACK = "|".join(
+    [_LETTER_ESCAPE] + [f"(?:{_SPLIT})?".join(k) for k in PRE_SCAN_KEYWORDS]
+)
+PRE_SCAN_FALLBACK = re.compile(_PRE_SCAN_FALLBACK)
+PRE_SCAN_FALLBACK_BYTES = re.compile(_PRE_SCAN_FALLBACK.encode())
+
+
+def may_contain_sql(source_code):
+    """False only if the source (str or bytes) cannot contain a SQL string."""
+    lowered = source_code.lower()
+    if isinstance(lowered, bytes):
+        keywords, fallback = PRE_SCAN_KEYWORDS_BYTES, PRE_SCAN_FALLBACK_BYTES
+    else:
+        keywords, fallback = PRE_SCAN_KEYWORDS, PRE_SCAN_FALLBACK
+    return any(k in lowered for k in keywords) or fallback.search(lowered) is not None
+
+
+# A string is SQL-like if it starts (after whitespace) with one of the keywords
+SQL_START = re.compile(r"\s*(?:" + "|".join(SQL_KEYWORDS) + ")", re.IGNORECASE)
+
 
 class PythonSQLParser:
     """Parses Python files to find embedded SQL queries"""
@@ -10,32 +49,44 @@ class PythonSQLParser:
     def parse_file(self):
         """Extracts SQL-like strings from a Python file"""
         try:
-            with open(self.file_path, "r") as f:
+            with open(self.file_path, "rb") as f:
                 source_code = f.read()
         except FileNotFoundError:
             return []
 
+        return self.parse_source(source_code)
+
+    def parse_source(self, source_code):
+        """
+        Extracts SQL-like strings from source text or raw bytes (e.g. an unsaved
+        editor buffer). Files without any SQL keyword skip ast.parse entirely.
+        """
+        self.sql_queries = []
+
+        if not may_contain_sql(source_code):
+            return self.sql_queries
+
         try:
             tree = ast.parse(source_code, filename=self.file_path)
-        except SyntaxError:
+        except (SyntaxError, ValueError):
             return []
 
+        # Single pass that only looks at string constants
+        constant = ast.Constant
+        is_sql = SQL_START.match
         for node in ast.walk(tree):
-            # Handle regular string literals
-            if isinstance(node, ast.Constant) and isinstance(node.value, str):
-                self.check_if_sql(node.value, node.lineno)
-            # Handle older Python versions using ast.Str
-            elif isinstance(node, ast.Str):
-                self.check_if_sql(node.s, node.lineno)
+            if type(node) is constant and type(node.value) is str and is_sql(node.value):
+                self.sql_queries.append({
+                    "query": node.value,
+                    "line": node.lineno,
+                    "file": self.file_path
+                })
 
         return self.sql_queries
 
     def check_if_sql(self, string_value, line_number):
         """Check if a string is likely to be SQL"""
-        sql_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "TRUNCATE"]
-        upper_string = string_value.lstrip().upper()
-
-        if any(upper_string.startswith(keyword) for keyword in sql_keywords):
+        if SQL_START.match(string_value):
             self.sql_queries.append({
                 "query": string_value,
                 "line": line_number,
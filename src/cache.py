@@ -0,0 +1,127 @@
+# src/cache.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from src import __version__
+from src.model import Diagnostic
+
+CACHE_DIR = ".pyschemaguard_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of per-file diagnostics.
+
+    Entries are keyed by the file's kind ("py" or "sql": which parser reads
+    it) and content hash, salted with the hashes of the schema snapshot, the
+    config and the tool version, so any change to those invalidates
+    everything. Diagnostics are stored without the file path, so identical
+    files of one kind share one entry. Least recently used entries are evicted
+    (by mtime, refreshed on every hit) once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, schema_path="schema.json",
+                 config_path="default_config.yaml", max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.salt = hashlib.sha256(
+            "\0".join([__version__, _file_digest(schema_path), _file_digest(config_path)]).encode()
+        ).digest()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def key(self, content: bytes, kind: str) -> str:
+        return hashlib.sha256(self.salt + kind.encode() + b"\0" + content).hexdigest()
+
+    def file_key(self, path, kind: str) -> str:
+        """Same as key(content, kind), reading the file in chunks (large .sql files)."""
+        h = hashlib.sha256(self.salt + kind.encode() + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key, file_path):
+        """Cached diagnostics for this content (re-attributed to file_path), or None."""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "r") as f:
+                errors = json.load(f)["errors"]
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return [Diagnostic.from_dict(dict(e, file=file_path)) for e in errors]
+
+    def put(self, key, errors):
+        entry = self._entry_path(key)
+        stored = [{k: v for k, v in e.to_dict().items() if k != "file"} for e in errors]
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent workers never see partial entries
+            tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({"errors": stored}, f)
+            os.replace(tmp, entry)
+        except OSError:
+            return  # cache is best-effort
+        self.stats["writes"] += 1
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits in max_bytes."""
+        if not self.cache_dir.is_dir():
+            return
+
+        entries = []
+        total = 0
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats["evictions"] += 1
+
+    def size_bytes(self):
+        if not self.cache_dir.is_dir():
+            return 0
+        return sum(e.stat().st_size for sub in os.scandir(self.cache_dir) if sub.is_dir()
+                   for e in os.scandir(sub.path))
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = (100.0 * self.stats["hits"] / lookups) if lookups else 0.0
+        return (
+            f"Cache: {self.stats['hits']} hits, {self.stats['misses']} misses ({rate:.1f}% hit rate), "
+            f"{self.stats['writes']} writes, {self.stats['evictions']} evictions, "
+            f"{self.size_bytes() / (1024 * 1024):.1f} MB in {self.cache_dir}"
+        )
@@ -0,0 +1,69 @@
+# src/changes.py
+#
+# Files changed between a git revision and the working tree, for
+# `check --changed-since REV`. Only local git is used (no fetch).
+
+import os
+import subprocess
+from pathlib import Path
+from src.runner import SOURCE_SUFFIXES
+
+
+class GitError(Exception):
+    """git is unavailable, the target is not in a repository, or the revision is unknown."""
+
+
+def _git(args, cwd):
+    try:
+        proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=False)
+    except FileNotFoundError:
+        raise GitError("git executable not found")
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode(errors="replace").strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def changed_paths(rev, cwd="."):
+    """
+    Absolute paths of files that differ between rev and the working tree:
+    modified, added, renamed or untracked (not ignored). Deleted files are left out.
+    """
+    cwd = Path(cwd).resolve()
+    top = Path(_git(["rev-parse", "--show-toplevel"], cwd).decode().strip())
+    _git(["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], cwd)
+
+    names = _git(["diff", "--name-only", "-z", "--no-renames", "--diff-filter=d", rev, "--"], top)
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "-z"], top)
+
+    paths = set()
+    for name in (names + untracked).split(b"\0"):
+        if name:
+            paths.add((top / os.fsdecode(name)).resolve())
+    return paths
+
+
+def changed_source_files(target: Path, rev, watched=()):
+    """
+    Changed .py / .sql files under target, as sorted paths in the same form
+    discover_files produces. Returns None when one of `watched` (schema,
+    config) changed, meaning every file needs checking.
+    """
+    changed = changed_paths(rev, target if target.is_dir() else target.parent)
+
+    if any(Path(p).resolve() in changed for p in watched):
+        return None
+
+    if target.is_file():
+        return [str(target)] if target.resolve() in changed else []
+
+    root = target.resolve()
+    files = []
+    for path in changed:
+        if path.suffix not in SOURCE_SUFFIXES or not path.is_file():
+            continue
+        try:
+            relative = path.relative_to(root)
+        except ValueError:
+            continue  # outside the target
+        files.append(str(target / relative))
+    return sorted(files)
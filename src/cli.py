@@ -1,7 +1,7 @@
 import click, json
 from pathlib import Path
-from src.ast_parser import PythonSQLParser
-from src.validator import SQLValidator
+from src.cache import CACHE_DIR, ResultCache
+from src.runner import check_files, discover_files, iter_files
 
 @click.group()
 def cli():
@@ -9,38 +9,152 @@ def cli():
 
 @cli.command(name="check")
 @click.argument("target", type=str)
-@click.option("--json-output", is_flag=True)
-def check_command(target, json_output):
+@click.option("--json-output", is_flag=True, help="Same as --format json.")
+@click.option("--format", "output_format", type=click.Choice(["text", "json", "jsonl"]), default=None,
+              help="jsonl: one diagnostic per line as each file finishes, then a summary line.")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Worker processes for directory scans (default: CPU count).")
+@click.option("--no-cache", is_flag=True, help="Ignore and do not update the result cache.")
+@click.option("--cache-dir", default=CACHE_DIR, show_default=True)
+@click.option("--cache-max-mb", type=click.IntRange(min=1), default=256, show_default=True)
+@click.option("--cache-stats", is_flag=True, help="Print cache statistics to stderr.")
+@click.option("--profile", is_flag=True,
+              help="Print per-stage timings, slowest files/queries and peak memory to stderr "
+                   "(checks in one process).")
+@click.option("--profile-format", type=click.Choice(["table", "json"]), default="table", show_default=True)
+@click.option("--profile-top", type=click.IntRange(min=1), default=10, show_default=True,
+              help="Slowest files and queries to list.")
+@click.option("--changed-since", metavar="REV", default=None,
+              help="Only check .py / .sql files changed between REV and the working tree "
+                   "(all files if schema.json or the config changed).")
+@click.option("--watch", is_flag=True,
+              help="Keep running: re-check files as they change and print only new / fixed "
+                   "diagnostics (text output; reloads schema.json and the config when they change).")
+@click.option("--poll", is_flag=True, help="With --watch: poll mtimes instead of using inotify.")
+@click.option("--debounce", type=click.FloatRange(min=0), default=0.2, show_default=True,
+              help="With --watch: seconds of quiet before a burst of saves is checked.")
+def check_command(target, json_output, output_format, jobs, no_cache, cache_dir, cache_max_mb,
+                  cache_stats, profile, profile_format, profile_top, changed_since, watch, poll, debounce):
 
-    validator = SQLValidator("schema.json")
     path = Path(target)
+    output_format = output_format or ("json" if json_output else "text")
 
     if not path.exists():
         msg = f"❌ Target not found: {target}"
-        print(json.dumps({"error": msg}) if json_output else msg)
+        print(json.dumps({"error": msg}) if output_format != "text" else msg)
         return
 
-    files = [str(path)] if path.is_file() else [str(p) for p in path.rglob("*.py")]
+    if watch:
+        from src.watcher import Watcher
+
+        watcher = Watcher(path, polling=poll, debounce=debounce)
+        watcher.start()
+        watcher.run()
+        return
+
+    changed = None
+    if changed_since is not None:
+        from src.changes import GitError, changed_source_files
+        try:
+            changed = changed_source_files(path, changed_since, watched=("schema.json", "default_config.yaml"))
+        except GitError as e:
+            msg = f"❌ Cannot list changes since {changed_since}: {e}"
+            print(json.dumps({"error": msg}) if output_format != "text" else msg)
+            raise SystemExit(2)
+        if changed is None:
+            click.echo(f"⚠️ Schema or config changed since {changed_since}: checking all files.", err=True)
+
+    cache = None
+    if not no_cache:
+        cache = ResultCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+
+    profiler = None
+    if profile:
+        from src.profiler import Profiler
+        profiler = Profiler(top_n=profile_top)
+
+    if output_format == "jsonl":
+        files = iter_files(path) if changed is None else changed
+        stream_jsonl(check_files(files, jobs, cache=cache, profiler=profiler))
+        finish_cache(cache, cache_stats)
+        finish_profile(profiler, profile_format)
+        return
+
+    files = discover_files(path) if changed is None else changed
     all_errors = []
 
-    for file_path in files:
-        parser = PythonSQLParser(file_path)
-        queries = parser.parse_file()
+    for file_path, errors in check_files(files, jobs, cache=cache, profiler=profiler):
+        all_errors.extend(errors)
 
-        for q in queries:
-            result = validator.validate(q["query"], file_path, q["line"])
-            if result:
-                all_errors.extend(result)
+    finish_cache(cache, cache_stats)
+    finish_profile(profiler, profile_format)
 
-    if json_output:
-        print(json.dumps({"errors": all_errors}))
+    if output_format == "json":
+        print(json.dumps({"errors": [e.to_dict() for e in all_errors]}))
         return
 
     if not all_errors:
         print("✅ No SQL issues found.")
     else:
         for e in all_errors:
-            print(f"{e['file']}:{e['line']} → {e['message']} (suggest: {e['suggestion']})")
+            print(f"{e.file}:{e.line} → {e.message} (suggest: {e.suggestion})")
+
+
+def finish_cache(cache, cache_stats):
+    if cache is not None:
+        cache.prune()
+        if cache_stats:
+            click.echo(cache.summary(), err=True)
+
+
+def finish_profile(profiler, profile_format):
+    if profiler is not None:
+        click.echo(profiler.format(profile_format), err=True)
+
+
+def stream_jsonl(results):
+    """
+    One {"type": "diagnostic", ...} line per issue, flushed after each file,
+    then a {"type": "summary", ...} line. Nothing is accumulated.
+    """
+    files = files_with_errors = diagnostics = 0
+
+    for _, errors in results:
+        files += 1
+        if errors:
+            files_with_errors += 1
+            diagnostics += len(errors)
+            print("\n".join(json.dumps({"type": "diagnostic", **e.to_dict()}) for e in errors), flush=True)
+
+    print(json.dumps({
+        "type": "summary",
+        "files": files,
+        "files_with_errors": files_with_errors,
+        "diagnostics": diagnostics,
+    }), flush=True)
+
+@cli.command(name="serve")
+@click.option("--schema", "schema_path", default="schema.json", show_default=True)
+@click.option("--config", "config_path", default="default_config.yaml", show_default=True)
+def serve_command(schema_path, config_path):
+    """Run a persistent JSON-RPC validation server on stdin/stdout."""
+    from src.server import ValidationServer
+
+    ValidationServer(schema_path, config_path).serve()
+
+@cli.command(name="compile-schema")
+@click.option("--schema", "schema_path", default="schema.json", show_default=True)
+@click.option("--output", default=None, help="Snapshot path (default: schema path with .pgsg).")
+def compile_schema_command(schema_path, output):
+    """Compile schema.json into a lazily loaded binary snapshot."""
+    from src.snapshot import compile_schema
+
+    if not Path(schema_path).exists():
+        click.echo(f"❌ File {schema_path} not found.")
+        return
+
+    out_path = compile_schema(schema_path, output)
+    click.echo(f"✅ Compiled {schema_path} → {out_path}")
 
 if __name__ == "__main__":
     cli()
@@ -3,12 +3,207 @@
 // ─────────────────────────────────────────────────────────────
 
 import * as vscode from "vscode";
-import { exec } from "child_process";
+import { exec, spawn, ChildProcess, ChildProcessWithoutNullStreams } from "child_process";
 
 // ⚙️ IMPORTANT: Update these paths to match your system
 const PROJECT_DIR = "C:\\Users\\hp\\sql-validator";
 const PYTHON_PATH = "C:\\Users\\hp\\sql-validator\\env\\bin\\python.exe";
 
+// Live validation runs once a document has been quiet for this long
+const DEBOUNCE_MS = 300;
+// Results of an unchanged document version are reused for this long
+const RESULT_TTL_MS = 10000;
+
+// ─────────────────────────────────────────────
+// VALIDATION SERVER CLIENT (python -m src.cli serve)
+// ─────────────────────────────────────────────
+// One warm Python process per editor session. Requests are newline-delimited
+// JSON-RPC 2.0 messages; responses are matched back to callers by id.
+class ValidationServerClient {
+    private proc: ChildProcessWithoutNullStreams | null = null;
+    private buffer = "";
+    private nextId = 1;
+    private pending = new Map<number, (response: any) => void>();
+
+    private start(): ChildProcessWithoutNullStreams {
+        if (this.proc) return this.proc;
+
+        const proc = spawn(PYTHON_PATH, ["-m", "src.cli", "serve"], { cwd: PROJECT_DIR });
+
+        proc.stdout.setEncoding("utf8");
+        proc.stdout.on("data", (chunk: string) => {
+            this.buffer += chunk;
+            let newline: number;
+            while ((newline = this.buffer.indexOf("\n")) >= 0) {
+                const line = this.buffer.slice(0, newline);
+                this.buffer = this.buffer.slice(newline + 1);
+                if (!line.trim()) continue;
+
+                try {
+                    const response = JSON.parse(line);
+                    const resolve = this.pending.get(response.id);
+                    if (resolve) {
+                        this.pending.delete(response.id);
+                        resolve(response);
+                    }
+                } catch {
+                    console.log("❗Validation server sent non-JSON output");
+                }
+            }
+        });
+
+        proc.stderr.on("data", (chunk) => console.log("Validation server: " + chunk.toString()));
+
+        // If the server dies, fail outstanding requests and respawn on next use
+        proc.on("exit", () => {
+            this.proc = null;
+            this.buffer = "";
+            for (const resolve of this.pending.values()) {
+                resolve({ error: { message: "Validation server exited" } });
+            }
+            this.pending.clear();
+        });
+
+        this.proc = proc;
+        return proc;
+    }
+
+    request(method: string, params: object): Promise<any> {
+        const proc = this.start();
+        const id = this.nextId++;
+
+        return new Promise((resolve) => {
+            this.pending.set(id, resolve);
+            proc.stdin.write(JSON.stringify({ jsonrpc: "2.0", id, method, params }) + "\n");
+        });
+    }
+
+    dispose() {
+        if (!this.proc) return;
+        this.proc.stdin.write(JSON.stringify({ jsonrpc: "2.0", id: this.nextId++, method: "shutdown" }) + "\n");
+        this.proc.stdin.end();
+        this.proc = null;
+    }
+}
+
+// ─────────────────────────────────────────────
+// LIVE VALIDATION SCHEDULER
+// ─────────────────────────────────────────────
+// Edits to a document are coalesced until it has been quiet for DEBOUNCE_MS,
+// then validated once. At most one request per document is in flight: if the
+// document changes again meanwhile, the next run waits for it and its result
+// is dropped, since it is keyed by the document version it was sent for.
+// Results are cached per version for RESULT_TTL_MS, so re-validating an
+// unchanged document (open, save) does not reach the server.
+
+// 0-based first and last line of the current text covered by unsent edits
+export interface LineRange {
+    start: number;
+    end: number;
+}
+
+interface CachedResult {
+    version: number;
+    errors: any[];
+    expires: number;
+}
+
+// Fold one edit into the range of unsent edits. Lines below an edit move by
+// the number of lines it added or removed.
+export function mergeRange(pending: LineRange | undefined, change: vscode.TextDocumentContentChangeEvent): LineRange {
+    const start = change.range.start.line;
+    const oldEnd = change.range.end.line;
+    const end = start + (change.text.match(/\r\n|\r|\n/g) || []).length;
+    if (!pending) return { start, end };
+
+    const delta = end - oldEnd;
+    const pendingEnd = pending.end < start ? pending.end : pending.end > oldEnd ? pending.end + delta : end;
+    return { start: Math.min(pending.start, start), end: Math.max(pendingEnd, end) };
+}
+
+class ValidationScheduler {
+    private timers = new Map<string, NodeJS.Timeout>();
+    private edits = new Map<string, LineRange>();
+    private inFlight = new Set<string>();
+    private cache = new Map<string, CachedResult>();
+
+    constructor(
+        private server: ValidationServerClient,
+        private publish: (document: vscode.TextDocument, errors: any[]) => void
+    ) {}
+
+    change(event: vscode.TextDocumentChangeEvent) {
+        const key = event.document.uri.toString();
+        let range = this.edits.get(key);
+        for (const change of event.contentChanges) {
+            range = mergeRange(range, change);
+        }
+        if (range) this.edits.set(key, range);
+        this.schedule(event.document);
+    }
+
+    // (Re)start the debounce window of a document
+    schedule(document: vscode.TextDocument, delay = DEBOUNCE_MS) {
+        const key = document.uri.toString();
+        clearTimeout(this.timers.get(key));
+        this.timers.set(key, setTimeout(() => {
+            this.timers.delete(key);
+            this.run(document);
+        }, delay));
+    }
+
+    private run(document: vscode.TextDocument) {
+        if (document.isClosed) return;
+        const key = document.uri.toString();
+        const version = document.version;
+
+        const cached = this.cache.get(key);
+        if (cached && cached.version === version && cached.expires > Date.now()) {
+            this.publish(document, cached.errors);
+            return;
+        }
+        if (this.inFlight.has(key)) return; // picked up when the running request returns
+
+        // Send the live buffer text, so unsaved edits are validated too, with
+        // the lines the edits since the last request now cover, so the server
+        // only re-analyzes the statements around them.
+        const params: any = { file: document.fileName, text: document.getText() };
+        const range = this.edits.get(key);
+        if (range) params.range = { start: range.start + 1, end: range.end + 1 };
+        this.edits.delete(key);
+        this.inFlight.add(key);
+
+        this.server.request("validate", params).then((response) => {
+            this.inFlight.delete(key);
+            if (document.isClosed) return;
+            if (document.version !== version) {
+                // Stale: validate the latest text, unless a debounce window is still open
+                if (!this.timers.has(key)) this.run(document);
+                return;
+            }
+            if (response.error) return; // if the server fails, skip to avoid freezing
+
+            const errors = response.result?.errors || [];
+            this.cache.set(key, { version, errors, expires: Date.now() + RESULT_TTL_MS });
+            this.publish(document, errors);
+        });
+    }
+
+    forget(document: vscode.TextDocument) {
+        const key = document.uri.toString();
+        clearTimeout(this.timers.get(key));
+        this.timers.delete(key);
+        this.edits.delete(key);
+        this.cache.delete(key);
+    }
+
+    dispose() {
+        for (const timer of this.timers.values()) clearTimeout(timer);
+        this.timers.clear();
+        this.cache.clear();
+    }
+}
+
 // ─────────────────────────────────────────────
 // ACTIVATE EXTENSION
 // ─────────────────────────────────────────────
@@ -16,6 +211,8 @@ export function activate(context: vscode.ExtensionContext) {
     console.log("🔌 SQL Validator Extension Activated");
 
     // 📌 Manual Command: Run From Command Palette
+    // A check still running for the same file is killed when it is run again.
+    const running = new Map<string, ChildProcess>();
     const runCheck = vscode.commands.registerCommand("sql-validator.runCheck", () => {
         const editor = vscode.window.activeTextEditor;
         if (!editor) return vscode.window.showErrorMessage("No active file selected");
@@ -23,7 +220,11 @@ export function activate(context: vscode.ExtensionContext) {
         const filePath = editor.document.fileName;
         const command = `${PYTHON_PATH} -m src.cli check "${filePath}" --json-output`;
 
-        exec(command, { cwd: PROJECT_DIR }, (err, stdout, stderr) => {
+        running.get(filePath)?.kill();
+        const child = exec(command, { cwd: PROJECT_DIR }, (err, stdout, stderr) => {
+            if (running.get(filePath) === child) running.delete(filePath);
+            if (err?.killed) return; // superseded by a newer run
+
             if (err || stderr) {
                 const msg = stderr?.toString() || err?.message || "Unknown error";
                 vscode.window.showErrorMessage("Validator Error: " + msg);
@@ -32,6 +233,7 @@ export function activate(context: vscode.ExtensionContext) {
 
             vscode.window.showInformationMessage("SQL Validation Complete ✔");
         });
+        running.set(filePath, child);
     });
 
     context.subscriptions.push(runCheck);
@@ -42,54 +244,71 @@ export function activate(context: vscode.ExtensionContext) {
     const diagnostics = vscode.languages.createDiagnosticCollection("sqlvalidator");
     context.subscriptions.push(diagnostics);
 
-    vscode.workspace.onDidChangeTextDocument((event) => {
-        const document = event.document;
-        if (document.languageId !== "python") return; // only python files
+    const server = new ValidationServerClient();
+    context.subscriptions.push(server);
 
-        const filePath = document.fileName;
-        const command = `${PYTHON_PATH} -m src.cli check "${filePath}" --json-output`;
+    const publish = (document: vscode.TextDocument, results: any[]) => {
+        let diagList: vscode.Diagnostic[] = [];
 
-        exec(command, { cwd: PROJECT_DIR }, (err, stdout, stderr) => {
-            if (err || stderr) return; // if CLI crashes, skip to avoid freezing
+        try {
+            // serve MUST return: {"errors": [ ... ]}
+            results.forEach((issue: any) => {
+                const lineIndex = issue.line - 1;
+                const lineText = document.lineAt(lineIndex).text;
 
-            let diagList: vscode.Diagnostic[] = [];
+                // Try to locate the wrong column/table name
+                const wrongWord =
+                    issue.suggestion ||
+                    issue.message.split("'")[1] ||
+                    lineText.trim();
 
-            try {
-                // cli.py MUST return: {"errors": [ ... ]}
-                const json = JSON.parse(stdout);
-                const results = json.errors || [];
+                const start = lineText.indexOf(wrongWord);
+                const end = start + wrongWord.length;
 
-                results.forEach((issue: any) => {
-                    const lineIndex = issue.line - 1;
-                    const lineText = document.lineAt(lineIndex).text;
+                const range = new vscode.Range(lineIndex, start, lineIndex, end);
 
-                    // Try to locate the wrong column/table name
-                    const wrongWord =
-                        issue.suggestion ||
-                        issue.message.split("'")[1] ||
-                        lineText.trim();
+                const diagnostic = new vscode.Diagnostic(
+                    range,
+                    `❌ ${issue.message}` +
+                        (issue.suggestion ? `\n💡 Suggestion: ${issue.suggestion}` : ""),
+                    vscode.DiagnosticSeverity.Error
+                );
 
-                    const start = lineText.indexOf(wrongWord);
-                    const end = start + wrongWord.length;
+                diagList.push(diagnostic);
+            });
 
-                    const range = new vscode.Range(lineIndex, start, lineIndex, end);
+        } catch {
+            console.log("❗Live diagnostics failed → Response was not validator JSON");
+        }
 
-                    const diagnostic = new vscode.Diagnostic(
-                        range,
-                        `❌ ${issue.message}` +
-                            (issue.suggestion ? `\n💡 Suggestion: ${issue.suggestion}` : ""),
-                        vscode.DiagnosticSeverity.Error
-                    );
+        diagnostics.set(document.uri, diagList);
+    };
 
-                    diagList.push(diagnostic);
-                });
+    const scheduler = new ValidationScheduler(server, publish);
+    context.subscriptions.push(scheduler);
 
-            } catch {
-                console.log("❗Live JSON parse failed → Output was not validator JSON");
-            }
+    vscode.workspace.onDidChangeTextDocument((event) => {
+        const document = event.document;
+        if (document.languageId !== "python") return; // only python files
+        if (event.contentChanges.length === 0) return; // dirty-state change only
 
-            diagnostics.set(document.uri, diagList);
-        });
+        scheduler.change(event);
+    });
+
+    // Opened and saved documents are validated too (saving keeps the version,
+    // so a recent result is reused)
+    vscode.workspace.onDidOpenTextDocument((document) => {
+        if (document.languageId === "python") scheduler.schedule(document, 0);
+    });
+    vscode.workspace.onDidSaveTextDocument((document) => {
+        if (document.languageId === "python") scheduler.schedule(document, 0);
+    });
+
+    // Let the server drop its copy of closed documents
+    vscode.workspace.onDidCloseTextDocument((document) => {
+        if (document.languageId !== "python") return;
+        scheduler.forget(document);
+        server.request("close", { file: document.fileName });
     });
 
     vscode.window.showInformationMessage("🟢 SQL Validator Live Mode Enabled (inline errors + tooltips)");
@@ -0,0 +1,291 @@
+# src/fast_analyzer.py
+#
+# Fast-path analyzer engine: a single-pass tokenizer plus a small
+# recursive-descent recognizer for the common statement shapes
+#
+#   SELECT [DISTINCT] items FROM tables [WHERE cond] [;]
+#   UPDATE table SET col = value, ... [WHERE cond] [;]
+#   INSERT INTO table (cols) VALUES (literals) [;]
+#   DELETE FROM table [WHERE cond] [;]
+#   DROP TABLE [IF EXISTS] table [;]  /  TRUNCATE [TABLE] table [;]
+#
+# where cond is `operand op operand` joined by AND/OR. The result is exactly
+# what SQLAnalyzer's sqlparse path returns for the same text (including the
+# keywords it reports, e.g. WHERE/AND), names are collected in the same
+# textual order. Anything else returns None so the caller falls back to sqlparse.
+
+import re
+from functools import lru_cache
+
+TOKEN = re.compile(
+    r"""
+     (?P<ws>\s+)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<number>\d+(?:\.\d+)?(?![\w.]))
+    |(?P<string>'(?:[^'\\]|'')*')
+    |(?P<op><>|!=|<=|>=|=|<|>)
+    |(?P<punct>[,.();*])
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Structural keywords the recognizer matches itself
+KEYWORDS = {
+    "SELECT", "DISTINCT", "FROM", "WHERE", "AND", "OR", "AS", "UPDATE", "SET",
+    "INSERT", "INTO", "VALUES", "DELETE", "DROP", "TABLE", "IF", "EXISTS", "TRUNCATE",
+}
+
+
+class Unsupported(Exception):
+    """Raised when the query leaves the fast-path grammar."""
+
+
+@lru_cache(maxsize=65536)
+def _is_plain_name(word):
+    """
+    True if sqlparse lexes this word as a plain Name. Words it treats as
+    keywords or builtins (e.g. "user", "date") group differently there, so
+    queries using them as identifiers take the sqlparse path.
+    """
+    from sqlparse.lexer import Lexer
+    from sqlparse.tokens import Name
+
+    ttype, _ = Lexer.get_default_instance().is_keyword(word)
+    return ttype is Name
+
+
+def tokenize(query):
+    tokens = []
+    for m in TOKEN.finditer(query):
+        kind = m.lastgroup
+        if kind == "ws":
+            continue
+        if kind == "other":
+            raise Unsupported(m.group())
+        tokens.append((kind, m.group()))
+    return tokens
+
+
+class _Recognizer:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    # ---------------- TOKEN HELPERS ----------------
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else (None, None)
+
+    def at_keyword(self, *names):
+        kind, text = self.peek()
+        return kind == "word" and text.upper() in names
+
+    def keyword(self, *names):
+        kind, text = self.peek()
+        if kind != "word" or text.upper() not in names:
+            raise Unsupported(text)
+        self.pos += 1
+        return text
+
+    def punct(self, char):
+        kind, text = self.peek()
+        if kind != "punct" or text != char:
+            raise Unsupported(text)
+        self.pos += 1
+
+    def at_punct(self, char):
+        kind, text = self.peek()
+        return kind == "punct" and text == char
+
+    def name(self):
+        kind, text = self.peek()
+        if kind != "word" or text.upper() in KEYWORDS or not _is_plain_name(text):
+            raise Unsupported(text)
+        self.pos += 1
+        return text
+
+    def path(self, max_parts=2, qualified=False):
+        """name ('.' name)* → real (last) name, or "schema.table" for table references"""
+        parts = [self.name()]
+        while self.at_punct("."):
+            self.pos += 1
+            parts.append(self.name())
+        if len(parts) > max_parts:
+            raise Unsupported(".".join(parts))
+        return ".".join(parts) if qualified else parts[-1]
+
+    def end(self):
+        if self.at_punct(";"):
+            self.pos += 1
+        if self.pos != len(self.tokens):
+            raise Unsupported(self.peek()[1])
+
+    # ---------------- GRAMMAR PIECES ----------------
+    def aliased_path(self, qualified=False):
+        """path [[AS] alias] → the path's name (the alias is dropped)"""
+        real = self.path(qualified=qualified)
+        if self.at_keyword("AS"):
+            self.pos += 1
+            self.name()
+        elif self.peek()[0] == "word" and self.peek()[1].upper() not in KEYWORDS:
+            self.name()
+        return real
+
+    def literal(self):
+        kind, text = self.peek()
+        if kind not in ("number", "string"):
+            raise Unsupported(text)
+        self.pos += 1
+
+    def operand(self, names):
+        if self.peek()[0] in ("number", "string"):
+            self.literal()
+        else:
+            names.append(self.path())
+
+    def condition(self, names):
+        """WHERE operand op operand ((AND|OR) operand op operand)*"""
+        names.append(self.keyword("WHERE"))
+        while True:
+            self.operand(names)
+            if self.peek()[0] != "op":
+                raise Unsupported(self.peek()[1])
+            self.pos += 1
+            self.operand(names)
+            if not self.at_keyword("AND", "OR"):
+                return
+            names.append(self.keyword("AND", "OR"))
+
+    # ---------------- STATEMENTS ----------------
+    def select(self):
+        tables, columns = [], []
+        self.keyword("SELECT")
+        if self.at_keyword("DISTINCT"):
+            columns.append(self.keyword("DISTINCT"))
+
+        while True:
+            if self.at_punct("*"):
+                self.pos += 1
+            else:
+                columns.append(self.aliased_path())
+            if not self.at_punct(","):
+                break
+            self.pos += 1
+
+        self.keyword("FROM")
+        while True:
+            tables.append(self.aliased_path(qualified=True))
+            if not self.at_punct(","):
+                break
+            self.pos += 1
+
+        if self.at_keyword("WHERE"):
+            self.condition(tables)
+        self.end()
+        return tables, columns
+
+    def update(self):
+        columns = []
+        self.keyword("UPDATE")
+        table = self.aliased_path(qualified=True)
+        self.keyword("SET")
+
+        while True:
+            columns.append(self.path())
+            kind, text = self.peek()
+            if kind != "op" or text != "=":
+                raise Unsupported(text)
+            self.pos += 1
+            self.operand(columns)
+            if not self.at_punct(","):
+                break
+            self.pos += 1
+
+        if self.at_keyword("WHERE"):
+            self.condition(columns)
+        self.end()
+        return [table], columns
+
+    def insert(self):
+        columns = []
+        self.keyword("INSERT")
+        self.keyword("INTO")
+        table = self.name()  # qualified targets are not recognized as such by sqlparse
+
+        self.punct("(")
+        while True:
+            columns.append(self.path())
+            if not self.at_punct(","):
+                break
+            self.pos += 1
+        self.punct(")")
+
+        self.keyword("VALUES")
+        self.punct("(")
+        while True:
+            self.literal()
+            if not self.at_punct(","):
+                break
+            self.pos += 1
+        self.punct(")")
+        self.end()
+        return [table], columns
+
+    def delete(self):
+        self.keyword("DELETE")
+        self.keyword("FROM")
+        table = self.aliased_path(qualified=True)
+        if self.at_keyword("WHERE"):
+            self.condition([])  # sqlparse path stops at the first table
+        self.end()
+        return [table], []
+
+    def drop_or_truncate(self):
+        if self.at_keyword("DROP"):
+            self.pos += 1
+            self.keyword("TABLE")
+            if self.at_keyword("IF"):
+                self.pos += 1
+                self.keyword("EXISTS")
+        else:
+            self.keyword("TRUNCATE")
+            if self.at_keyword("TABLE"):
+                self.pos += 1
+        table = self.path(qualified=True)
+        self.end()
+        return [table], []
+
+
+STATEMENTS = {
+    "SELECT": _Recognizer.select,
+    "UPDATE": _Recognizer.update,
+    "INSERT": _Recognizer.insert,
+    "DELETE": _Recognizer.delete,
+    "DROP": _Recognizer.drop_or_truncate,
+    "TRUNCATE": _Recognizer.drop_or_truncate,
+}
+
+
+def analyze_fast(query):
+    """
+    Return {"tables": [...], "columns": [...]} for supported statement shapes,
+    or None when the query needs the sqlparse engine.
+    """
+    try:
+        tokens = tokenize(query)
+        if not tokens or tokens[0][0] != "word":
+            return None
+
+        handler = STATEMENTS.get(tokens[0][1].upper())
+        if handler is None:
+            return None
+
+        tables, columns = handler(_Recognizer(tokens))
+    except Unsupported:
+        return None
+
+    return {
+        "tables": list(dict.fromkeys(tables)),
+        "columns": list(dict.fromkeys(columns)),
+    }
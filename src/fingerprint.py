@@ -0,0 +1,94 @@
+# src/fingerprint.py
+
+import re
+from collections import OrderedDict
+
+TOKEN = re.compile(
+    r"""
+     (?P<ws>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<quoted>"(?:[^"]|"")*")
+    |(?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)
+    |(?P<word>[^\W\d]\w*)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# String contents containing any of these could influence the regex-based
+# checks (comparisons, INSERT value lists), so such literals are kept verbatim.
+SIGNIFICANT_IN_STRING = re.compile(r"[=<>(),;\\]")
+
+
+def fingerprint(query: str) -> str:
+    """
+    Normalize a query in the style of pg_stat_statements so that copies which
+    differ only in layout or literal values share one key:
+
+    - whitespace runs collapse to one space (newlines are kept, since they
+      separate line comments and carry line offsets)
+    - string literals become ?s (followed by the newlines they span),
+      integers ?i, other numbers ?f, so literal *types* (all the type checks
+      look at) are preserved
+
+    Identifier and keyword case is kept: both are echoed back in diagnostics.
+    A literal "?" is escaped as "??", so placeholders are unambiguous.
+    """
+    parts = []
+    for m in TOKEN.finditer(query):
+        kind = m.lastgroup
+        text = m.group()
+
+        if kind == "ws":
+            newlines = text.count("\n")
+            parts.append("\n" * newlines if newlines else " ")
+        elif kind == "string":
+            if SIGNIFICANT_IN_STRING.search(text):
+                parts.append(text)
+            else:
+                # Keep the literal's newlines: later statements' line offsets depend on them
+                parts.append("?s" + "\n" * text.count("\n"))
+        elif kind == "number":
+            parts.append("?i" if text.isdigit() else "?f")
+        elif kind == "other" and text == "?":
+            parts.append("??")
+        else:
+            parts.append(text)
+
+    return "".join(parts)
+
+
+class QueryMemo:
+    """Bounded LRU map of query fingerprint → cached validation result."""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -2,6 +2,10 @@
 
 import difflib
 import re
+from collections import Counter
+
+REPEATED_CHARS = re.compile(r"(.)\1+")
+PREFIX_BONUS = 0.15
 
 
 def normalize(name: str) -> str:
@@ -13,10 +17,21 @@ def normalize(name: str) -> str:
     """
     name = name.lower()
     name = name.replace("_", "")
-    name = re.sub(r"(.)\1+", r"\1", name)  # aa → a
+    name = REPEATED_CHARS.sub(r"\1", name)  # aa → a
     return name
 
 
+def _score(bad_norm: str, cand_norm: str) -> float:
+    # similarity score
+    score = difflib.SequenceMatcher(None, bad_norm, cand_norm).ratio()
+
+    # strong prefix bonus (emp → employee)
+    if len(bad_norm) >= 3 and bad_norm[:3] == cand_norm[:3]:
+        score += PREFIX_BONUS
+
+    return score
+
+
 def suggest(bad: str, candidates: list[str], cutoff: float = 0.45, top_k: int = 3):
     """
     Smart fuzzy suggestion engine.
@@ -27,15 +42,7 @@ def suggest(bad: str, candidates: list[str], cutoff: float = 0.45, top_k: int =
     scored = []
 
     for cand in candidates:
-        cand_norm = normalize(cand)
-
-        # similarity score
-        score = difflib.SequenceMatcher(None, bad_norm, cand_norm).ratio()
-
-        # strong prefix bonus (emp → employee)
-        if len(bad_norm) >= 3 and bad_norm[:3] == cand_norm[:3]:
-            score += 0.15
-
+        score = _score(bad_norm, normalize(cand))
 
         if score >= cutoff:
             scored.append((cand, score))
@@ -44,3 +51,83 @@ def suggest(bad: str, candidates: list[str], cutoff: float = 0.45, top_k: int =
 
     return [c for c, _ in scored[:top_k]]
 
+
+class SuggestionIndex:
+    """
+    Reusable suggestion index over a fixed candidate list.
+
+    Returns exactly what suggest(bad, candidates, cutoff, top_k) would, but
+    normalizes candidates once and only runs SequenceMatcher on a few of them:
+
+    - candidates sharing a normalized form are scored once
+    - an inverted index of (char, nth occurrence) gives, per candidate, the
+      character-multiset overlap with the query, which bounds the number of
+      matching characters and therefore ratio() from above
+    - candidates are scored in descending bound order and the scan stops as
+      soon as no remaining bound can beat the current top_k
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+
+        self._norms = []            # distinct normalized forms
+        self._positions = []        # norm id -> candidate positions (original order)
+        self._postings = {}         # (char, nth occurrence) -> [norm ids]
+
+        ids = {}
+        for pos, cand in enumerate(self.candidates):
+            norm = normalize(cand)
+            norm_id = ids.get(norm)
+            if norm_id is None:
+                norm_id = ids[norm] = len(self._norms)
+                self._norms.append(norm)
+                self._positions.append([])
+                for char, count in Counter(norm).items():
+                    for nth in range(1, count + 1):
+                        self._postings.setdefault((char, nth), []).append(norm_id)
+            self._positions[norm_id].append(pos)
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def suggest(self, bad: str, cutoff: float = 0.45, top_k: int = 3):
+        bad_norm = normalize(bad)
+
+        # Degenerate inputs: bounds below are not informative → plain scan
+        if not bad_norm or cutoff <= PREFIX_BONUS or top_k <= 0:
+            return suggest(bad, self.candidates, cutoff, top_k)
+
+        # Character-multiset overlap per normalized candidate (counted in C)
+        overlap = Counter()
+        for char, count in Counter(bad_norm).items():
+            for nth in range(1, count + 1):
+                overlap.update(self._postings.get((char, nth), ()))
+
+        len_bad = len(bad_norm)
+        prefix = bad_norm[:3] if len_bad >= 3 else None
+
+        bounded = []
+        for norm_id, matches in overlap.items():
+            norm = self._norms[norm_id]
+            bound = 2.0 * matches / (len_bad + len(norm))
+            if prefix is not None and norm[:3] == prefix:
+                bound += PREFIX_BONUS
+            if bound >= cutoff:
+                bounded.append((-bound, self._positions[norm_id][0], norm_id))
+
+        bounded.sort()
+
+        scored = []  # (-score, position, candidate)
+        for neg_bound, _, norm_id in bounded:
+            if len(scored) >= top_k and -neg_bound < -scored[top_k - 1][0]:
+                break
+
+            score = _score(bad_norm, self._norms[norm_id])
+            if score < cutoff:
+                continue
+
+            for pos in self._positions[norm_id]:
+                scored.append((-score, pos, self.candidates[pos]))
+            scored.sort()
+
+        return [c for _, _, c in scored[:top_k]]
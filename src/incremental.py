@@ -0,0 +1,374 @@
+# src/incremental.py
+#
+# Incremental re-analysis of an in-memory source buffer (an editor document).
+#
+# The document keeps the statement structure of the last successful parse
+# (line spans of every statement, nested by block) and the SQL strings found
+# with their diagnostics. An edit is described by the changed line range in
+# the new text; only the smallest run of sibling statements enclosing it is
+# re-parsed, and queries outside that run keep their cached diagnostics
+# (shifted when lines were inserted or removed above them).
+#
+# A run inside a block is parsed on its own behind an "if 1:" header, which
+# accepts any indentation without rewriting the lines (and so without
+# touching multi-line string contents). If the run does not parse on its own
+# (or its indentation no longer matches its siblings), the enclosing
+# statement is re-parsed instead, up to the whole module. When the whole
+# buffer is a SyntaxError, e.g. halfway through typing, the last good results
+# outside the broken region are kept and the error is reported alongside.
+
+import ast
+import re
+from src.ast_parser import SQL_START
+
+LINE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+
+def split_lines(text):
+    """
+    Lines as Python numbers them (only \n, \r\n and \r end a line), with
+    their endings. str.splitlines also breaks on \f, \x1c, \u2028, ...; it is
+    used when the line count shows none of those occur.
+    """
+    lines = text.splitlines(True)
+    breaks = text.count("\n") + text.count("\r") - text.count("\r\n")
+    if breaks + (not text.endswith(("\n", "\r")) and text != "") == len(lines):
+        return lines
+    return LINE.findall(text)
+
+# Wrapper line for parsing an indented run of statements on its own
+BLOCK_HEADER = "if 1:\n"
+
+
+class _Statement:
+    """
+    Line span of one statement (decorators included) and its nested blocks.
+    Lines are relative to `base`, the first line of the enclosing statement
+    (0 at module level), so moving a statement does not touch its children.
+    """
+
+    __slots__ = ("start", "header", "end", "col", "blocks")
+
+    def __init__(self, node, offset, base):
+        decorators = getattr(node, "decorator_list", None) or ()
+        header = node.lineno + offset
+        start = min([header] + [d.lineno + offset for d in decorators])
+        self.start = start - base
+        self.header = header - base
+        self.end = node.end_lineno + offset - base
+        self.col = node.col_offset
+        self.blocks = [[_Statement(child, offset, start) for child in body] for body in _bodies(node)]
+
+    def shift(self, delta):
+        self.start += delta
+        self.header += delta
+        self.end += delta
+
+
+def _bodies(node):
+    for field in ("body", "orelse", "finalbody"):
+        body = getattr(node, field, None)
+        if body and isinstance(body[0], ast.stmt):
+            yield body
+    for handler in getattr(node, "handlers", None) or ():
+        yield handler.body
+    for case in getattr(node, "cases", None) or ():
+        yield case.body
+
+
+def _find_queries(nodes, offset):
+    """(line, query) for SQL-like string constants under nodes, in line order."""
+    found = []
+    is_sql = SQL_START.match
+    for root in nodes:
+        for node in ast.walk(root):
+            if type(node) is ast.Constant and type(node.value) is str and is_sql(node.value):
+                found.append((node.lineno + offset, node.value))
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+class IncrementalDocument:
+    """
+    SQL diagnostics for one in-memory document, updated incrementally.
+
+        doc = IncrementalDocument(validator, "app.py")
+        doc.update(text)                         # full analysis
+        doc.update(new_text, start_line=12, end_line=14)
+            # lines 12..14 of new_text replace the edited lines (end_line may be
+            # start_line - 1 for a pure deletion); the line count difference
+            # between old and new text tells how many lines were removed
+
+    update() returns the diagnostics of the whole document, in line order.
+    After an update, `syntax_error` is None or {"line", "message"}.
+    """
+
+    def __init__(self, validator, file_path=None):
+        self.validator = validator
+        self.file_path = file_path
+        self.lines = []
+        self.statements = None   # top-level _Statements of the last good parse
+        self.entries = []        # [line, query, diagnostics] in line order
+        self.dirty = None        # (start, end) lines not reflected in statements
+        self.syntax_error = None
+
+    # ---------------- PUBLIC API ----------------
+    @property
+    def queries(self):
+        return [{"query": q, "line": line, "file": self.file_path} for line, q, _ in self.entries]
+
+    def diagnostics(self):
+        return [d for _, _, diagnostics in self.entries for d in diagnostics]
+
+    def update(self, text, start_line=None, end_line=None):
+        old_lines, self.lines = self.lines, split_lines(text)
+        delta = len(self.lines) - len(old_lines)
+
+        if self.statements is None or start_line is None:
+            self._full_parse(text)
+            return self.diagnostics()
+
+        end_line = start_line - 1 if end_line is None else end_line
+        old_end = end_line - delta
+        if (start_line < 1 or end_line < start_line - 1 or old_end < start_line - 1
+                or old_lines[:start_line - 1] != self.lines[:start_line - 1]
+                or old_lines[old_end:] != self.lines[end_line:]):
+            self._full_parse(text)  # lines outside the range changed too: start over
+            return self.diagnostics()
+
+        # Statements the edit cuts into are re-parsed whole: their old spans
+        # no longer describe the new lines (e.g. a replaced header line)
+        touched = _touched(self.statements, 0, start_line, old_end)
+
+        self._shift(start_line, old_end, end_line, delta)
+
+        # Touch at least one line, so a pure deletion re-parses where it happened
+        dirty = (start_line, max(start_line, end_line))
+        if touched:
+            lo, hi = touched
+            dirty = (min(dirty[0], lo), max(dirty[1], hi + delta if hi > old_end else end_line))
+        if self.dirty:
+            dirty = (min(dirty[0], self.dirty[0]), max(dirty[1], self.dirty[1]))
+        self.dirty = dirty
+
+        self._reparse(text)
+        return self.diagnostics()
+
+    # ---------------- SHIFTING ----------------
+    def _shift(self, start, old_end, end, delta):
+        """
+        Move everything below the edited lines (old start..old_end, now
+        start..end) by delta; drop queries found on the edited lines.
+        """
+        def move(line):
+            return line + delta if line > old_end else min(line, max(start, end))
+
+        if self.dirty:
+            self.dirty = (move(self.dirty[0]), move(self.dirty[1]))
+
+        entries = []
+        for entry in self.entries:
+            line = entry[0]
+            if start <= line <= old_end:
+                continue
+            if line > old_end and delta:
+                entry = [line + delta, entry[1], [d.shifted(delta) for d in entry[2]]]
+            entries.append(entry)
+        self.entries = entries
+
+        if delta:
+            _shift_statements(self.statements, 0, 0, move)
+
+    # ---------------- RE-PARSING ----------------
+    def _reparse(self, text):
+        first, last = self.dirty
+
+        # Statement lists enclosing the dirty lines, outermost first:
+        # (block, its base line, indentation of its statements, statement owning it)
+        path = [(self.statements, 0, None, None)]
+        while True:
+            inner = _enclosing_block(path[-1][0], path[-1][1], first, last)
+            if inner is None:
+                break
+            path.append(inner)
+
+        # Innermost run of siblings first, then each enclosing statement in turn
+        for depth in range(len(path) - 1, -1, -1):
+            block, base, indent, _ = path[depth]
+            lo, hi = first, last
+            if depth + 1 < len(path):
+                owner = path[depth + 1][3]
+                lo, hi = min(lo, base + owner.start), max(hi, base + owner.end)
+            if self._reparse_run(block, base, lo, hi, indent):
+                self.dirty = None
+                self.syntax_error = None
+                return
+
+        self._full_parse(text)
+
+    def _run_bounds(self, block, base, first, last, top_level):
+        """
+        Indexes [i, j) of the siblings to re-parse and the run's line span.
+        Dirty lines starting in a gap take the preceding sibling along (the new
+        lines may belong to its body); siblings sharing a line join the run.
+        """
+        first, last = first - base, last - base
+        i = 0
+        while i < len(block) and block[i].end < first:
+            i += 1
+        if i > 0 and (i == len(block) or first < block[i].start):
+            i -= 1
+        j = i
+        while j < len(block) and block[j].start <= last:
+            j += 1
+
+        while 0 < i < j and block[i - 1].end >= block[i].start:
+            i -= 1
+        while i < j < len(block) and block[j].start <= block[j - 1].end:
+            j += 1
+
+        lo, hi = first, last
+        if i < j:
+            lo, hi = min(lo, block[i].start), max(hi, block[j - 1].end)
+        lo, hi = lo + base, hi + base
+        if top_level:
+            # Lines before the first / after the last statement belong to the run
+            if i == 0:
+                lo = 1
+            if j == len(block):
+                hi = len(self.lines)
+        return i, j, lo, hi
+
+    def _reparse_run(self, block, base, first, last, indent):
+        top_level = indent is None
+        i, j, lo, hi = self._run_bounds(block, base, first, last, top_level)
+        if lo > hi:
+            return False
+
+        source = "".join(self.lines[lo - 1:hi])
+        try:
+            if top_level:
+                tree = ast.parse(source)
+                nodes, offset = tree.body, lo - 1
+            else:
+                tree = ast.parse(BLOCK_HEADER + source)
+                if len(tree.body) != 1 or tree.body[0].orelse:
+                    return False  # a dedented line escaped the block
+                nodes, offset = tree.body[0].body, lo - 2
+                if any(n.col_offset != indent for n in nodes):
+                    return False
+        except (SyntaxError, ValueError):
+            return False
+
+        block[i:j] = [_Statement(n, offset, base) for n in nodes]
+
+        cached = {}
+        for line, query, diagnostics in self.entries:
+            if lo <= line <= hi:
+                cached.setdefault(query, (line, diagnostics))
+        kept = [e for e in self.entries if not lo <= e[0] <= hi]
+        fresh = [[line, query, self._diagnose(query, line, cached)] for line, query in _find_queries(nodes, offset)]
+        self.entries = _merge(kept, fresh)
+        return True
+
+    def _full_parse(self, text):
+        try:
+            tree = ast.parse(text)
+        except (SyntaxError, ValueError) as e:
+            self._broken(e)
+            return
+
+        cached = {query: (line, diagnostics) for line, query, diagnostics in self.entries}
+        self.statements = [_Statement(n, 0, 0) for n in tree.body]
+        self.entries = [[line, q, self._diagnose(q, line, cached)] for line, q in _find_queries(tree.body, 0)]
+        self.dirty = None
+        self.syntax_error = None
+
+    def _broken(self, error):
+        """Keep the last good results outside the dirty lines; report the error."""
+        line = getattr(error, "lineno", None)
+        self.syntax_error = {"line": line, "message": getattr(error, "msg", None) or str(error)}
+
+        if self.statements is None:
+            self.entries = []
+            return
+        if self.dirty:
+            first, last = self.dirty
+            self.entries = [e for e in self.entries if not first <= e[0] <= last]
+
+    def _diagnose(self, query, line, cached):
+        hit = cached.get(query)
+        if hit is not None:
+            old_line, diagnostics = hit
+            # Statements of a multi-statement string keep their offsets
+            return diagnostics if old_line == line else [d.shifted(line - old_line) for d in diagnostics]
+        return self.validator.validate(query, self.file_path, line)
+
+
+def _shift_statements(statements, old_base, new_base, move):
+    """
+    Apply move (old line → new line) to statement spans relative to a base
+    that moved from old_base to new_base. Lines inside the edit collapse onto
+    the edited lines, so spans the edit removed overlap their neighbours and
+    are re-parsed along with them.
+    """
+    for stmt in statements:
+        start, end = old_base + stmt.start, old_base + stmt.end
+        new_start = move(start)
+        if new_start - start == move(end) - end:
+            stmt.shift(new_start - new_base - stmt.start)
+            continue
+        # Encloses (or overlaps) the edit: children move relative to it
+        stmt.start = new_start - new_base
+        stmt.header = move(old_base + stmt.header) - new_base
+        stmt.end = move(end) - new_base
+        for block in stmt.blocks:
+            _shift_statements(block, start, new_start, move)
+
+
+def _touched(block, base, first, last):
+    """
+    (lo, hi) span of the statements of `block` that the edited lines
+    first..last cut into, or None. Statements enclosing the edit within one
+    of their blocks are not included themselves, only what the edit touches
+    inside that block.
+    """
+    lo = hi = None
+    for stmt in block:
+        start, end = base + stmt.start, base + stmt.end
+        if end < first or start > last:
+            continue
+        span = (start, end)
+        for child in stmt.blocks:
+            if start + child[0].start <= first and last <= start + child[-1].end:
+                span = _touched(child, start, first, last)
+                break
+        if span is not None:
+            lo = span[0] if lo is None else min(lo, span[0])
+            hi = span[1] if hi is None else max(hi, span[1])
+    return None if lo is None else (lo, hi)
+
+
+def _enclosing_block(block, base, first, last):
+    """
+    (block, base, indentation, owner) if the dirty lines lie inside one block
+    of one statement of `block`, else None.
+    """
+    touching = [s for s in block if base + s.start <= last and base + s.end >= first]
+    if len(touching) != 1:
+        return None
+    stmt = touching[0]
+    inner_base = base + stmt.start
+    for child in stmt.blocks:
+        if stmt.header - stmt.start < child[0].start <= first - inner_base and last - inner_base <= child[-1].end:
+            return child, inner_base, child[0].col, stmt
+    return None
+
+
+def _merge(kept, fresh):
+    """Merge two line-ordered entry lists (kept entries first on equal lines)."""
+    if not fresh:
+        return kept
+    merged = kept + fresh
+    merged.sort(key=lambda entry: entry[0])
+    return merged
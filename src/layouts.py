@@ -0,0 +1,126 @@
+# src/layouts.py
+#
+# Structural deduplication of schema-per-tenant snapshots.
+#
+# Thousands of tenant schemas typically share a handful of table layouts.
+# A deduplicated snapshot stores each distinct layout once, and schemas
+# reference layouts by id:
+#
+#   "$table_layouts":  {table layout id: {"columns": [...]}}
+#   "$schema_layouts": {schema layout id: {table: table layout id}}
+#   "$schemas":        {schema: schema layout id}
+#
+# These sections sit next to the plain {table: {"columns": [...]}} entries.
+# Tables of the default schema stay plain. Layout ids are content hashes,
+# so they are stable across extractions. "$" cannot start an unquoted
+# PostgreSQL identifier, so the section keys never collide with table names.
+# SchemaIndex resolves "tenant_x.table" through the two maps, so memory and
+# snapshot size grow with the distinct layouts, plus one entry per schema.
+
+import hashlib
+import json
+import sys
+
+TABLE_LAYOUTS = "$table_layouts"
+SCHEMA_LAYOUTS = "$schema_layouts"
+SCHEMAS = "$schemas"
+SECTIONS = (TABLE_LAYOUTS, SCHEMA_LAYOUTS, SCHEMAS)
+
+
+def _digest(value):
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def table_layout_id(meta):
+    """Structural hash of a table definition: its columns (name, type, nullable), in order."""
+    return "t" + _digest([[c["name"], c["type"], c.get("nullable")] for c in meta["columns"]])
+
+
+def schema_layout_id(tables):
+    """Structural hash of a schema: its {table: table layout id} map, in any order."""
+    return "s" + _digest(sorted(tables.items()))
+
+
+def is_deduplicated(schema):
+    return SCHEMAS in schema
+
+
+class LayoutDeduper:
+    """
+    Folds tables of non-default schemas into layouts as they stream in.
+
+    Tables of one schema are expected to arrive together (extraction order).
+    A schema's table map is folded into a schema layout when the next schema
+    starts, so only the distinct layouts stay in memory, plus the
+    schema → layout map. A schema that shows up again later is reopened.
+    """
+
+    def __init__(self):
+        self.table_layouts = {}
+        self.schema_layouts = {}
+        self.schemas = {}
+        self._schema = None
+        self._tables = {}
+
+    def add(self, schema, table, meta):
+        if schema != self._schema:
+            self._flush()
+            sid = self.schemas.get(schema)
+            self._schema = schema
+            self._tables = dict(self.schema_layouts[sid]) if sid is not None else {}
+
+        lid = table_layout_id(meta)
+        self.table_layouts.setdefault(lid, meta)
+        self._tables[sys.intern(table)] = lid
+
+    def _flush(self):
+        if self._schema is None:
+            return
+        sid = schema_layout_id(self._tables)
+        self.schema_layouts.setdefault(sid, self._tables)
+        self.schemas[self._schema] = sid
+        self._schema, self._tables = None, {}
+
+    def sections(self):
+        """The three (key, value) sections, to be written after the plain tables."""
+        self._flush()
+        used = set(self.schemas.values())
+        return [
+            (TABLE_LAYOUTS, self.table_layouts),
+            (SCHEMA_LAYOUTS, {sid: t for sid, t in self.schema_layouts.items() if sid in used}),
+            (SCHEMAS, self.schemas),
+        ]
+
+
+def deduplicate(tables):
+    """
+    (key, meta) pairs of a plain snapshot → (key, value) pairs of the
+    deduplicated one: default-schema tables as they come, then the sections.
+    """
+    deduper = LayoutDeduper()
+    for key, meta in tables:
+        schema, dot, table = key.rpartition(".")
+        if dot:
+            deduper.add(schema, table, meta)
+        else:
+            yield key, meta
+    yield from deduper.sections()
+
+
+def expand(schema):
+    """
+    (key, meta) for every table of a snapshot, with the tables of
+    deduplicated schemas as "schema.table" (the inverse of deduplicate).
+    Expanded tables of one layout share one meta object.
+    """
+    for key in schema:
+        if key not in SECTIONS:
+            yield key, schema[key]
+    if not is_deduplicated(schema):
+        return
+    table_layouts = schema[TABLE_LAYOUTS]
+    schema_layouts = schema[SCHEMA_LAYOUTS]
+    for name, sid in schema[SCHEMAS].items():
+        for table, lid in schema_layouts[sid].items():
+            yield f"{name}.{table}", table_layouts[lid]
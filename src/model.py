@@ -0,0 +1,200 @@
+# src/model.py
+#
+# In-memory model for schema tables and diagnostics. These are slotted
+# objects instead of dicts, with interned identifier and type strings:
+#
+#   Column      one small object per column instead of a three-key dict;
+#               names and types repeated across tables are stored once
+#   Table       a tuple of Columns; it has no name of its own, because one
+#               table layout may be shared by many snapshot keys
+#               (src/layouts.py)
+#   Diagnostic  one issue. Memoized issues are templates that carry no file
+#               and only a line offset. Each call site gets a copy that
+#               shares every string with the template.
+#
+# The JSON shapes ({"columns": [{"name", "type", "nullable"}]} and the
+# eight-key diagnostic) are produced only where results leave the process:
+# CLI output, the result cache and the JSON-RPC server.
+
+import sys
+
+DIAGNOSTIC_FIELDS = ("file", "line", "offending", "start_col", "end_col", "message", "suggestion", "severity")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# ---------------- SCHEMA ----------------
+class Column:
+    __slots__ = ("name", "type", "nullable")
+
+    def __init__(self, name, type, nullable=None):
+        self.name = sys.intern(name)
+        self.type = sys.intern(type)
+        self.nullable = nullable
+
+    @classmethod
+    def from_dict(cls, c):
+        return cls(c["name"], c["type"], c.get("nullable"))
+
+    def to_dict(self):
+        return {"name": self.name, "type": self.type, "nullable": self.nullable}
+
+    def _fields(self):
+        return (self.name, self.type, self.nullable)
+
+    def __eq__(self, other):
+        if not isinstance(other, Column):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.type!r}, {self.nullable!r})"
+
+
+class Table:
+    __slots__ = ("columns",)
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+
+    @classmethod
+    def from_dict(cls, meta):
+        return cls(Column.from_dict(c) for c in meta["columns"])
+
+    def to_dict(self):
+        return {"columns": [c.to_dict() for c in self.columns]}
+
+    def __eq__(self, other):
+        if not isinstance(other, Table):
+            return NotImplemented
+        return self.columns == other.columns
+
+    def __hash__(self):
+        return hash(self.columns)
+
+    def __repr__(self):
+        return f"Table({list(self.columns)!r})"
+
+
+def schema_object(pairs):
+    """
+    json.load object_pairs_hook: column objects become Columns and
+    {"columns": [...]} objects become Tables, without building a dict first.
+    Any other object (the snapshot itself, layout maps) stays a dict.
+    """
+    if len(pairs) == 3:
+        (k1, name), (k2, type_), (k3, nullable) = pairs
+        if k1 == "name" and k2 == "type" and k3 == "nullable":  # the order the extractor writes
+            if type(name) is str and type(type_) is str and nullable in (True, False, None):
+                return Column(name, type_, nullable)
+    elif len(pairs) == 1 and pairs[0][0] == "columns" and type(pairs[0][1]) is list:
+        return Table(c if type(c) is Column else _column(c) for c in pairs[0][1])
+
+    fields = dict(pairs)
+    columns = fields.get("columns")
+    if type(columns) is list:  # a table with extra keys
+        return Table(c if type(c) is Column else _column(c) for c in columns)
+    return fields
+
+
+def _column(fields):
+    """
+    Column for a column object written by another tool (other key order, no
+    "nullable", extra keys). Decided here, inside a "columns" list, since a
+    $schemas map (table -> schema name) may look the same.
+    """
+    if type(fields) is dict and type(fields.get("name")) is str and type(fields.get("type")) is str:
+        return Column.from_dict(fields)
+    return fields
+
+
+# ---------------- DIAGNOSTICS ----------------
+class Diagnostic:
+    """
+    One reported issue. As a memoized issue template, file is None and line
+    is None or an offset from the first line of the query (later statements
+    of a multi-statement string).
+    """
+
+    __slots__ = DIAGNOSTIC_FIELDS
+
+    def __init__(self, message, offending=None, suggestion=None, severity="error",
+                 file=None, line=None, start_col=None, end_col=None):
+        self.file = file
+        self.line = line
+        self.offending = _intern(offending)
+        self.start_col = start_col
+        self.end_col = end_col
+        self.message = message
+        self.suggestion = _intern(suggestion)
+        self.severity = severity
+
+    @classmethod
+    def from_dict(cls, e):
+        """From the JSON shape (result cache) or an issue dict returned by a custom rule."""
+        return cls(
+            e["message"], e.get("offending"), e.get("suggestion"), e.get("severity") or "error",
+            e.get("file"), e.get("line"), e.get("start_col"), e.get("end_col"),
+        )
+
+    def _copy(self, file, line):
+        d = object.__new__(Diagnostic)
+        d.file = file
+        d.line = line
+        d.offending = self.offending
+        d.start_col = self.start_col
+        d.end_col = self.end_col
+        d.message = self.message
+        d.suggestion = self.suggestion
+        d.severity = self.severity
+        return d
+
+    def at(self, file, line):
+        """This issue template reported at a call site whose query starts on line."""
+        return self._copy(file, line if line is None or self.line is None else line + self.line)
+
+    def shifted(self, offset):
+        """This issue template, offset lines further down."""
+        return self._copy(self.file, (self.line or 0) + offset)
+
+    def to_dict(self):
+        return {
+            "file": self.file,
+            "line": self.line,
+            "offending": self.offending,
+            "start_col": self.start_col,
+            "end_col": self.end_col,
+            "message": self.message,
+            "suggestion": self.suggestion,
+            "severity": self.severity,
+        }
+
+    def _fields(self):
+        return tuple(getattr(self, f) for f in DIAGNOSTIC_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __reduce__(self):
+        # Compact pickles for results coming back from pool workers
+        return _diagnostic, self._fields()
+
+    def __repr__(self):
+        return f"Diagnostic({self.file}:{self.line} {self.message!r})"
+
+
+def _diagnostic(*fields):
+    d = object.__new__(Diagnostic)
+    for name, value in zip(DIAGNOSTIC_FIELDS, fields):
+        setattr(d, name, value)
+    return d
@@ -0,0 +1,287 @@
+# src/multi_extractor.py
+#
+# Concurrent extraction of many databases and schemas into one snapshot.
+#
+# Every (database, schema) pair is one job, run on a thread pool. Jobs take
+# their connection from a bounded pool: at most pool_size connections are
+# open at once across all databases, idle connections are reused by later
+# jobs on the same database (and closed to make room for another one).
+# A job that fails or overruns its target's timeout is retried with
+# exponential backoff. Results are merged in target order, keyed like a
+# single-database snapshot ("table" for public, "schema.table" otherwise),
+# so the validator resolves `schema.table` references against them.
+#
+#   python -m src.multi_extractor targets.yaml [--output schema.json] [--compile]
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.layouts import deduplicate
+from src.schema_extractor import DEFAULT_SCHEMA, SchemaExtractor, write_schema_json
+from src.snapshot import compile_schema
+
+
+class Target:
+    """One database to extract, with the schemas to include."""
+
+    def __init__(self, database, host="localhost", port=5432, user=None, password=None,
+                 schemas=None, timeout=60.0, retries=2):
+        self.database = database
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.password = password
+        self.schemas = list(schemas or [DEFAULT_SCHEMA])
+        self.timeout = float(timeout)
+        self.retries = int(retries)
+
+    @property
+    def key(self):
+        """Connections can be shared between jobs with the same key."""
+        return (self.host, self.port, self.database, self.user)
+
+    @property
+    def label(self):
+        return f"{self.host}:{self.port}/{self.database}"
+
+
+def load_targets(path):
+    """
+    Targets from a YAML file:
+
+        defaults: {host: db.internal, user: reader, password_env: PG_PASSWORD, timeout: 30}
+        targets:
+          - database: billing
+            schemas: [public, audit]
+          - database: accounts
+            host: accounts-db.internal
+
+    password_env names the environment variable holding the password.
+    """
+    import yaml
+
+    with open(path, "r") as f:
+        config = yaml.safe_load(f) or {}
+
+    defaults = config.get("defaults") or {}
+    targets = []
+    for entry in config.get("targets") or []:
+        options = {**defaults, **entry}
+        password_env = options.pop("password_env", None)
+        if password_env and options.get("password") is None:
+            options["password"] = os.getenv(password_env)
+        targets.append(Target(**options))
+    return targets
+
+
+def pg8000_connect(target):
+    """Default connection factory; the socket timeout bounds every round trip."""
+    import pg8000
+
+    return pg8000.connect(
+        host=target.host,
+        port=target.port,
+        database=target.database,
+        user=target.user,
+        password=target.password,
+        timeout=target.timeout,
+    )
+
+
+# ---------------- CONNECTION POOL ----------------
+class ConnectionPool:
+    """
+    At most max_size open connections over all targets. Idle connections are
+    kept per target; when the pool is full, an idle connection of another
+    target is closed to make room, otherwise acquire() waits.
+    """
+
+    def __init__(self, factory, max_size):
+        self.factory = factory
+        self.max_size = max_size
+        self.open = 0
+        self.peak = 0
+        self.idle = {}  # target key -> [connection]
+        self.cond = threading.Condition()
+
+    def acquire(self, target, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while True:
+                idle = self.idle.get(target.key)
+                if idle:
+                    return idle.pop()
+                if self.open < self.max_size:
+                    break
+                other = next((conns for conns in self.idle.values() if conns), None)
+                if other:
+                    _close_quietly(other.pop())
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no free connection for {target.label}")
+                self.cond.wait(remaining)
+            if self.open < self.max_size:
+                self.open += 1  # otherwise the slot of the evicted connection is reused
+            self.peak = max(self.peak, self.open)
+
+        try:
+            return self.factory(target)
+        except BaseException:
+            self._drop_slot()
+            raise
+
+    def release(self, target, conn, broken=False):
+        """Return a connection; broken ones (failed mid-job) are closed."""
+        if broken:
+            _close_quietly(conn)
+            self._drop_slot()
+            return
+        with self.cond:
+            self.idle.setdefault(target.key, []).append(conn)
+            self.cond.notify()
+
+    def _drop_slot(self):
+        with self.cond:
+            self.open -= 1
+            self.cond.notify()
+
+    def close(self):
+        with self.cond:
+            for conns in self.idle.values():
+                for conn in conns:
+                    _close_quietly(conn)
+                    self.open -= 1
+            self.idle.clear()
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+# ---------------- EXTRACTION ----------------
+class MultiExtractor:
+    """
+    Extract every schema of every target concurrently and merge them.
+
+        result = MultiExtractor(targets, workers=8, pool_size=4).extract()
+        result.tables     # {"table" | "schema.table": {"columns": [...]}}, sorted
+        result.failures   # {(target label, schema): "error"} after all retries
+        result.conflicts  # ["schema.table", ...] defined differently by two databases
+
+    Two databases defining the same schema.table identically share one entry;
+    when they differ the first target listed wins and the key is reported.
+    """
+
+    def __init__(self, targets, connect=pg8000_connect, workers=8, pool_size=4,
+                 fetch_size=2000, backoff=0.5):
+        self.targets = list(targets)
+        self.pool = ConnectionPool(connect, pool_size)
+        self.workers = workers
+        self.fetch_size = fetch_size
+        self.backoff = backoff
+
+    def extract(self):
+        jobs = [(target, schema) for target in self.targets for schema in target.schemas]
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(jobs)))) as executor:
+                futures = [executor.submit(self._run_job, target, schema) for target, schema in jobs]
+                outcomes = [future.result() for future in futures]
+        finally:
+            self.pool.close()
+
+        return self._merge(jobs, outcomes)
+
+    def _run_job(self, target, schema):
+        """(tables, None) or (None, error message) once retries are exhausted."""
+        for attempt in range(target.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                return self._extract_schema(target, schema), None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        return None, error
+
+    def _extract_schema(self, target, schema):
+        deadline = time.monotonic() + target.timeout
+        conn = self.pool.acquire(target, timeout=target.timeout)
+        try:
+            extractor = SchemaExtractor(connection=conn, schemas=[schema], fetch_size=self.fetch_size)
+            tables = []
+            for name, meta in extractor.iter_tables():
+                tables.append((name, meta))
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{target.label} {schema}: exceeded {target.timeout:g}s")
+        except BaseException:
+            self.pool.release(target, conn, broken=True)
+            raise
+        self.pool.release(target, conn)
+        return tables
+
+    @staticmethod
+    def _merge(jobs, outcomes):
+        tables, owners = {}, {}
+        failures, conflicts = {}, []
+
+        for (target, schema), (extracted, error) in zip(jobs, outcomes):
+            if error is not None:
+                failures[(target.label, schema)] = error
+                continue
+            for name, meta in extracted:
+                if name not in tables:
+                    tables[name] = meta
+                    owners[name] = (schema, name.rpartition(".")[2])
+                elif tables[name] != meta and name not in conflicts:
+                    conflicts.append(name)
+
+        # Same ordering as a single-database extraction: (schema, table)
+        ordered = {name: tables[name] for name in sorted(tables, key=owners.get)}
+        return ExtractionResult(ordered, failures, conflicts)
+
+
+class ExtractionResult:
+    def __init__(self, tables, failures, conflicts):
+        self.tables = tables
+        self.failures = failures
+        self.conflicts = conflicts
+
+    def save(self, output_file="schema.json", compile=False, dedup=False):
+        tables = self.tables.items()
+        with open(output_file, "w") as f:
+            write_schema_json(deduplicate(tables) if dedup else tables, f)
+        if compile:
+            compile_schema(output_file)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Snapshot many PostgreSQL databases and schemas into one schema.json")
+    ap.add_argument("targets", help="YAML file listing the databases (see load_targets)")
+    ap.add_argument("--output", default="schema.json")
+    ap.add_argument("--workers", type=int, default=8, help="concurrent extraction jobs")
+    ap.add_argument("--pool-size", type=int, default=4, help="maximum open connections")
+    ap.add_argument("--allow-partial", action="store_true",
+                    help="write the snapshot even if some targets failed")
+    ap.add_argument("--compile", action="store_true",
+                    help="also write the compiled snapshot (schema.pgsg) next to the output")
+    ap.add_argument("--dedup", action="store_true",
+                    help="store identical table layouts of non-public schemas once (schema-per-tenant)")
+    args = ap.parse_args()
+
+    result = MultiExtractor(load_targets(args.targets), workers=args.workers, pool_size=args.pool_size).extract()
+
+    for name in result.conflicts:
+        print(f"⚠️ {name} differs between databases; kept the first target's definition")
+    for (label, schema), error in result.failures.items():
+        print(f"❌ {label} schema {schema}: {error}")
+
+    if result.failures and not args.allow_partial:
+        raise SystemExit(1)
+
+    result.save(args.output, compile=args.compile, dedup=args.dedup)
+    print(f"✅ Schema saved to {args.output} ({len(result.tables)} tables)")
@@ -0,0 +1,155 @@
+# src/profiler.py
+#
+# Opt-in profiling for check runs: wall time and call counts per stage, the
+# slowest files and queries, cache hit rates and peak memory.
+#
+# Stages are recorded by wrapping methods on the objects being profiled
+# (Profiler.instrument), so nothing is measured, and nothing costs anything,
+# unless a profiler has been attached. Stage times are inclusive: "validate"
+# contains "analyze" and one "rule.<name>" stage per validation rule, the
+# rules contain "check_tables" / "check_columns", and those "fuzzy.suggest".
+
+import heapq
+import itertools
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Profiler:
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.stages = {}           # stage -> [calls, total seconds, max seconds]
+        self.caches = {}           # name -> {"hits", "misses"}
+        self._slowest_files = []   # min-heaps of (seconds, tiebreak, record)
+        self._slowest_queries = []
+        self._tiebreak = itertools.count()
+        self._started = time.perf_counter()
+
+    # ---------------- RECORDING ----------------
+    def add(self, stage, seconds):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    def instrument(self, obj, name, stage=None, on_call=None):
+        """
+        Replace obj.name with a timed wrapper recording into `stage` (default:
+        the method name). on_call(args, kwargs, seconds) is called after each call.
+        Undo with uninstrument().
+        """
+        fn = getattr(obj, name)
+        stage = stage or name
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                self.add(stage, elapsed)
+                if on_call is not None:
+                    on_call(args, kwargs, elapsed)
+
+        setattr(obj, name, timed)
+
+    @staticmethod
+    def uninstrument(obj, name):
+        obj.__dict__.pop(name, None)
+
+    def _keep_slowest(self, heap, seconds, record):
+        item = (seconds, next(self._tiebreak), record)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def note_file(self, file_path, seconds):
+        self._keep_slowest(self._slowest_files, seconds, {"file": file_path})
+
+    def note_query(self, query, file, line, seconds):
+        self._keep_slowest(self._slowest_queries, seconds, {"query": query, "file": file, "line": line})
+
+    def record_cache(self, name, hits, misses):
+        self.caches[name] = {"hits": hits, "misses": misses}
+
+    # ---------------- REPORTING ----------------
+    @staticmethod
+    def peak_memory_kb():
+        """Peak resident set size of this process in KiB (None where unavailable)."""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    def report(self):
+        def slowest(heap):
+            return [dict(record, seconds=round(seconds, 6)) for seconds, _, record in sorted(heap, reverse=True)]
+
+        caches = {}
+        for name, c in self.caches.items():
+            total = c["hits"] + c["misses"]
+            caches[name] = dict(c, hit_rate=round(c["hits"] / total, 4) if total else None)
+
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": {
+                stage: {"calls": calls, "seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                for stage, (calls, total, longest) in self.stages.items()
+            },
+            "slowest_files": slowest(self._slowest_files),
+            "slowest_queries": slowest(self._slowest_queries),
+            "caches": caches,
+            "peak_memory_kb": self.peak_memory_kb(),
+        }
+
+    def format(self, fmt="table"):
+        report = self.report()
+        if fmt == "json":
+            return json.dumps(report, indent=2)
+
+        lines = [f"⏱️  Profile (wall {report['wall_seconds']:.3f} s, stage times are inclusive)"]
+        lines.append(f"{'stage':<16} {'calls':>8} {'total ms':>10} {'avg µs':>10} {'max ms':>9}")
+        for stage, s in report["stages"].items():
+            avg = s["seconds"] / s["calls"] * 1e6
+            lines.append(f"{stage:<16} {s['calls']:>8} {s['seconds'] * 1000:>10.1f} "
+                         f"{avg:>10.1f} {s['max_seconds'] * 1000:>9.2f}")
+
+        if report["slowest_files"]:
+            lines.append("")
+            lines.append(f"Slowest files (top {self.top_n}):")
+            for r in report["slowest_files"]:
+                lines.append(f"  {r['seconds'] * 1000:>9.2f} ms  {r['file']}")
+
+        if report["slowest_queries"]:
+            lines.append("")
+            lines.append(f"Slowest queries (top {self.top_n}):")
+            for r in report["slowest_queries"]:
+                query = " ".join(r["query"].split())
+                if len(query) > 80:
+                    query = query[:77] + "..."
+                lines.append(f"  {r['seconds'] * 1000:>9.2f} ms  {r['file']}:{r['line']}  {query}")
+
+        if report["caches"]:
+            lines.append("")
+            for name, c in report["caches"].items():
+                rate = "n/a" if c["hit_rate"] is None else f"{c['hit_rate']:.1%}"
+                lines.append(f"{name}: {c['hits']} hits, {c['misses']} misses ({rate})")
+
+        if report["peak_memory_kb"] is not None:
+            lines.append(f"Peak memory: {report['peak_memory_kb'] / 1024:.1f} MiB")
+
+        return "\n".join(lines)
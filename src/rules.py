@@ -0,0 +1,143 @@
+# src/rules.py
+#
+# Validation rules. SQLValidator analyzes each statement once into a
+# QueryContext and runs every registered rule over it, in order. Rules share
+# the context (tables and columns as written, tables resolved against the
+# schema, the literal comparisons and INSERT value pairs scanned from the
+# text) instead of re-deriving it, so adding a rule costs no extra pass.
+#
+# A rule is any object with a `name` and check(context) → list of issues
+# (src.model.Diagnostic, or {"message", "offending", "suggestion", "severity"}
+# dicts, converted on the way out); register it with
+# SQLValidator.add_rule(). With a profiler attached, each rule is timed as
+# stage "rule.<name>".
+
+import re
+from functools import cached_property
+from src.model import Diagnostic
+
+SIMPLE_COMPARISON = re.compile(
+    r"(\w+)\s*(=|<|>)\s*('[^']*'|\d+|true|false)",
+    re.IGNORECASE,
+)
+
+INSERT_VALUES = re.compile(
+    r"insert\s+into\s+\w+\s*\(([^)]+)\)\s*values\s*\(([^)]+)\)",
+    re.IGNORECASE,
+)
+
+
+def infer_literal_type(value: str):
+    value = value.strip()
+
+    if value.startswith("'") and value.endswith("'"):
+        return "string"
+
+    if value.isdigit():
+        return "numeric"
+
+    if value.lower() in ("true", "false"):
+        return "boolean"
+
+    return None  # Unknown → skip validation
+
+
+class QueryContext:
+    """Everything the rules need to know about one statement, derived once."""
+
+    def __init__(self, validator, query):
+        self.validator = validator
+        self.index = validator.index
+        self.query = query
+
+        parts = validator.analyze(query)
+        self.tables = parts.get("tables", [])
+        self.columns = parts.get("columns", [])
+
+        # Snapshot keys of the known tables ("schema.table" references resolved)
+        self.valid_tables = list(dict.fromkeys(
+            t for t in map(self.index.resolve, self.tables) if t is not None
+        ))
+
+    @cached_property
+    def comparisons(self):
+        """(column, operator, literal) for every `column op literal` in the text."""
+        return [m.groups() for m in SIMPLE_COMPARISON.finditer(self.query)]
+
+    @cached_property
+    def insert_pairs(self):
+        """(column, value) pairs of INSERT INTO t (cols) VALUES (...), [] otherwise."""
+        match = INSERT_VALUES.search(self.query)
+        if not match:
+            return []
+        cols = [c.strip() for c in match.group(1).split(",")]
+        vals = [v.strip() for v in match.group(2).split(",")]
+        return list(zip(cols, vals)) if len(cols) == len(vals) else []
+
+
+# ---------------- BUILT-IN RULES ----------------
+class UnknownTableRule:
+    name = "unknown_table"
+
+    def check(self, context):
+        return context.validator.check_tables(context.tables)
+
+
+class UnknownColumnRule:
+    """Columns are only checked against the referenced tables that exist."""
+
+    name = "unknown_column"
+
+    def check(self, context):
+        if not context.valid_tables:
+            return []
+        return context.validator.check_columns(context.valid_tables, context.columns)
+
+
+class TypeMismatchRule:
+    """Literal compared with / inserted into a column of another type (warnings)."""
+
+    name = "type_mismatch"
+
+    def check(self, context):
+        if not context.valid_tables:
+            return []
+        issues = []
+        index = context.index
+
+        for column, _, literal in context.comparisons:
+            for table in context.valid_tables:
+                column_type = index.column_type(table, column)
+                if column_type is None:
+                    continue
+                literal_type = infer_literal_type(literal)
+                if not literal_type:
+                    continue  # Too complex → skip
+                if not index.is_compatible(table, column, literal_type):
+                    issues.append(_mismatch(column, column_type, literal_type))
+
+        table = context.valid_tables[0]
+        for column, value in context.insert_pairs:
+            column_type = index.column_type(table, column)
+            if column_type is None:
+                continue
+            literal_type = infer_literal_type(value)
+            if not literal_type:
+                continue
+            if not index.is_compatible(table, column, literal_type):
+                issues.append(_mismatch(column, column_type, literal_type))
+
+        return issues
+
+
+def _mismatch(column, column_type, literal_type):
+    return Diagnostic(
+        f"Possible type mismatch: column '{column}' "
+        f"expects {column_type}, but literal looks like {literal_type}",
+        offending=column,
+        severity="warning",
+    )
+
+
+# Run in this order; issues are reported in the same order
+DEFAULT_RULES = (UnknownTableRule, UnknownColumnRule, TypeMismatchRule)
@@ -0,0 +1,244 @@
+# src/runner.py
+
+import os
+import time
+from itertools import chain, islice
+from pathlib import Path
+from src.ast_parser import PythonSQLParser
+from src.cache import ResultCache
+from src.model import Diagnostic
+from src.sql_splitter import SQLFileParser
+
+# Checked file types: Python sources (embedded SQL) and SQL scripts
+SOURCE_SUFFIXES = (".py", ".sql")
+
+# The validator stack (yaml, sqlparse, fuzzy matching) and multiprocessing are
+# imported on first use: files without SQL and cache hits never need them.
+
+
+def iter_files(path: Path):
+    """
+    Lazily yield the .py and .sql files under target, in the same order as
+    discover_files (sorted path strings), one directory listing at a time.
+    """
+    if path.is_file():
+        yield str(path)
+        return
+    root = str(path)
+    yield from _walk(root, "" if root == "." else root.rstrip(os.sep) + os.sep)
+
+
+def _walk(directory, prefix):
+    """prefix is directory as it appears in yielded paths (pathlib drops a leading "./")"""
+    try:
+        entries = list(os.scandir(directory))
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return
+
+    # Sorting siblings by name (+ separator for directories) gives sorted full-path order
+    keyed = []
+    for entry in entries:
+        is_dir = entry.is_dir(follow_symlinks=False)
+        keyed.append((entry.name + os.sep if is_dir else entry.name, entry, is_dir))
+    keyed.sort(key=lambda item: item[0])
+
+    for _, entry, is_dir in keyed:
+        if entry.name.endswith(SOURCE_SUFFIXES):
+            yield prefix + entry.name
+        if is_dir:
+            yield from _walk(entry.path, prefix + entry.name + os.sep)
+
+
+def discover_files(path: Path):
+    """.py and .sql files under target, sorted so output order is stable between runs."""
+    return list(iter_files(path))
+
+
+def check_file(validator, file_path):
+    """Parse one file and validate every embedded query."""
+    errors = []
+    for q in PythonSQLParser(file_path).parse_file():
+        errors.extend(validator.validate(q["query"], file_path, q["line"]))
+    return errors
+
+
+class FileChecker:
+    """
+    Per-process checking state: the validator (loaded on first cache miss, so
+    fully cached runs never load the schema) and the optional result cache.
+    """
+
+    def __init__(self, schema_path="schema.json", config_path="default_config.yaml", cache=None,
+                 profiler=None):
+        self.schema_path = schema_path
+        self.config_path = config_path
+        self.cache = cache
+        self.profiler = profiler
+        self._validator = None
+
+        if profiler is not None:
+            profiler.instrument(self, "read")
+            profiler.instrument(self, "parse")
+            profiler.instrument(self, "check", "file", on_call=lambda args, kwargs, seconds:
+                                profiler.note_file(args[0], seconds))
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            from src.validator import SQLValidator
+
+            if self.profiler is None:
+                self._validator = SQLValidator(self.schema_path, self.config_path)
+            else:
+                start = time.perf_counter()
+                self._validator = SQLValidator(self.schema_path, self.config_path)
+                self.profiler.add("load_schema", time.perf_counter() - start)
+                self._validator.set_profiler(self.profiler)
+        return self._validator
+
+    def read(self, file_path):
+        try:
+            with open(file_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def parse(self, file_path, content):
+        return PythonSQLParser(file_path).parse_source(content)
+
+    def check(self, file_path):
+        """Return (errors, cache_status) where cache_status is "hit", "miss" or None."""
+        if file_path.endswith(".sql"):
+            return self.check_sql(file_path)
+
+        content = self.read(file_path)
+        if content is None:
+            return [], None
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(content, "py")
+            errors = self.cache.get(key, file_path)
+            if errors is not None:
+                return errors, "hit"
+
+        errors = []
+        for q in self.parse(file_path, content):
+            errors.extend(self.validator.validate(q["query"], file_path, q["line"]))
+
+        if key is None:
+            return errors, None
+        self.cache.put(key, errors)
+        return errors, "miss"
+
+    def check_sql(self, file_path):
+        """
+        Validate a .sql script statement by statement, streaming it from disk
+        (never held in memory as a whole, however large).
+        """
+        key = None
+        if self.cache is not None:
+            try:
+                key = self.cache.file_key(file_path, "sql")
+            except FileNotFoundError:
+                return [], None
+            errors = self.cache.get(key, file_path)
+            if errors is not None:
+                return errors, "hit"
+
+        parser = SQLFileParser(file_path)
+        errors = []
+        for q in parser.iter_queries():
+            errors.extend(self.validator.validate(q["query"], file_path, q["line"]))
+        for line in parser.skipped:
+            errors.append(Diagnostic(
+                f"Statement too long to check (over {parser.max_chars} characters)",
+                severity="warning",
+                file=file_path,
+                line=line,
+            ))
+        errors.sort(key=lambda e: e.line)
+
+        if key is None:
+            return errors, None
+        self.cache.put(key, errors)
+        return errors, "miss"
+
+    def record_caches(self):
+        """Report result cache and query memo hit counts to the profiler."""
+        if self.cache is not None:
+            self.profiler.record_cache("result_cache", self.cache.stats["hits"], self.cache.stats["misses"])
+        if self._validator is not None:
+            memo = self._validator.memo
+            self.profiler.record_cache("query_memo", memo.hits, memo.misses)
+
+
+# ---------------- PROCESS POOL ----------------
+# Each worker loads the schema/config at most once and reuses it.
+LAZY_CHUNKSIZE = 4  # files per task when the total count is not known up front
+
+_worker_checker = None
+
+
+def _init_worker(schema_path, config_path, cache_args):
+    global _worker_checker
+    cache = ResultCache(**cache_args) if cache_args else None
+    _worker_checker = FileChecker(schema_path, config_path, cache)
+
+
+def _check_in_worker(file_path):
+    return (file_path, *_worker_checker.check(file_path))
+
+
+def check_files(files, jobs=None, schema_path="schema.json", config_path="default_config.yaml",
+                cache=None, profiler=None):
+    """
+    Yield (file_path, errors) for each file, in the order given, as soon as
+    each file is done. `files` may be a list or a lazy iterable (iter_files).
+    Work is spread over `jobs` processes (default: CPU count). Cache hit/miss
+    counts from all workers are accumulated into cache.stats.
+    With a profiler (src.profiler.Profiler) files are checked in this process.
+    """
+    jobs = 1 if profiler is not None else (jobs or os.cpu_count() or 1)
+
+    if not hasattr(files, "__len__"):
+        # Lazy input: read ahead only enough to know whether a pool is worth it
+        files = iter(files)
+        head = list(islice(files, jobs))
+        files = head if len(head) < jobs else chain(head, files)
+
+    if hasattr(files, "__len__"):
+        jobs = min(jobs, len(files))
+        chunksize = max(1, len(files) // (jobs * 8))
+    else:
+        chunksize = LAZY_CHUNKSIZE
+
+    if jobs <= 1:
+        checker = FileChecker(schema_path, config_path, cache, profiler)
+        for file_path in files:
+            errors, _ = checker.check(file_path)
+            yield file_path, errors
+        if profiler is not None:
+            checker.record_caches()
+        return
+
+    cache_args = None
+    if cache is not None:
+        cache_args = {
+            "cache_dir": cache.cache_dir,
+            "schema_path": schema_path,
+            "config_path": config_path,
+            "max_bytes": cache.max_bytes,
+        }
+
+    from multiprocessing import Pool
+
+    with Pool(jobs, initializer=_init_worker, initargs=(schema_path, config_path, cache_args)) as pool:
+        # imap keeps input order → deterministic output regardless of scheduling
+        for file_path, errors, status in pool.imap(_check_in_worker, files, chunksize=chunksize):
+            if status == "hit":
+                cache.stats["hits"] += 1
+            elif status == "miss":
+                cache.stats["misses"] += 1
+                cache.stats["writes"] += 1
+            yield file_path, errors
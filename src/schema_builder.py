@@ -0,0 +1,582 @@
+# src/schema_builder.py
+#
+# Offline schema snapshots: build schema.json from DDL instead of a live
+# database, for CI runners without database access. The input can be a
+# `pg_dump --schema-only` file (or stdin), any DDL script, or a migrations
+# directory applied in order.
+#
+# Statements stream through src.sql_splitter, which skips COPY data and
+# oversized statements without buffering them. Only the statements that
+# shape tables are tokenized:
+#   CREATE / ALTER / DROP TABLE, DROP SCHEMA, CREATE DOMAIN, search_path
+# Memory is therefore bounded by the resulting schema, not by the dump.
+#
+# Each column gets the data_type and is_nullable that information_schema
+# would report for the same database:
+#   - modifiers are dropped and aliases resolved (varchar(20) →
+#     "character varying", int4 → "integer", timestamptz →
+#     "timestamp with time zone")
+#   - arrays become "ARRAY", domains become their underlying type, and
+#     other named types become "USER-DEFINED"
+#   - serial, identity and primary key columns are NOT NULL
+# The output is the extractor's format: for the same database it is
+# byte-identical to SchemaExtractor.save_to_file (both order tables by
+# code point, not by the database collation).
+
+import argparse
+import os
+import re
+import sys
+from src.schema_extractor import table_key, write_snapshot
+from src.schema_index import DEFAULT_SCHEMA
+from src.sql_splitter import iter_statements
+
+# Statements worth tokenizing (anything else is skipped on this prefix test)
+_RELEVANT = re.compile(
+    r"(?:CREATE\s+(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMP|TEMPORARY|UNLOGGED)\s+)?(?:TABLE|DOMAIN)"
+    r"|ALTER\s+TABLE|DROP\s+(?:TABLE|SCHEMA)|SET\s+(?:(?:SESSION|LOCAL)\s+)?search_path"
+    r"|SELECT\s+pg_catalog\.set_config\s*\(\s*'search_path')\b",
+    re.IGNORECASE,
+)
+
+# Single-action ALTER TABLE statements that never change a column list,
+# nullability or type (most of the ALTER TABLEs in a pg_dump); only skipped
+# without tokenizing when the statement has no comma, i.e. no second action
+_NAME = r'(?:"[^"]*"|[\w$]+)'
+_INERT_ALTER = re.compile(
+    rf"ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?{_NAME}(?:\s*\.\s*{_NAME})*\s*\*?\s*"
+    rf"(?:OWNER\s+TO|ENABLE|DISABLE|CLUSTER|REPLICA|ATTACH|DETACH|FORCE|NO\s+FORCE|RESET"
+    rf"|SET\s+(?:WITH|WITHOUT|LOGGED|UNLOGGED|ACCESS|TABLESPACE|\()"
+    rf"|ALTER\s+(?:COLUMN\s+)?{_NAME}\s+(?:SET\s+DEFAULT|DROP\s+DEFAULT|ADD\s+GENERATED|SET\s+STATISTICS|SET\s+STORAGE)"
+    rf"|ADD\s+CONSTRAINT\s+{_NAME}\s+(?:FOREIGN|UNIQUE|CHECK|EXCLUDE))\b",
+    re.IGNORECASE,
+)
+
+# One token (group 1), with the blanks and comments before it. Tokens stay
+# plain strings: quoted identifiers and strings keep their quotes, so they
+# never compare equal to a keyword or an operator.
+_TOKEN = re.compile(
+    r"""
+    (?:\s+|--[^\n]*|/\*.*?\*/)*
+    (
+      "(?:[^"]|"")*"
+    | '(?:[^']|'')*'
+    | \$(?P<tag>[A-Za-z_]\w*)?\$.*?\$(?P=tag)\$
+    | [^\W\d]\w*
+    | \d+(?:\.\d*)?
+    | ::
+    | \S
+    | \Z
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# information_schema.columns.data_type of the built-in types, by name as written
+BUILTIN_TYPES = {
+    "int": "integer", "integer": "integer", "int4": "integer",
+    "bigint": "bigint", "int8": "bigint",
+    "smallint": "smallint", "int2": "smallint",
+    "real": "real", "float4": "real",
+    "double precision": "double precision", "float8": "double precision", "float": "double precision",
+    "numeric": "numeric", "decimal": "numeric",
+    "boolean": "boolean", "bool": "boolean",
+    "character varying": "character varying", "char varying": "character varying", "varchar": "character varying",
+    "character": "character", "char": "character", "bpchar": "character",
+    "text": "text", "name": "name",
+    "timestamp": "timestamp without time zone", "timestamp without time zone": "timestamp without time zone",
+    "timestamp with time zone": "timestamp with time zone", "timestamptz": "timestamp with time zone",
+    "time": "time without time zone", "time without time zone": "time without time zone",
+    "time with time zone": "time with time zone", "timetz": "time with time zone",
+    "date": "date", "interval": "interval",
+    "bit": "bit", "bit varying": "bit varying", "varbit": "bit varying",
+    "bytea": "bytea", "uuid": "uuid", "json": "json", "jsonb": "jsonb", "xml": "xml", "money": "money",
+    "inet": "inet", "cidr": "cidr", "macaddr": "macaddr", "macaddr8": "macaddr8",
+    "tsvector": "tsvector", "tsquery": "tsquery", "oid": "oid", "regclass": "regclass", "pg_lsn": "pg_lsn",
+    "point": "point", "line": "line", "lseg": "lseg", "box": "box", "path": "path",
+    "polygon": "polygon", "circle": "circle",
+    "int4range": "int4range", "int8range": "int8range", "numrange": "numrange",
+    "tsrange": "tsrange", "tstzrange": "tstzrange", "daterange": "daterange",
+}
+
+# Pseudo-types expanding to an integer type plus a sequence; always NOT NULL
+SERIAL_TYPES = {
+    "serial": "integer", "serial4": "integer",
+    "bigserial": "bigint", "serial8": "bigint",
+    "smallserial": "smallint", "serial2": "smallint",
+}
+
+# Keywords ending the type of a column definition
+_COLUMN_CONSTRAINTS = {
+    "CONSTRAINT", "NOT", "NULL", "DEFAULT", "PRIMARY", "UNIQUE", "CHECK", "REFERENCES",
+    "COLLATE", "GENERATED", "COMPRESSION", "STORAGE",
+}
+
+# First keyword of a table constraint (as opposed to a column definition)
+_TABLE_CONSTRAINTS = {"CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN", "EXCLUDE"}
+
+
+def natural_key(path):
+    """Sort key ordering V2__x.sql before V10__x.sql."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", str(path))]
+
+
+def _is_down_migration(name):
+    """golang-migrate / dbmate style *.down.sql, diesel style down.sql, Flyway undo U<version>__*.sql"""
+    return name == "down.sql" or name.endswith(".down.sql") or re.match(r"U\d", name) is not None
+
+
+def migration_files(directory):
+    """.sql files under directory in application order, down migrations left out."""
+    files = []
+    for root, dirs, names in os.walk(directory):
+        for name in names:
+            if name.endswith(".sql") and not _is_down_migration(name):
+                files.append(os.path.relpath(os.path.join(root, name), directory))
+    return [os.path.join(directory, f) for f in sorted(files, key=natural_key)]
+
+
+# ---------------- TOKENS ----------------
+def is_word(token):
+    return token[:1].isalpha() or token[:1] == "_"
+
+
+def unquote(token):
+    """Identifier or word token → the name it refers to (unquoted names fold to lower case)."""
+    if token[:1] == '"':
+        return token[1:-1].replace('""', '"')
+    if is_word(token):
+        return token.lower()
+    raise ValueError(f"expected an identifier, got {token!r}")
+
+
+class _Tokens:
+    """Tokens of one statement, as strings, with a read position."""
+
+    def __init__(self, text):
+        self.items = [token for token, _ in _TOKEN.findall(text)]
+        self.items.pop()  # the empty match at the end
+        self.pos = 0
+
+    @classmethod
+    def of(cls, items):
+        tokens = cls("")
+        tokens.items = items
+        return tokens
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.items[i] if i < len(self.items) else ""
+
+    def keyword(self, offset=0):
+        return self.peek(offset).upper()
+
+    def at_end(self):
+        return self.pos >= len(self.items)
+
+    def next(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def accept(self, *words):
+        """Consume the keywords if they come next (all of them); True if they did."""
+        for i, word in enumerate(words):
+            if self.keyword(i) != word:
+                return False
+        self.pos += len(words)
+        return True
+
+    def identifier(self):
+        return unquote(self.next())
+
+    def qualified_name(self):
+        """name, schema.name or db.schema.name → [parts]"""
+        parts = [self.identifier()]
+        while self.peek() == ".":
+            self.pos += 1
+            parts.append(self.identifier())
+        return parts[-2:]
+
+    def group(self):
+        """Items inside the parenthesized group starting here (consumed)."""
+        if self.peek() != "(":
+            raise ValueError("expected (")
+        depth, start = 0, self.pos
+        for i in range(start, len(self.items)):
+            token = self.items[i]
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+                if depth == 0:
+                    self.pos = i + 1
+                    return self.items[start + 1:i]
+        raise ValueError("unbalanced parentheses")
+
+    def until(self, keywords):
+        """Items up to the first of keywords (or the end), consumed."""
+        start = end = self.pos
+        for token in self.items[start:]:
+            if token.upper() in keywords:
+                break
+            end += 1
+        self.pos = end
+        return self.items[start:end]
+
+    def rest(self):
+        items, self.pos = self.items[self.pos:], len(self.items)
+        return items
+
+
+def split_top(items, separator=","):
+    """Split token items on separators outside parentheses."""
+    parts, current, depth = [], [], 0
+    for token in items:
+        if token == "(" or token == "[":
+            depth += 1
+        elif token == ")" or token == "]":
+            depth -= 1
+        elif token == separator and depth == 0:
+            parts.append(current)
+            current = []
+            continue
+        current.append(token)
+    if current:
+        parts.append(current)
+    return parts
+
+
+# ---------------- BUILDER ----------------
+class DDLSchemaBuilder:
+    """
+        builder = DDLSchemaBuilder(schemas=["public", "audit"])
+        builder.feed_path("db/migrations")       # a directory, a .sql file or "-" (stdin)
+        builder.save_to_file("schema.json")
+
+    Tables are kept as {(schema, table): {column: {"name", "type", "nullable"}}}.
+    Statements that cannot be reproduced offline (CREATE TABLE ... AS,
+    typed tables) are skipped with a warning in self.warnings.
+    """
+
+    def __init__(self, schemas=None):
+        self.schemas = list(schemas or [DEFAULT_SCHEMA])
+        self.tables = {}
+        self.domains = {}               # (schema, name) -> data_type
+        self.search_schema = DEFAULT_SCHEMA
+        self.warnings = []
+        self.statements = 0
+
+    # ---------------- INPUT ----------------
+    def feed_path(self, path):
+        if path == "-":
+            self.feed(sys.stdin, "<stdin>")
+        elif os.path.isdir(path):
+            for file_path in migration_files(path):
+                self.feed_file(file_path)
+        else:
+            self.feed_file(path)
+
+    def feed_file(self, file_path):
+        with open(file_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+            self.feed(f, file_path)
+
+    def feed(self, lines, source="<ddl>"):
+        """Apply every statement of an iterable of lines (streamed)."""
+        for line, statement in iter_statements(lines):
+            if statement is None or not _RELEVANT.match(statement):
+                continue
+            if "," not in statement and _INERT_ALTER.match(statement):
+                continue
+            try:
+                self.apply(statement)
+            except (ValueError, IndexError) as e:
+                self.warnings.append(f"{source}:{line}: statement skipped ({e})")
+            else:
+                self.statements += 1
+
+    def apply(self, statement):
+        tokens = _Tokens(statement)
+        first = tokens.keyword()
+        if first == "CREATE":
+            tokens.pos = 1
+            tokens.accept("GLOBAL") or tokens.accept("LOCAL")
+            if tokens.keyword() in ("TEMP", "TEMPORARY"):
+                return  # session-local, never in a snapshot
+            tokens.accept("UNLOGGED")
+            if tokens.accept("DOMAIN"):
+                self._create_domain(tokens)
+            elif tokens.accept("TABLE"):
+                self._create_table(tokens)
+        elif first == "ALTER":
+            tokens.pos = 2
+            self._alter_table(tokens)
+        elif first == "DROP":
+            tokens.pos = 1
+            if tokens.accept("TABLE"):
+                self._drop_tables(tokens)
+            elif tokens.accept("SCHEMA"):
+                self._drop_schemas(tokens)
+        elif first == "SET":
+            words = [token.lower() for token in tokens.items]
+            self._set_search_path(tokens.items[words.index("search_path") + 1:])
+        elif first == "SELECT":
+            strings = [token for token in tokens.items if token[:1] == "'"]
+            if len(strings) >= 2:
+                self._set_search_path(_Tokens(strings[1][1:-1].replace("''", "'")).items)
+
+    # ---------------- STATEMENTS ----------------
+    def _name(self, parts):
+        return (parts[0], parts[1]) if len(parts) == 2 else (self.search_schema, parts[0])
+
+    def _set_search_path(self, items):
+        names = [
+            token[1:-1] if token[:1] == "'" else unquote(token) for token in items
+            if token[:1] in ("'", '"') or is_word(token) and token.upper() not in ("TO", "FROM", "CURRENT", "DEFAULT")
+        ]
+        names = [n for n in names if n and n not in ("pg_catalog", "$user", '"$user"')]
+        self.search_schema = names[0] if names else DEFAULT_SCHEMA
+
+    def _create_domain(self, tokens):
+        name = self._name(tokens.qualified_name())
+        tokens.accept("AS")
+        self.domains[name] = self.data_type(tokens.until(_COLUMN_CONSTRAINTS))[0]
+
+    def _create_table(self, tokens):
+        if_not_exists = tokens.accept("IF", "NOT", "EXISTS")
+        name = self._name(tokens.qualified_name())
+        if if_not_exists and name in self.tables:
+            return
+
+        if tokens.accept("PARTITION", "OF"):
+            parent = self._name(tokens.qualified_name())
+            columns = self._copy_columns(parent)
+            if tokens.peek() == "(":
+                self._table_elements(columns, tokens.group())
+        elif tokens.keyword() == "OF":
+            raise ValueError("typed tables (CREATE TABLE ... OF type) are not supported")
+        elif tokens.peek() == "(":
+            elements = tokens.group()
+            columns = {}
+            if tokens.accept("INHERITS"):
+                for parts in split_top(tokens.group()):
+                    for column in self._copy_columns(self._name(_Tokens.of(parts).qualified_name())).values():
+                        columns.setdefault(column["name"], column)
+            self._table_elements(columns, elements)
+        else:
+            raise ValueError("CREATE TABLE without a column list (e.g. AS query) is not supported")
+
+        self.tables[name] = columns
+
+    def _copy_columns(self, table):
+        if table not in self.tables:
+            raise ValueError(f"unknown table {'.'.join(table)}")
+        return {c: dict(column) for c, column in self.tables[table].items()}
+
+    def _table_elements(self, columns, elements):
+        for items in split_top(elements):
+            element = _Tokens.of(items)
+            keyword = element.keyword()
+            if keyword == "LIKE":
+                element.pos = 1
+                for c, column in self._copy_columns(self._name(element.qualified_name())).items():
+                    columns.setdefault(c, column)
+            elif _is_table_constraint(element):
+                self._table_constraint(columns, element)
+            else:
+                self._column_definition(columns, element)
+
+    def _column_definition(self, columns, element, if_not_exists=False):
+        name = element.identifier()
+        if element.accept("WITH", "OPTIONS"):  # partition / typed table column options
+            if name in columns and _not_null(element.rest()):
+                columns[name]["nullable"] = False
+            return
+        if if_not_exists and name in columns:
+            return
+
+        data_type, implied_not_null = self.data_type(element.until(_COLUMN_CONSTRAINTS))
+        inherited = columns.get(name)
+        nullable = not (implied_not_null or _not_null(element.rest()))
+        if inherited is not None:  # merged with an inherited column
+            nullable = nullable and inherited["nullable"]
+        columns[name] = {"name": name, "type": data_type, "nullable": nullable}
+
+    def _table_constraint(self, columns, element):
+        if element.accept("CONSTRAINT"):
+            element.identifier()
+        if element.accept("PRIMARY", "KEY") and element.peek() == "(":
+            for parts in split_top(element.group()):
+                column = columns.get(_Tokens.of(parts).identifier())
+                if column is not None:
+                    column["nullable"] = False
+
+    def _alter_table(self, tokens):
+        tokens.accept("IF", "EXISTS")
+        tokens.accept("ONLY")
+        name = self._name(tokens.qualified_name())
+        if tokens.peek() == "*":
+            tokens.pos += 1
+        columns = self.tables.get(name)
+        if columns is None:
+            return  # e.g. a view or sequence altered through ALTER TABLE
+
+        if tokens.accept("RENAME", "TO"):
+            self.tables[(name[0], tokens.identifier())] = self.tables.pop(name)
+            return
+        if tokens.accept("SET", "SCHEMA"):
+            self.tables[(tokens.identifier(), name[1])] = self.tables.pop(name)
+            return
+        if tokens.accept("RENAME"):
+            if tokens.keyword() == "CONSTRAINT":
+                return
+            tokens.accept("COLUMN")
+            old = tokens.identifier()
+            tokens.accept("TO")
+            new = tokens.identifier()
+            self.tables[name] = {
+                (new if c == old else c): (dict(column, name=new) if c == old else column)
+                for c, column in columns.items()
+            }
+            return
+
+        for items in split_top(tokens.rest()):
+            self._alter_action(columns, _Tokens.of(items))
+
+    def _alter_action(self, columns, action):
+        if action.accept("ADD"):
+            if _is_table_constraint(action):
+                self._table_constraint(columns, action)
+                return
+            action.accept("COLUMN")
+            self._column_definition(columns, action, if_not_exists=action.accept("IF", "NOT", "EXISTS"))
+        elif action.accept("DROP"):
+            if action.keyword() == "CONSTRAINT":
+                return
+            action.accept("COLUMN")
+            action.accept("IF", "EXISTS")
+            columns.pop(action.identifier(), None)
+        elif action.accept("ALTER"):
+            action.accept("COLUMN")
+            column = columns.get(action.identifier())
+            if column is None:
+                return
+            if action.accept("SET", "DATA", "TYPE") or action.accept("TYPE"):
+                column["type"] = self.data_type(action.until(("USING", "COLLATE")))[0]
+            elif action.accept("SET", "NOT", "NULL"):
+                column["nullable"] = False
+            elif action.accept("DROP", "NOT", "NULL"):
+                column["nullable"] = True
+
+    def _drop_tables(self, tokens):
+        tokens.accept("IF", "EXISTS")
+        for parts in split_top(tokens.rest()):
+            names = [token for token in parts if token.upper() not in ("CASCADE", "RESTRICT")]
+            self.tables.pop(self._name(_Tokens.of(names).qualified_name()), None)
+
+    def _drop_schemas(self, tokens):
+        tokens.accept("IF", "EXISTS")
+        dropped = set()
+        for parts in split_top(tokens.rest()):
+            element = _Tokens.of(parts)
+            dropped.add(element.identifier())
+        for name in [t for t in self.tables if t[0] in dropped]:
+            del self.tables[name]
+
+    # ---------------- TYPES ----------------
+    def data_type(self, items):
+        """(information_schema data_type, implied NOT NULL) for the tokens of a type."""
+        if not items:
+            raise ValueError("missing column type")
+        if "[" in items or any(token.upper() == "ARRAY" for token in items):
+            return "ARRAY", False
+
+        schema, words, modifiers, depth = None, [], [], 0
+        for token in items:
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+            elif depth:
+                modifiers.append(token)
+            elif token == "." and len(words) == 1:
+                schema = words.pop()
+            else:
+                words.append(unquote(token))
+        name = " ".join(words)
+
+        if schema in (None, "pg_catalog"):
+            if name in SERIAL_TYPES:
+                return SERIAL_TYPES[name], True
+            if name.startswith("interval"):
+                return "interval", False
+            builtin = BUILTIN_TYPES.get(name)
+            if builtin is not None:
+                if name == "float" and modifiers and modifiers[0].isdigit() and int(modifiers[0]) <= 24:
+                    return "real", False
+                return builtin, False
+
+        for key in ((schema, name),) if schema else ((self.search_schema, name), (DEFAULT_SCHEMA, name)):
+            if key in self.domains:
+                return self.domains[key], False
+        return "USER-DEFINED", False
+
+    # ---------------- OUTPUT ----------------
+    def iter_tables(self):
+        """(table_key, {"columns": [...]}) for the selected schemas, in extraction order."""
+        selected = set(self.schemas)
+        for schema, table in sorted(t for t in self.tables if t[0] in selected):
+            yield table_key(schema, table), {"columns": list(self.tables[(schema, table)].values())}
+
+    def extract_schema(self):
+        return dict(self.iter_tables())
+
+    def save_to_file(self, output_file="schema.json", compile=False, dedup=False):
+        write_snapshot(self.iter_tables(), output_file, compile=compile, dedup=dedup)
+        for warning in self.warnings:
+            print(f"⚠️ {warning}")
+        print(f"✅ Schema saved to {output_file} ({self.statements} DDL statements applied)")
+
+
+def _is_table_constraint(element):
+    keyword = element.keyword()
+    if keyword == "EXCLUDE":  # not reserved: may also be a column name
+        return element.keyword(1) == "USING" or element.peek(1) == "("
+    return keyword in _TABLE_CONSTRAINTS
+
+
+def _not_null(items):
+    """Column constraint items imply NOT NULL (NOT NULL, PRIMARY KEY or an identity column)."""
+    depth = 0
+    words = []
+    for token in items:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            words.append(token.upper())
+    for a, b in zip(words, words[1:]):
+        if (a, b) in (("NOT", "NULL"), ("PRIMARY", "KEY")):
+            return True
+    return "GENERATED" in words and "IDENTITY" in words
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(
+        description="Build schema.json offline from a pg_dump --schema-only file, DDL scripts or a migrations directory")
+    ap.add_argument("inputs", nargs="+",
+                    help="DDL files, migration directories (applied in natural filename order) or - for stdin")
+    ap.add_argument("--output", default="schema.json")
+    ap.add_argument("--schema", action="append", dest="schemas",
+                    help="schema to include (repeatable, default: public)")
+    ap.add_argument("--compile", action="store_true",
+                    help="also write the compiled snapshot (schema.pgsg) next to the output")
+    ap.add_argument("--dedup", action="store_true",
+                    help="store identical table layouts of non-public schemas once (schema-per-tenant)")
+    args = ap.parse_args()
+
+    builder = DDLSchemaBuilder(schemas=args.schemas)
+    for path in args.inputs:
+        builder.feed_path(path)
+    builder.save_to_file(args.output, compile=args.compile, dedup=args.dedup)
@@ -1,6 +1,152 @@
+import argparse
 import json
-import pg8000
 import os
+from pathlib import Path
+from src.layouts import deduplicate, expand, is_deduplicated
+from src.schema_index import DEFAULT_SCHEMA
+from src.snapshot import SnapshotWriter, compile_schema, file_digest, snapshot_path
+
+# One ordered round trip for every table and column of the selected schemas.
+# LEFT JOIN keeps tables without columns. Names are ordered by code point
+# (COLLATE "C"), like every sorted() downstream, whatever the database
+# collation.
+_BULK_COLUMNS_SQL = """
+    SELECT
+        t.table_schema,
+        t.table_name,
+        c.column_name,
+        c.data_type,
+        c.is_nullable
+    FROM information_schema.tables t
+    LEFT JOIN information_schema.columns c
+      ON c.table_schema = t.table_schema
+     AND c.table_name = t.table_name
+    WHERE t.table_schema = ANY(%s)
+      AND t.table_type = 'BASE TABLE'{extra}
+    ORDER BY t.table_schema COLLATE "C", t.table_name COLLATE "C", c.ordinal_position
+"""
+BULK_COLUMNS_QUERY = _BULK_COLUMNS_SQL.format(extra="")
+
+# Same, restricted to a list of schema.table names (incremental refresh)
+SELECTED_COLUMNS_QUERY = _BULK_COLUMNS_SQL.format(
+    extra="\n      AND t.table_schema || '.' || t.table_name = ANY(%s)"
+)
+
+# Cheap per-table fingerprint over pg_attribute, one row per table
+TABLE_FINGERPRINTS_QUERY = """
+    SELECT
+        n.nspname,
+        c.relname,
+        coalesce(md5(string_agg(
+            a.attname || ':' || format_type(a.atttypid, a.atttypmod) || ':' || a.attnotnull::text,
+            ',' ORDER BY a.attnum
+        )), '')
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_attribute a
+      ON a.attrelid = c.oid
+     AND a.attnum > 0
+     AND NOT a.attisdropped
+    WHERE n.nspname = ANY(%s)
+      AND c.relkind IN ('r', 'p')
+    GROUP BY n.nspname, c.relname
+"""
+
+def table_key(schema, table):
+    """Snapshot key: bare name for the default schema, schema.table otherwise."""
+    return table if schema == DEFAULT_SCHEMA else f"{schema}.{table}"
+
+
+def write_schema_json(tables, f):
+    """
+    Stream (name, meta) pairs to f as a JSON object, one table at a time.
+    Output is byte-identical to json.dump(dict(tables), f, indent=2).
+    """
+    first = True
+    for name, meta in tables:
+        body = json.dumps(meta, indent=2).replace("\n", "\n  ")
+        f.write(("{\n  " if first else ",\n  ") + json.dumps(name) + ": " + body)
+        first = False
+    f.write("{}" if first else "\n}")
+
+
+def write_snapshot(tables, output_file, compile=False, dedup=False):
+    """
+    Stream (name, meta) pairs into output_file; with dedup=True as shared
+    layouts (src/layouts.py), with compile=True also into the binary .pgsg
+    in the same pass.
+    """
+    if dedup:
+        tables = deduplicate(tables)
+    writer = SnapshotWriter(snapshot_path(output_file)) if compile else None
+    if writer:
+        tables = _tee_to(writer, tables)
+
+    try:
+        with open(output_file, "w") as f:
+            write_schema_json(tables, f)
+    except BaseException:
+        if writer:
+            writer.abort()
+        raise
+
+    if writer:
+        stat = os.stat(output_file)
+        writer.close(file_digest(output_file), stat.st_size, stat.st_mtime_ns)
+
+
+def _tee_to(writer, tables):
+    for name, meta in tables:
+        writer.add_table(name, meta)
+        yield name, meta
+
+
+def fingerprint_path(output_file):
+    """Fingerprints are stored next to the snapshot: schema.json → schema.fingerprints.json"""
+    path = Path(output_file)
+    return path.with_name(path.stem + ".fingerprints.json")
+
+
+def diff_schemas(old, new):
+    """
+    Table- and column-level differences between two snapshots:
+    {"added": [...], "removed": [...], "changed": {table: {"added_columns", "removed_columns", "modified_columns"}}}
+    """
+    diff = {
+        "added": [t for t in new if t not in old],
+        "removed": [t for t in old if t not in new],
+        "changed": {},
+    }
+
+    for table in new:
+        if table not in old or old[table] == new[table]:
+            continue
+        old_cols = {c["name"]: c for c in old[table]["columns"]}
+        new_cols = {c["name"]: c for c in new[table]["columns"]}
+        diff["changed"][table] = {
+            "added_columns": [c for c in new_cols if c not in old_cols],
+            "removed_columns": [c for c in old_cols if c not in new_cols],
+            "modified_columns": [c for c in new_cols if c in old_cols and new_cols[c] != old_cols[c]],
+        }
+
+    return diff
+
+
+def format_diff(diff):
+    lines = []
+    for table in diff["added"]:
+        lines.append(f"  + {table}")
+    for table in diff["removed"]:
+        lines.append(f"  - {table}")
+    for table, changes in diff["changed"].items():
+        parts = (
+            [f"+{c}" for c in changes["added_columns"]]
+            + [f"-{c}" for c in changes["removed_columns"]]
+            + [f"~{c}" for c in changes["modified_columns"]]
+        )
+        lines.append(f"  ~ {table}: {', '.join(parts) or 'column order'}")
+    return "\n".join(lines)
+
 
 class SchemaExtractor:
     def __init__(
@@ -10,13 +156,19 @@ class SchemaExtractor:
         database=None,
         user=None,
         password=None,
+        schemas=None,
+        connection=None,
+        fetch_size=2000,
     ):
         self.host = host or os.getenv("DB_HOST", "localhost")
         self.port = port or int(os.getenv("DB_PORT", 5432))
         self.database = database or os.getenv("DB_DATABASE")
         self.user = user or os.getenv("DB_USER")
         self.password = password or os.getenv("DB_PASSWORD")
-        self.conn = None
+        self.schemas = list(schemas or [DEFAULT_SCHEMA])
+        self.fetch_size = fetch_size
+        # Any DB-API connection may be injected (tests, pooled connections)
+        self.conn = connection
 
 
     def connect(self):
@@ -27,6 +179,8 @@ class SchemaExtractor:
                     "Set DB_NAME, DB_USER, and DB_PASSWORD environment variables."
                 )
 
+            import pg8000
+
             self.conn = pg8000.connect(
                 host=self.host,
                 port=self.port,
@@ -43,52 +197,57 @@ class SchemaExtractor:
         if self.conn:
             self.conn.close()
 
-    def extract_tables(self):
+    def stream_rows(self, query, params=()):
         """
-        Return list of table names from 'public' schema.
+        Yield result rows through a server-side cursor, fetch_size rows at a
+        time, so client memory stays flat however large the result is.
         """
         cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-              AND table_type = 'BASE TABLE';
-            """
-        )
-        tables = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        return tables
+        try:
+            cursor.execute(f"DECLARE pyschemaguard_rows NO SCROLL CURSOR FOR {query}", params)
+            while True:
+                cursor.execute(f"FETCH FORWARD {int(self.fetch_size)} FROM pyschemaguard_rows")
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                yield from rows
+            cursor.execute("CLOSE pyschemaguard_rows")
+        finally:
+            cursor.close()
+            self.conn.rollback()  # end the read-only transaction holding the cursor
 
-    def extract_columns(self, table_name):
+    def iter_tables(self, only=None):
         """
-        Return list of column dicts: {name, data_type, is_nullable}
+        Yield (table_key, {"columns": [...]}) for every table of the selected
+        schemas, grouped client-side from one ordered bulk query.
+        `only` restricts extraction to a list of "schema.table" names.
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT
-                column_name,
-                data_type,
-                is_nullable
-            FROM information_schema.columns
-            WHERE table_schema = 'public'
-              AND table_name = %s
-            ORDER BY ordinal_position;
-            """,
-            (table_name,),
-        )
+        current = None
         columns = []
-        for name, data_type, is_nullable in cursor.fetchall():
-            columns.append(
-                {
-                    "name": name,
-                    "type": data_type,
-                    "nullable": (is_nullable == "YES"),
-                }
-            )
-        cursor.close()
-        return columns
+
+        if only is None:
+            rows = self.stream_rows(BULK_COLUMNS_QUERY, (self.schemas,))
+        else:
+            rows = self.stream_rows(SELECTED_COLUMNS_QUERY, (self.schemas, list(only)))
+
+        for schema, table, name, data_type, is_nullable in rows:
+            key = table_key(schema, table)
+            if key != current:
+                if current is not None:
+                    yield current, {"columns": columns}
+                current, columns = key, []
+
+            if name is not None:  # LEFT JOIN row of a table without columns
+                columns.append(
+                    {
+                        "name": name,
+                        "type": data_type,
+                        "nullable": (is_nullable == "YES"),
+                    }
+                )
+
+        if current is not None:
+            yield current, {"columns": columns}
 
     def extract_schema(self):
         """
@@ -98,28 +257,120 @@ class SchemaExtractor:
           "employees":   { "columns": [ ... ] }
         }
         """
-        schema = {}
-        tables = self.extract_tables()
-        for table in tables:
-            schema[table] = {
-                "columns": self.extract_columns(table),
-            }
-        return schema
-
-    def save_to_file(self, output_file="schema.json"):
+        return dict(self.iter_tables())
+
+    def table_fingerprints(self):
+        """Return {table_key: (schema, table, fingerprint)} from one catalog query."""
+        return {
+            table_key(schema, table): (schema, table, fp)
+            for schema, table, fp in self.stream_rows(TABLE_FINGERPRINTS_QUERY, (self.schemas,))
+        }
+
+    def _save_fingerprints(self, output_file, fingerprints):
+        with open(fingerprint_path(output_file), "w") as f:
+            json.dump(
+                {"schemas": self.schemas, "tables": {k: v[2] for k, v in fingerprints.items()}},
+                f,
+                indent=2,
+            )
+
+    def save_to_file(self, output_file="schema.json", compile=False, dedup=False):
+        """
+        Write the snapshot; with compile=True also the binary .pgsg in the same
+        pass. With dedup=True, tables outside the default schema are stored as
+        shared layouts (src/layouts.py), hashed as they stream in.
+        """
         if not self.conn:
             print("❌ No DB connection. Call connect() first.")
             return
 
-        schema = self.extract_schema()
-        with open(output_file, "w") as f:
-            json.dump(schema, f, indent=2)
+        # Taken first: a concurrent change is then picked up by the next refresh
+        fingerprints = self.table_fingerprints()
+
+        write_snapshot(self.iter_tables(), output_file, compile=compile, dedup=dedup)
+        self._save_fingerprints(output_file, fingerprints)
 
         print(f"✅ Schema saved to {output_file}")
 
+    def refresh(self, output_file="schema.json", compile=False, dedup=False):
+        """
+        Bring an existing snapshot up to date: compare per-table fingerprints
+        with the ones stored next to it, re-extract only added or changed
+        tables, drop removed ones. Returns the schema diff. A deduplicated
+        snapshot (or dedup=True) is written back deduplicated.
+        """
+        if not self.conn:
+            print("❌ No DB connection. Call connect() first.")
+            return None
+
+        try:
+            with open(output_file, "r") as f:
+                old_schema = json.load(f)
+        except FileNotFoundError:
+            old_schema = {}
+        if is_deduplicated(old_schema):
+            dedup = True
+            old_schema = dict(expand(old_schema))
+
+        try:
+            with open(fingerprint_path(output_file), "r") as f:
+                stored = json.load(f)
+            old_fingerprints = stored["tables"] if stored.get("schemas") == self.schemas else {}
+        except (FileNotFoundError, ValueError, KeyError):
+            old_fingerprints = {}
+
+        current = self.table_fingerprints()
+        stale = [
+            key for key, (_, _, fp) in current.items()
+            if key not in old_schema or old_fingerprints.get(key) != fp
+        ]
+
+        fresh = {}
+        if stale:
+            fresh = dict(self.iter_tables(only=[f"{current[k][0]}.{current[k][1]}" for k in stale]))
+
+        # Same ordering as a full extraction (schema, table)
+        new_schema = {
+            key: fresh.get(key, old_schema.get(key))
+            for key in sorted(current, key=lambda k: current[k][:2])
+            if key in fresh or key in old_schema
+        }
+
+        diff = diff_schemas(old_schema, new_schema)
+        reordered = not dedup and list(new_schema) != list(old_schema)
+        if diff["added"] or diff["removed"] or diff["changed"] or reordered:
+            with open(output_file, "w") as f:
+                write_schema_json(deduplicate(new_schema.items()) if dedup else new_schema.items(), f)
+        self._save_fingerprints(output_file, current)
+        if compile:
+            compile_schema(output_file)
+
+        if diff["added"] or diff["removed"] or diff["changed"]:
+            print(f"✅ Schema refreshed ({len(stale)} of {len(current)} tables re-extracted):")
+            print(format_diff(diff))
+        else:
+            print(f"✅ Schema up to date ({len(current)} tables)")
+
+        return diff
+
 
 if __name__ == "__main__":
-    extractor = SchemaExtractor()
+    ap = argparse.ArgumentParser(description="Snapshot a PostgreSQL schema to schema.json")
+    ap.add_argument("command", nargs="?", choices=["extract", "refresh"], default="extract",
+                    help="extract: full snapshot; refresh: re-extract only changed tables")
+    ap.add_argument("--output", default="schema.json")
+    ap.add_argument("--schema", action="append", dest="schemas",
+                    help="schema to include (repeatable, default: public)")
+    ap.add_argument("--compile", action="store_true",
+                    help="also write the compiled snapshot (schema.pgsg) next to the output")
+    ap.add_argument("--dedup", action="store_true",
+                    help="store identical table layouts of non-public schemas once (schema-per-tenant)")
+    args = ap.parse_args()
+
+    extractor = SchemaExtractor(schemas=args.schemas)
     extractor.connect()
-    extractor.save_to_file("schema.json")
+    if args.command == "refresh":
+        extractor.refresh(args.output, compile=args.compile, dedup=args.dedup)
+    else:
+        extractor.save_to_file(args.output, compile=args.compile, dedup=args.dedup)
     extractor.close()
@@ -0,0 +1,217 @@
+# src/schema_index.py
+
+from functools import cached_property
+from src.layouts import SCHEMA_LAYOUTS, SCHEMAS, SECTIONS, TABLE_LAYOUTS
+
+# Tables of this schema are stored under their bare name
+DEFAULT_SCHEMA = "public"
+
+SQL_TYPE_GROUPS = {
+    "numeric": {"integer", "bigint", "smallint", "decimal", "numeric", "real", "double"},
+    "string": {"varchar", "text", "char"},
+    "boolean": {"boolean"},
+}
+
+
+def type_group(column_type: str):
+    """
+    Map a database column type to its literal group ("numeric", "string", "boolean").
+    Returns None for unknown types (→ no type warnings for that column).
+    """
+    column_type = column_type.lower()
+
+    # Normalize common PostgreSQL types
+    if column_type.startswith("character"):
+        column_type = "varchar"
+    elif column_type.startswith("varchar"):
+        column_type = "varchar"
+    elif column_type.startswith("int"):
+        column_type = "integer"
+    elif column_type.startswith("bool"):
+        column_type = "boolean"
+    elif column_type.startswith("double"):
+        column_type = "double"
+
+    for group, types in SQL_TYPE_GROUPS.items():
+        if column_type in types:
+            return group
+
+    return None
+
+
+class TableEntry:
+    """Lookup structures for one table (a src.model.Table)."""
+
+    __slots__ = ("columns", "column_set", "types", "groups")
+
+    def __init__(self, meta, group_cache):
+        names = []
+        self.types = {}    # column -> declared type
+        self.groups = {}   # column -> normalized literal group / None
+
+        for c in meta.columns:
+            name, column_type = c.name, c.type
+            names.append(name)
+
+            if column_type not in group_cache:
+                group_cache[column_type] = type_group(column_type)
+
+            self.types[name] = column_type
+            self.groups[name] = group_cache[column_type]
+
+        self.columns = tuple(names)        # schema order
+        self.column_set = frozenset(names)
+
+
+class SchemaIndex:
+    """
+    Immutable lookup structures derived from a schema snapshot, so that
+    per-query validation only costs O(referenced identifiers).
+
+    Per-table entries are built the first time a table is referenced, and the
+    whole-schema structures (column → tables map, suggestion indexes) the first
+    time a lookup misses. With a lazily decoded snapshot (src/snapshot.py),
+    tables a run never touches are never decoded.
+
+    Tables of deduplicated schemas (src/layouts.py) are resolved through
+    their layouts: every "tenant_x.t" of one table layout shares one entry.
+    """
+
+    def __init__(self, schema):
+        self._schema = schema
+        self._entries = {}
+        self._layout_entries = {}      # table layout id -> TableEntry
+        self._layout_suggestions = {}  # schema layout id -> SuggestionIndex of its tables
+        self._group_cache = {}
+
+        if SCHEMAS in schema:
+            self._tenants = schema[SCHEMAS]
+            self._schema_layouts = schema[SCHEMA_LAYOUTS]
+            self._table_layouts = schema[TABLE_LAYOUTS]
+        else:
+            self._tenants = self._schema_layouts = self._table_layouts = {}
+
+        # Ordered names are kept for fuzzy suggestions (candidate order breaks score ties)
+        self.table_names = tuple(t for t in schema if t not in SECTIONS)
+        self.tables = frozenset(self.table_names)
+
+    def entry(self, table):
+        """TableEntry for a known table, None otherwise."""
+        entry = self._entries.get(table)
+        if entry is None:
+            if table in self.tables:
+                entry = self._entries[table] = TableEntry(self._schema[table], self._group_cache)
+            elif self._tenants:
+                schema, _, bare = table.rpartition(".")
+                lid = (self.tenant_tables(schema) or {}).get(bare)
+                if lid is not None:
+                    entry = self._layout_entry(lid)
+        return entry
+
+    def _layout_entry(self, lid):
+        entry = self._layout_entries.get(lid)
+        if entry is None:
+            entry = self._layout_entries[lid] = TableEntry(self._table_layouts[lid], self._group_cache)
+        return entry
+
+    def tenant_tables(self, schema):
+        """{table: table layout id} of a deduplicated schema, None for any other schema."""
+        sid = self._tenants.get(schema)
+        return self._schema_layouts[sid] if sid is not None else None
+
+    def resolve(self, table):
+        """
+        Snapshot key for a table name as written in SQL, None if unknown.
+        "public.t" resolves to "t"; "schema.t" resolves to itself, or to "t"
+        when the snapshot has no tables of that schema (single-schema snapshots).
+        """
+        if table in self.tables:
+            return table
+        schema, dot, bare = table.rpartition(".")
+        if not dot:
+            return None
+        tables = self.tenant_tables(schema)
+        if tables is not None:
+            return table if bare in tables else None
+        if (schema == DEFAULT_SCHEMA or schema not in self.schemas) and bare in self.tables:
+            return bare
+        return None
+
+    # ---------------- WHOLE-SCHEMA STRUCTURES ----------------
+    @cached_property
+    def schemas(self):
+        """Schemas with namespaced ("schema.table") entries, deduplicated ones aside."""
+        return frozenset(t.rpartition(".")[0] for t in self.table_names if "." in t)
+
+    @cached_property
+    def all_columns(self):
+        """
+        Every column name, in table order then schema order (with duplicates);
+        the columns of each table layout count once.
+        """
+        cols = []
+        for t in self.table_names:
+            cols.extend(self.entry(t).columns)
+        for lid in self._table_layouts:
+            cols.extend(self._layout_entry(lid).columns)
+        return tuple(cols)
+
+    @cached_property
+    def column_to_tables(self):
+        # Layout tables are left out: their columns exist in every schema of the layout
+        mapping = {}
+        for t in self.table_names:
+            for c in self.entry(t).columns:
+                mapping.setdefault(c, []).append(t)
+        return mapping
+
+    # Built on the first unknown name; src.fuzzy (and difflib) load only then
+    @cached_property
+    def table_suggestions(self):
+        from src.fuzzy import SuggestionIndex
+        return SuggestionIndex(self.table_names)
+
+    @cached_property
+    def column_suggestions(self):
+        from src.fuzzy import SuggestionIndex
+        return SuggestionIndex(self.all_columns)
+
+    def tenant_table_suggestions(self, schema):
+        """Suggestion index over the tables of a deduplicated schema (one per schema layout), else None."""
+        sid = self._tenants.get(schema)
+        if sid is None:
+            return None
+        index = self._layout_suggestions.get(sid)
+        if index is None:
+            from src.fuzzy import SuggestionIndex
+            index = self._layout_suggestions[sid] = SuggestionIndex(tuple(self._schema_layouts[sid]))
+        return index
+
+    # ---------------- LOOKUPS ----------------
+    def has_column(self, tables, column):
+        for t in tables:
+            entry = self.entry(t)
+            if entry is not None and column in entry.column_set:
+                return True
+        return False
+
+    def columns_of(self, tables):
+        """Column names of the given tables, in table order then schema order."""
+        cols = []
+        for t in tables:
+            entry = self.entry(t)
+            if entry is not None:
+                cols.extend(entry.columns)
+        return cols
+
+    def column_type(self, table, column):
+        entry = self.entry(table)
+        return entry.types.get(column) if entry is not None else None
+
+    def origin_tables(self, column):
+        return self.column_to_tables.get(column, [])
+
+    def is_compatible(self, table, column, literal_group):
+        entry = self.entry(table)
+        group = entry.groups.get(column) if entry is not None else None
+        return group is None or group == literal_group
@@ -0,0 +1,168 @@
+# src/server.py
+
+import json
+import sys
+from src.ast_parser import PythonSQLParser
+from src.incremental import IncrementalDocument
+from src.validator import SQLValidator
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Accepted params per method: name -> type (all optional)
+PARAMS = {
+    "validate": {"file": str, "text": str, "range": dict},
+    "close": {"file": str},
+    "reload": {},
+    "shutdown": {},
+}
+
+
+class InvalidParams(Exception):
+    """Request params that do not match the method's signature (INVALID_PARAMS)."""
+
+
+class ValidationServer:
+    """
+    Long-lived validation server speaking newline-delimited JSON-RPC 2.0 over stdio.
+
+    One warm SQLValidator is kept for the lifetime of the process, so editors can
+    send document text on every change without paying interpreter start-up,
+    import and schema-load costs each time.
+
+    Methods:
+      validate  {"file": str, "text": str, "range": {"start": int, "end": int}}
+                                            -> {"errors": [...], "syntaxError": {...} | null}
+      close     {"file": str}               -> {"ok": true}
+      reload    {}                          -> {"ok": true}
+      shutdown  {}                          -> null (server exits)
+
+    Documents sent as text are kept per file; with "range" (the 1-based lines
+    of the new text that replace the edited ones) only the edited statements
+    are re-analyzed (src/incremental.py).
+
+    Params are checked against PARAMS before dispatch: a mismatch is answered
+    with INVALID_PARAMS, anything raised while handling valid params with
+    INTERNAL_ERROR.
+    """
+
+    def __init__(self, schema_path="schema.json", config_path="default_config.yaml"):
+        self.schema_path = schema_path
+        self.config_path = config_path
+        self.validator = SQLValidator(schema_path, config_path)
+        self.documents = {}
+        self.running = True
+
+    # ---------------- METHODS ----------------
+    def validate(self, params):
+        file_path = params.get("file")
+        text = params.get("text")
+
+        if text is None:
+            errors = []
+            for q in PythonSQLParser(file_path).parse_file():
+                errors.extend(self.validator.validate(q["query"], file_path, q["line"]))
+            return {"errors": [e.to_dict() for e in errors]}
+
+        document = self.documents.get(file_path)
+        if document is None:
+            document = self.documents[file_path] = IncrementalDocument(self.validator, file_path)
+
+        changed = params.get("range")
+        if changed is None:
+            errors = document.update(text)
+        else:
+            errors = document.update(text, changed["start"], changed["end"])
+
+        return {"errors": [e.to_dict() for e in errors], "syntaxError": document.syntax_error}
+
+    def close(self, params):
+        self.documents.pop(params.get("file"), None)
+        return {"ok": True}
+
+    def reload(self, params):
+        self.validator = SQLValidator(self.schema_path, self.config_path)
+        self.documents = {}
+        return {"ok": True}
+
+    def shutdown(self, params):
+        self.running = False
+        return None
+
+    # ---------------- DISPATCH ----------------
+    def handle(self, line):
+        """Handle one raw request line; returns the response dict (or None for notifications)."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        handler = {
+            "validate": self.validate,
+            "close": self.close,
+            "reload": self.reload,
+            "shutdown": self.shutdown,
+        }.get(request["method"])
+
+        if handler is None:
+            response = _error(request_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+        else:
+            params = request.get("params") or {}
+            try:
+                _check_params(request["method"], params)
+                response = {"jsonrpc": "2.0", "id": request_id, "result": handler(params)}
+            except InvalidParams as e:
+                response = _error(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                # Params were valid: anything raised is a server bug, not the caller's
+                response = _error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+
+        # Requests without an id are notifications → no response
+        return response if "id" in request else None
+
+    def serve(self, stdin=None, stdout=None):
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+
+        for line in stdin:
+            if not line.strip():
+                continue
+
+            response = self.handle(line)
+            if response is not None:
+                stdout.write(json.dumps(response) + "\n")
+                stdout.flush()
+
+            if not self.running:
+                break
+
+
+def _check_params(method, params):
+    """Raise InvalidParams unless params match PARAMS[method]."""
+    if not isinstance(params, dict):
+        raise InvalidParams(f"{method} expects named params (an object)")
+    for name, expected in PARAMS[method].items():
+        value = params.get(name)
+        if value is not None and not isinstance(value, expected):
+            raise InvalidParams(f"{method}: '{name}' must be {'a string' if expected is str else 'an object'}")
+
+    if method == "validate":
+        if params.get("text") is None and not params.get("file"):
+            raise InvalidParams("validate requires 'text' or 'file'")
+        changed = params.get("range")
+        if changed is not None:
+            bounds = [changed.get("start"), changed.get("end")]
+            if not all(type(b) is int for b in bounds) or bounds[0] < 1 or bounds[1] < bounds[0] - 1:
+                raise InvalidParams("validate: 'range' must be {\"start\": int >= 1, \"end\": int >= start - 1}")
+
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
@@ -0,0 +1,321 @@
+# src/snapshot.py
+#
+# Compiled schema snapshot (schema.pgsg): the same content as schema.json in a
+# compact binary layout that is memory-mapped and decoded lazily, so startup
+# only reads the table directory and a table's columns are decoded the first
+# time a query references it.
+#
+# Layout (little-endian):
+#
+#   header     magic "PSGS", format version, flags,
+#              sha256 + size + mtime_ns of the schema.json it was compiled from,
+#              string count, table count, string index offset, directory offset,
+#              layout count, layout directory offset, layout maps offset + size
+#   records    per distinct column list, its columns as
+#              (name string id, type string id, nullable); tables and layouts
+#              with identical columns share one record
+#   strings    (count + 1) u32 offsets into a UTF-8 blob, then the blob; every
+#              distinct name and type is stored once
+#   directory  per table, (name string id, record offset, column count)
+#   layouts    per table layout of a deduplicated snapshot (src/layouts.py),
+#              (layout id string id, record offset, column count)
+#   maps       the "$schema_layouts" and "$schemas" sections as compact JSON
+#
+# The checksum ties a compiled file to the exact schema.json bytes it came
+# from: load_schema() hashes schema.json on every load (a size mismatch
+# short-cuts it; the mtime is recorded but never trusted) and ignores a stale
+# or unreadable snapshot, falling back to the JSON.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from src.layouts import SECTIONS, TABLE_LAYOUTS
+from src.model import Column, Table, schema_object
+
+MAGIC = b"PSGS"
+FORMAT_VERSION = 2
+SUFFIX = ".pgsg"
+
+HEADER = struct.Struct("<4sHH32sQQIIQQIQQQ")
+COLUMN = struct.Struct("<IIB")
+DIRECTORY_ENTRY = struct.Struct("<IQI")
+OFFSET = struct.Struct("<I")
+
+NULLABLE_CODES = {False: 0, True: 1, None: 2}
+NULLABLE_VALUES = (False, True, None)
+
+
+def snapshot_path(schema_path):
+    """schema.json → schema.pgsg"""
+    return Path(schema_path).with_suffix(SUFFIX)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+
+# ---------------- WRITING ----------------
+class SnapshotWriter:
+    """
+    Streams tables into a compiled snapshot: column records are written as
+    tables arrive, the string table and directory once at close(), so a
+    snapshot can be produced while the schema itself is being extracted.
+    """
+
+    def __init__(self, out_path):
+        self.out_path = Path(out_path)
+        self.tmp_path = self.out_path.with_name(self.out_path.name + ".tmp")
+        self.f = open(self.tmp_path, "wb")
+        self.f.write(b"\0" * HEADER.size)
+        self.string_ids = {}
+        self.records = {}  # encoded column list -> offset
+        self.directory = []
+        self.layouts = []
+        self.maps = {}
+
+    def _string(self, value):
+        sid = self.string_ids.get(value)
+        if sid is None:
+            sid = self.string_ids[value] = len(self.string_ids)
+        return sid
+
+    def _record(self, columns):
+        data = b"".join(
+            COLUMN.pack(self._string(c["name"]), self._string(c["type"]),
+                        NULLABLE_CODES[c.get("nullable")])
+            for c in columns
+        )
+        offset = self.records.get(data)
+        if offset is None:
+            offset = self.records[data] = self.f.tell()
+            self.f.write(data)
+        return offset
+
+    def add_table(self, name, meta):
+        """Add a table, or one of the sections of a deduplicated snapshot."""
+        if name == TABLE_LAYOUTS:
+            for lid, layout in meta.items():
+                columns = layout["columns"]
+                self.layouts.append((self._string(lid), self._record(columns), len(columns)))
+        elif name in SECTIONS:
+            self.maps[name] = meta
+        else:
+            columns = meta["columns"]
+            self.directory.append((self._string(name), self._record(columns), len(columns)))
+
+    def close(self, source_digest, source_size=0, source_mtime_ns=0):
+        """Write the string table, directory and header, then move into place."""
+        f = self.f
+
+        string_index_offset = f.tell()
+        encoded = [s.encode("utf-8") for s in self.string_ids]
+        position = 0
+        offsets = [0]
+        for data in encoded:
+            position += len(data)
+            offsets.append(position)
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+
+        directory_offset = f.tell()
+        f.write(b"".join(DIRECTORY_ENTRY.pack(*entry) for entry in self.directory))
+
+        layout_directory_offset = f.tell()
+        f.write(b"".join(DIRECTORY_ENTRY.pack(*entry) for entry in self.layouts))
+
+        maps_offset = f.tell()
+        maps = json.dumps(self.maps, separators=(",", ":"), ensure_ascii=False).encode("utf-8") if self.maps else b""
+        f.write(maps)
+
+        f.seek(0)
+        f.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0, source_digest, source_size, source_mtime_ns,
+            len(encoded), len(self.directory), string_index_offset, directory_offset,
+            len(self.layouts), layout_directory_offset, maps_offset, len(maps),
+        ))
+        f.close()
+        os.replace(self.tmp_path, self.out_path)
+
+    def abort(self):
+        self.f.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def compile_schema(schema_path="schema.json", out_path=None):
+    """Compile schema.json into a snapshot next to it (or at out_path)."""
+    out_path = out_path or snapshot_path(schema_path)
+    stat = os.stat(schema_path)
+    digest = file_digest(schema_path)
+
+    with open(schema_path, "r") as f:
+        schema = json.load(f)
+
+    writer = SnapshotWriter(out_path)
+    try:
+        for name, meta in schema.items():
+            writer.add_table(name, meta)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close(digest, stat.st_size, stat.st_mtime_ns)
+    return out_path
+
+
+# ---------------- READING ----------------
+class CompiledSchema(Mapping):
+    """
+    Read-only {table: src.model.Table} mapping over a memory-mapped
+    snapshot. Table names are read at open; tables and strings are decoded
+    on first access and kept, once per record, so tables sharing a layout
+    share one Table. A deduplicated snapshot also maps the
+    src/layouts.py section keys, with table layouts decoded on access too.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"{self.path}: not a compiled schema snapshot")
+
+        if len(self._buf) < HEADER.size:
+            raise ValueError(f"{self.path}: not a compiled schema snapshot")
+        magic, version = struct.unpack_from("<4sH", self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: not a compiled schema snapshot (version {version})")
+        (_, _, _flags, self.source_digest, self.source_size, self.source_mtime_ns,
+         n_strings, n_tables, self._string_index, directory,
+         n_layouts, layout_directory, maps_offset, maps_size) = HEADER.unpack_from(self._buf, 0)
+
+        self._strings = [None] * n_strings
+        self._blob = self._string_index + OFFSET.size * (n_strings + 1)
+
+        self._directory = self._read_directory(directory, n_tables)
+        self._tables = {}
+        self._records = {}  # record offset -> decoded Table
+
+        self._sections = {}
+        if maps_size:
+            self._sections = json.loads(bytes(self._buf[maps_offset:maps_offset + maps_size]).decode("utf-8"))
+        if self._sections or n_layouts:
+            self._sections[TABLE_LAYOUTS] = _TableLayouts(self, self._read_directory(layout_directory, n_layouts))
+
+    def _read_directory(self, offset, count):
+        entries = {}
+        for i in range(count):
+            name_id, record, n_columns = DIRECTORY_ENTRY.unpack_from(
+                self._buf, offset + i * DIRECTORY_ENTRY.size)
+            entries[self._string(name_id)] = (record, n_columns)
+        return entries
+
+    def _string(self, sid):
+        value = self._strings[sid]
+        if value is None:
+            start, end = struct.unpack_from("<II", self._buf, self._string_index + OFFSET.size * sid)
+            value = self._strings[sid] = sys.intern(
+                bytes(self._buf[self._blob + start:self._blob + end]).decode("utf-8"))
+        return value
+
+    def _table(self, offset, n_columns):
+        table = self._records.get(offset)
+        if table is None:
+            table = self._records[offset] = Table(
+                Column(self._string(name_id), self._string(type_id), NULLABLE_VALUES[nullable])
+                for name_id, type_id, nullable in COLUMN.iter_unpack(
+                    self._buf[offset:offset + n_columns * COLUMN.size])
+            )
+        return table
+
+    def __getitem__(self, table):
+        meta = self._tables.get(table)
+        if meta is None:
+            if table in self._sections:
+                return self._sections[table]
+            meta = self._tables[table] = self._table(*self._directory[table])
+        return meta
+
+    def __contains__(self, table):
+        return table in self._directory or table in self._sections
+
+    def __iter__(self):
+        yield from self._directory
+        yield from (key for key in SECTIONS if key in self._sections)
+
+    def __len__(self):
+        return len(self._directory) + len(self._sections)
+
+    def decoded_tables(self):
+        return len(self._tables)
+
+    def is_current(self, schema_path):
+        """True if this snapshot was compiled from schema_path's current bytes."""
+        try:
+            stat = os.stat(schema_path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size != self.source_size:
+            return False
+        # Always hashed: a same-size rewrite can keep the mtime (coarse
+        # timestamps, touch -r, restored checkouts)
+        return file_digest(schema_path) == self.source_digest
+
+    def close(self):
+        self._buf.close()
+
+
+class _TableLayouts(Mapping):
+    """The "$table_layouts" section of a compiled snapshot, decoded per layout on access."""
+
+    def __init__(self, compiled, directory):
+        self._compiled = compiled
+        self._directory = directory
+        self._layouts = {}
+
+    def __getitem__(self, lid):
+        meta = self._layouts.get(lid)
+        if meta is None:
+            meta = self._layouts[lid] = self._compiled._table(*self._directory[lid])
+        return meta
+
+    def __contains__(self, lid):
+        return lid in self._directory
+
+    def __iter__(self):
+        return iter(self._directory)
+
+    def __len__(self):
+        return len(self._directory)
+
+
+def load_schema(schema_path="schema.json"):
+    """
+    Schema mapping ({table: src.model.Table}) for the validator: a .pgsg path
+    is opened directly; for schema.json, a sibling compiled snapshot is used
+    when it is current, otherwise the JSON is loaded.
+    """
+    if Path(schema_path).suffix == SUFFIX:
+        return CompiledSchema(schema_path)
+
+    compiled = snapshot_path(schema_path)
+    if compiled.exists():
+        try:
+            snapshot = CompiledSchema(compiled)
+        except (OSError, ValueError, struct.error):
+            snapshot = None
+        if snapshot is not None:
+            if snapshot.is_current(schema_path):
+                return snapshot
+            snapshot.close()
+
+    with open(schema_path, "r") as f:
+        return json.load(f, object_pairs_hook=schema_object)
@@ -3,24 +3,37 @@
 import sqlparse
 from sqlparse.sql import IdentifierList, Identifier
 from sqlparse.tokens import Keyword, DML, DDL, Name
+from src.fast_analyzer import analyze_fast
+
+ENGINES = ("sqlparse", "fast")
 
 
 class SQLAnalyzer:
-    def __init__(self, query: str):
+    def __init__(self, query: str, engine: str = "sqlparse"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown analyzer engine '{engine}' (expected one of {ENGINES})")
         self.query = query
+        self.engine = engine
+
+    @staticmethod
+    def _table_name(identifier):
+        """Table name as written: "schema.table" when qualified."""
+        name = identifier.get_real_name()
+        schema = identifier.get_parent_name()
+        return f"{schema}.{name}" if name and schema else name
 
-    def _extract_identifiers(self, token):
+    def _extract_identifiers(self, token, qualified=False):
 
         names = []
 
         if isinstance(token, Identifier):
-            name = token.get_real_name()
+            name = self._table_name(token) if qualified else token.get_real_name()
             if name:
                 names.append(name)
 
         elif isinstance(token, IdentifierList):
             for identifier in token.get_identifiers():
-                names.extend(self._extract_identifiers(identifier))
+                names.extend(self._extract_identifiers(identifier, qualified))
 
         elif token.ttype is Keyword:
             value = token.value
@@ -40,6 +53,12 @@ class SQLAnalyzer:
         return None
 
     def analyze(self):
+        # Fast path for common statement shapes; None → fall back to sqlparse
+        if self.engine == "fast":
+            result = analyze_fast(self.query)
+            if result is not None:
+                return result
+
         parsed = sqlparse.parse(self.query)
         if not parsed:
             return {"tables": [], "columns": []}
@@ -70,15 +89,19 @@ class SQLAnalyzer:
         tables = []
         columns = []
         from_seen = False
+        table_ref = False  # next token is the FROM / JOIN target
 
         for token in stmt.tokens:
         # Switch context at FROM / JOIN
             if token.ttype is Keyword and token.value.upper() in ("FROM", "JOIN"):
                 from_seen = True
+                table_ref = True
                 continue
 
-        # Always recurse
-            names = self._extract_identifiers(token)
+        # Always recurse (table references keep their schema)
+            names = self._extract_identifiers(token, qualified=table_ref)
+            if not token.is_whitespace:
+                table_ref = False
 
             if not names:
                 continue
@@ -89,8 +112,8 @@ class SQLAnalyzer:
                 columns.extend(names)
 
         return {
-            "tables": list(set(tables)),
-            "columns": list(set(columns)),
+            "tables": list(dict.fromkeys(tables)),
+            "columns": list(dict.fromkeys(columns)),
         }
 
 
@@ -103,7 +126,7 @@ class SQLAnalyzer:
         for token in stmt.tokens:
             # Table after UPDATE
             if isinstance(token, Identifier) and not tables:
-                tables.append(token.get_real_name())
+                tables.append(self._table_name(token))
 
             # SET keyword
             if token.ttype is Keyword and token.value.upper() == "SET":
@@ -119,8 +142,8 @@ class SQLAnalyzer:
                 break
 
         return {
-            "tables": list(set(tables)),
-            "columns": list(set(columns)),
+            "tables": list(dict.fromkeys(tables)),
+            "columns": list(dict.fromkeys(columns)),
         }
 
     # ---------------- INSERT ----------------
@@ -144,8 +167,8 @@ class SQLAnalyzer:
                             columns.append(col)
 
         return {
-            "tables": list(set(tables)),
-            "columns": list(set(columns)),
+            "tables": list(dict.fromkeys(tables)),
+            "columns": list(dict.fromkeys(columns)),
         }
 
 
@@ -161,11 +184,11 @@ class SQLAnalyzer:
                 continue
 
             if from_seen and isinstance(token, Identifier):
-                tables.append(token.get_real_name())
+                tables.append(self._table_name(token))
                 break
 
         return {
-            "tables": list(set(tables)),
+            "tables": list(dict.fromkeys(tables)),
             "columns": [],
         }
 
@@ -175,13 +198,13 @@ class SQLAnalyzer:
 
         for token in stmt.tokens:
             if isinstance(token, Identifier):
-                name = token.get_real_name()
+                name = self._table_name(token)
                 if name:
                     tables.append(name)
                 break   # first identifier is the table
 
         return {
-            "tables": list(set(tables)),
+            "tables": list(dict.fromkeys(tables)),
             "columns": [],
         }
 
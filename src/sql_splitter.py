@@ -0,0 +1,199 @@
+# src/sql_splitter.py
+#
+# Streaming SQL statement splitter for .sql files (migrations, pg_dump
+# output) and multi-statement strings.
+#
+# Input is consumed in blocks of whole lines, so memory is bounded by the
+# longest statement, never by the file: a multi-MB dump is never held in
+# memory. Each block is scanned with a handful of regex searches per
+# statement rather than a Python loop per line.
+# Semicolons inside quoted strings, quoted identifiers, dollar-quoted bodies
+# ($$ ... $$, $fn$ ... $fn$) and comments do not end a statement. Comments
+# and psql meta-commands (\connect, ...) between statements are dropped, and
+# the data block following COPY ... FROM stdin is skipped. Each statement is
+# reported with the line of its first token.
+
+import re
+from itertools import islice
+
+# Statements longer than this are not buffered (and not validated)
+MAX_STATEMENT_CHARS = 1 << 20
+
+# Lines are scanned in blocks of about this size (whole lines only)
+BLOCK_CHARS = 1 << 14
+BLOCK_LINES = 1024
+
+# Next character that may change the lexical state in plain SQL
+_SPECIAL = re.compile(r"""'|"|--|/\*|\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$|;""")
+_BLOCK_COMMENT = re.compile(r"/\*|\*/")
+_WORD_CHAR = re.compile(r"[A-Za-z0-9_$]")
+_GAP = re.compile(r"(?:\s+|--[^\n]*|\\[^\n]*|;)*")  # blanks, comments, meta-commands
+_COPY_FROM_STDIN = re.compile(r"COPY\b.*\bFROM\s+STDIN\b", re.IGNORECASE | re.DOTALL)
+_COPY_END = re.compile(r"^\\\.\r*$\n?", re.MULTILINE)
+
+
+def iter_statements(lines, max_chars=MAX_STATEMENT_CHARS):
+    """
+    Yield (line, text) for every statement in an iterable of lines (a text
+    file object, or str.splitlines(True)). line is 1-based; text is stripped,
+    without the terminating semicolon. text is None for a statement longer
+    than max_chars, which is skipped rather than buffered.
+    """
+    parts = []          # pieces of the current statement
+    size = 0
+    start = None        # line of its first token
+    state = None        # None, "'", '"', "/*" or a dollar-quote tag
+    depth = 0           # block comment nesting
+    copy_data = False   # inside the data of COPY ... FROM stdin
+    line = 1            # line number at block[counted]
+
+    for block in _blocks(lines):
+        pos = counted = 0
+        end = len(block)
+        while pos < end:
+            if copy_data:
+                match = _COPY_END.search(block, pos)
+                if match is None:
+                    break
+                copy_data = False
+                pos = match.end()
+                continue
+
+            if state is None:
+                if start is None:
+                    # Between statements: skip blanks, comments and psql meta-commands
+                    pos = _GAP.match(block, pos).end()
+                    if pos >= end:
+                        break
+                    if block.startswith("/*", pos):
+                        state, depth = "/*", 1
+                        pos += 2
+                        continue
+                    line += block.count("\n", counted, pos)
+                    start, segment_start, counted = line, pos, pos
+                else:
+                    segment_start = pos
+
+                match = _SPECIAL.search(block, pos)
+                if match is None:
+                    pos = end
+                elif match.group() == ";":
+                    size = _append(parts, size, block[segment_start:match.start()], max_chars)
+                    statement = _finish(parts, size, max_chars)
+                    if statement is not None or size > max_chars:
+                        yield start, statement
+                        copy_data = statement is not None and _COPY_FROM_STDIN.match(statement) is not None
+                    parts, size, start = [], 0, None
+                    pos = _line_end(block, pos) if copy_data else match.end()
+                    continue
+                else:
+                    token = match.group()
+                    pos = match.end()
+                    if token == "--":
+                        pos = _line_end(block, pos)
+                    elif token == "/*":
+                        state, depth = "/*", 1
+                    elif token.startswith("$"):
+                        if match.start() > 0 and _WORD_CHAR.match(block, match.start() - 1):
+                            pos = match.start() + 1  # part of an identifier (a$b$)
+                        else:
+                            state = token
+                    else:
+                        state = token
+                size = _append(parts, size, block[segment_start:pos], max_chars)
+                continue
+
+            # Inside a string, quoted identifier, dollar quote or block comment
+            if state == "/*":
+                match = _BLOCK_COMMENT.search(block, pos)
+                if match is None:
+                    new_pos = end
+                else:
+                    new_pos = match.end()
+                    depth += 1 if match.group() == "/*" else -1
+                    if depth == 0:
+                        state = None
+            else:
+                found = block.find(state, pos)
+                new_pos = end if found < 0 else found + len(state)
+                if found >= 0:
+                    state = None
+            if start is not None:
+                size = _append(parts, size, block[pos:new_pos], max_chars)
+            pos = new_pos
+
+        line += block.count("\n", counted)
+
+    if start is not None:
+        statement = _finish(parts, size, max_chars)
+        if statement is not None or size > max_chars:
+            yield start, statement
+
+
+def _blocks(lines, size=BLOCK_CHARS):
+    """Whole lines, joined into blocks of about size characters."""
+    read = getattr(lines, "read", None)
+    if read is not None:
+        while True:
+            block = read(size)
+            if not block:
+                return
+            if not block.endswith("\n"):
+                block += lines.readline()
+            yield block
+    else:
+        lines = iter(lines)
+        while True:
+            block = "".join(islice(lines, BLOCK_LINES))
+            if not block:
+                return
+            yield block
+
+
+def _line_end(block, pos):
+    """Position just past the end of the line containing pos."""
+    found = block.find("\n", pos)
+    return len(block) if found < 0 else found + 1
+
+
+def _append(parts, size, text, max_chars):
+    size += len(text)
+    if size <= max_chars:
+        parts.append(text)
+    elif parts:
+        parts.clear()  # too long: stop buffering, keep counting
+    return size
+
+
+def _finish(parts, size, max_chars):
+    if size > max_chars:
+        return None
+    return "".join(parts).strip() or None
+
+
+def split_statements(text):
+    """(line offset, statement) for each statement of a string; offsets are 0-based."""
+    return [(line - 1, statement) for line, statement in iter_statements(text.splitlines(True))
+            if statement is not None]
+
+
+class SQLFileParser:
+    """Streams the statements of a .sql file, in the same shape as PythonSQLParser."""
+
+    def __init__(self, file_path, max_chars=MAX_STATEMENT_CHARS):
+        self.file_path = file_path
+        self.max_chars = max_chars
+        self.skipped = []   # lines of statements too long to check
+
+    def iter_queries(self):
+        """Yield {"query", "line", "file"} per statement, reading the file lazily."""
+        try:
+            f = open(self.file_path, "r", encoding="utf-8", errors="replace", newline="")
+        except FileNotFoundError:
+            return
+        with f:
+            for line, statement in iter_statements(f, self.max_chars):
+                if statement is None:
+                    self.skipped.append(line)
+                    continue
+                yield {"query": statement, "line": line, "file": self.file_path}
@@ -3,7 +3,12 @@ import * as assert from 'assert';
 // You can import and use all API from the 'vscode' module
 // as well as import your extension to test it
 import * as vscode from 'vscode';
-// import * as myExtension from '../../extension';
+import { mergeRange } from '../extension';
+
+function edit(startLine: number, endLine: number, text: string): vscode.TextDocumentContentChangeEvent {
+	const range = new vscode.Range(startLine, 0, endLine, 0);
+	return { range, rangeOffset: 0, rangeLength: 0, text };
+}
 
 suite('Extension Test Suite', () => {
 	vscode.window.showInformationMessage('Start all tests.');
@@ -12,4 +17,17 @@ suite('Extension Test Suite', () => {
 		assert.strictEqual(-1, [1, 2, 3].indexOf(5));
 		assert.strictEqual(-1, [1, 2, 3].indexOf(0));
 	});
+
+	test('Coalesced edits cover every changed line', () => {
+		let range = mergeRange(undefined, edit(10, 10, 'x'));
+		assert.deepStrictEqual(range, { start: 10, end: 10 });
+
+		// Two lines inserted above: the pending edit moves down
+		range = mergeRange(range, edit(2, 2, 'a\nb\n'));
+		assert.deepStrictEqual(range, { start: 2, end: 12 });
+
+		// Lines 11-12 joined below it
+		range = mergeRange(range, edit(11, 12, 'y'));
+		assert.deepStrictEqual(range, { start: 2, end: 11 });
+	});
 });
@@ -1,91 +1,113 @@
 # src/validator.py
 
-import json
 import yaml
-from src.sql_analyzer import SQLAnalyzer
-from src.fuzzy import suggest
-import re
-
-SIMPLE_COMPARISON = re.compile(
-    r"(\w+)\s*(=|<|>)\s*('[^']*'|\d+|true|false)",
-    re.IGNORECASE,
-)
-
-INSERT_VALUES = re.compile(
-    r"insert\s+into\s+\w+\s*\(([^)]+)\)\s*values\s*\(([^)]+)\)",
-    re.IGNORECASE,
-)
-
-SQL_TYPE_GROUPS = {
-    "numeric": {"integer", "bigint", "smallint", "decimal", "numeric", "real", "double"},
-    "string": {"varchar", "text", "char"},
-    "boolean": {"boolean"},
+from src.fingerprint import QueryMemo, fingerprint
+from src.model import Diagnostic
+from src.rules import DEFAULT_RULES, QueryContext, infer_literal_type
+from src.schema_index import SQL_TYPE_GROUPS, SchemaIndex, type_group
+from src.snapshot import load_schema
+from src.sql_splitter import split_statements
+
+# Methods timed when a profiler is attached: method → stage
+PROFILED_STAGES = {
+    "validate": "validate",
+    "analyze": "analyze",
+    "check_tables": "check_tables",
+    "check_columns": "check_columns",
+    "suggest_table": "fuzzy.suggest",
+    "suggest_column": "fuzzy.suggest",
 }
 
 
-
 class SQLValidator:
 
-    @staticmethod
-    def infer_literal_type(value: str):
-        value = value.strip()
-
-        if value.startswith("'") and   value.endswith("'"):
-            return "string"
-
-        if value.isdigit():
-            return "numeric"
-
-        if value.lower() in ("true", "false"):
-            return "boolean"
-
-        return None  # Unknown → skip validation
+    infer_literal_type = staticmethod(infer_literal_type)
 
     @staticmethod
     def is_compatible(column_type: str, literal_group: str):
-        column_type = column_type.lower()
-
-        # Normalize common PostgreSQL types
-        if column_type.startswith("character"):
-            column_type = "varchar"
-        elif column_type.startswith("varchar"):
-            column_type = "varchar"
-        elif column_type.startswith("int"):
-            column_type = "integer"
-        elif column_type.startswith("bool"):
-            column_type = "boolean"
-        elif column_type.startswith("double"):
-            column_type = "double"
-
-        for group, types in SQL_TYPE_GROUPS.items():
-            if column_type in types:
-                return group == literal_group
-
-        return True  # Unknown DB type → do not warn
+        group = type_group(column_type)
+        return group is None or group == literal_group  # Unknown DB type → do not warn
 
     def __init__(self, schema_path="schema.json", config_path="default_config.yaml"):
-        with open(schema_path, "r") as f:
-            self.schema = json.load(f)
+        # schema.json, or its compiled snapshot when current (decoded per table on demand)
+        self.schema = load_schema(schema_path)
 
         with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)["fuzzy"]
+            config = yaml.safe_load(f)
+        self.config = config["fuzzy"]
+
+        self.index = SchemaIndex(self.schema)
+
+        # "sqlparse" or "fast" (pure-Python fast path, falls back to sqlparse)
+        self.analyzer_engine = (config.get("analyzer") or {}).get("engine", "sqlparse")
+
+        # Repeated queries (same fingerprint) reuse their validation result
+        memo_config = config.get("query_memo") or {}
+        self.memo = QueryMemo(memo_config.get("max_entries", 4096))
+
+        # Validation rules, run in order on every statement (see src/rules.py)
+        disabled = set((config.get("rules") or {}).get("disabled") or ())
+        self.rules = [rule() for rule in DEFAULT_RULES if rule.name not in disabled]
+
+        self.profiler = None
+
+    def add_rule(self, rule):
+        """Register an extra rule (see src/rules.py); it runs after the existing ones."""
+        self.rules.append(rule)
+        self.memo.clear()
+        if self.profiler is not None:
+            self.profiler.instrument(rule, "check", f"rule.{rule.name}")
+
+    # ---------------- PROFILING ----------------
+    def set_profiler(self, profiler):
+        """
+        Attach a src.profiler.Profiler (or None to detach). Attaching wraps the
+        stage methods on this instance; without a profiler they run unwrapped.
+        """
+        for method in PROFILED_STAGES:
+            self.__dict__.pop(method, None)
+        for rule in self.rules:
+            rule.__dict__.pop("check", None)
+        self.profiler = profiler
+        if profiler is None:
+            return
+
+        def note_query(args, kwargs, seconds):
+            query, file, line = (list(args) + [kwargs.get("file"), kwargs.get("line")])[:3]
+            profiler.note_query(query, file, line, seconds)
+
+        for method, stage in PROFILED_STAGES.items():
+            profiler.instrument(self, method, stage, on_call=note_query if method == "validate" else None)
+        for rule in self.rules:
+            profiler.instrument(rule, "check", f"rule.{rule.name}")
+
+    # ---------------- FUZZY SUGGESTIONS ----------------
+    def suggest_table(self, table):
+        """Closest tables; for a deduplicated schema, closest tables of that schema."""
+        schema, dot, bare = table.rpartition(".")
+        tenant_index = self.index.tenant_table_suggestions(schema) if dot else None
+        if tenant_index is not None:
+            return [f"{schema}.{t}" for t in tenant_index.suggest(bare)]
+        return self.index.table_suggestions.suggest(table)
+
+    def suggest_column(self, column, table_columns):
+        """Closest columns of the referenced tables, else of the whole schema."""
+        from src.fuzzy import suggest
+
+        return suggest(column, table_columns) or self.index.column_suggestions.suggest(column)
 
     # ---------------- TABLE VALIDATION ----------------
     def check_tables(self, tables):
         errors = []
-        known_tables = list(self.schema.keys())
 
         for table in tables:
-            if table not in     known_tables:
-                suggestion = suggest(table, known_tables)
-                errors.append({
-                "message": f"Table '{table}' not found",
-                "suggestion": suggestion[0] if suggestion else None,
-                "offending": table,
-                "line": None,
-                "start_col": None,
-                "end_col": None,
-            })
+            if self.index.resolve(table) is None:
+                suggestion = self.suggest_table(table)
+                errors.append(Diagnostic(
+                    f"Table '{table}' not found",
+                    offending=table,
+                    suggestion=suggestion[0] if suggestion else None,
+                ))
         return errors
 
 
@@ -93,25 +115,11 @@ class SQLValidator:
     def check_columns(self, tables, columns):
         errors = []
 
-        # Map column -> list of tables it exists in
-        column_to_tables = {}
-        for table, meta in self.schema.items():
-            for c in meta["columns"]:
-                column_to_tables.setdefault(c["name"], []).append(table)
-
-        # ONLY columns from referenced tables
-        table_cols = []
-        for t in tables:
-            if t in self.schema:
-                table_cols.extend([c["name"] for c in self.schema[t]["columns"]])
-
-        all_cols = []
-        for t in self.schema:
-            all_cols.extend([c["name"] for c in self.schema[t]["columns"]])
-
         for col in columns:
-            if col not in table_cols:
-                raw_suggestion = suggest(col, table_cols) or suggest(col, all_cols)
+            # ONLY columns from referenced tables
+            if not self.index.has_column(tables, col):
+                table_cols = self.index.columns_of(tables)
+                raw_suggestion = self.suggest_column(col, table_cols)
 
                 suggestion = None
                 if raw_suggestion:
@@ -134,22 +142,17 @@ class SQLValidator:
 
 
 
-                origin_tables = column_to_tables.get(col, [])
+                origin_tables = self.index.origin_tables(col)
                 origin_hint = None
                 if len(origin_tables) == 1 and origin_tables[0] not in tables:
                     origin_hint = origin_tables[0]
 
-                errors.append({
-                    "message": (
-                        f"Column '{col}' not found"
-                        + (f" (exists in table '{origin_hint}')" if origin_hint else "")
-                    ),
-                    "suggestion": suggestion,
-                    "offending": col,
-                    "line": None,
-                    "start_col": None,
-                    "end_col": None,
-                })
+                errors.append(Diagnostic(
+                    f"Column '{col}' not found"
+                    + (f" (exists in table '{origin_hint}')" if origin_hint else ""),
+                    offending=col,
+                    suggestion=suggestion,
+                ))
 
         return errors
 
@@ -157,102 +160,41 @@ class SQLValidator:
 
     # ---------------- MAIN ENTRY ----------------
     def validate(self, query, file=None, line=None):
-        analyzer = SQLAnalyzer(query)
-        parts = analyzer.analyze()
-
-        tables = parts.get("tables", [])
-        columns = parts.get("columns", [])
+        key = fingerprint(query)
+        issues = self.memo.get(key)
+        if issues is None:
+            issues = self._collect_issues(query)
+            self.memo.put(key, issues)
+
+        # Memoized issues fanned out to this call site (src/model.py Diagnostics)
+        return [e.at(file, line) for e in issues]
+
+    def _collect_issues(self, query):
+        # Multi-statement strings: every statement is checked. Issues of later
+        # statements carry their line distance from the first one.
+        if ";" in query.rstrip().rstrip(";"):
+            statements = split_statements(query)
+            if len(statements) > 1:
+                first = statements[0][0]
+                issues = []
+                for offset, statement in statements:
+                    for issue in self._collect_statement_issues(statement):
+                        issues.append(issue.shifted(offset - first) if offset != first else issue)
+                return tuple(issues)
+
+        return self._collect_statement_issues(query)
+
+    def _collect_statement_issues(self, query):
+        # One analysis, shared by every rule
+        context = QueryContext(self, query)
 
         issues = []
+        for rule in self.rules:
+            for issue in rule.check(context):
+                issues.append(issue if isinstance(issue, Diagnostic) else Diagnostic.from_dict(issue))
+        return tuple(issues)
 
-    # 1️⃣ Validate tables first
-        table_errors = self.check_tables(tables)
-        issues.extend(table_errors)
-
-    # 2️⃣ Only validate columns if at least ONE valid table exists
-        valid_tables = [t for t in tables if t in self.schema]
-
-        if valid_tables:
-            column_errors = self.check_columns(valid_tables, columns)
-            issues.extend(column_errors)
-
-                # 2.5️⃣ Datatype-aware validation (warnings only)
-            for match in SIMPLE_COMPARISON.finditer(query):
-                column, operator, literal = match.groups()
-
-            # Only validate if column exists in schema
-                for table in valid_tables:
-                    for col in self.schema[table]["columns"]:
-                        if col["name"] == column:
-                            column_type = col["type"]
-                            literal_type = SQLValidator.infer_literal_type(literal)
-
-                            if not literal_type:
-                                continue  # Too complex → skip
-
-                            if not SQLValidator.is_compatible(column_type, literal_type):
-                                issues.append({
-                                "message": (
-                                    f"Possible type mismatch: column '{column}' "
-                                    f"expects {column_type}, but literal looks like {literal_type}"
-                                ),
-                                "offending": column,
-                                "severity": "warning",
-                                "line": None,
-                                "start_col": None,
-                                "end_col": None,
-                            })
-                    # 2.6️⃣ INSERT datatype-aware validation
-            insert_match = INSERT_VALUES.search(query)
-            if insert_match and valid_tables:
-                col_list = [c.strip() for c in insert_match.group(1).split(",")]
-                val_list = [v.strip() for v in insert_match.group(2).split(",")]
-
-                if len(col_list) == len(val_list):
-                    table = valid_tables[0]
-
-                    schema_cols = {
-                        c["name"]: c["type"]
-                        for c in self.schema[table]["columns"]
-                    }
-
-                    for col, val in zip(col_list, val_list):
-                        if col not in schema_cols:
-                            continue
-
-                        literal_type = SQLValidator.infer_literal_type(val)
-                        if not literal_type:
-                            continue
-
-                        column_type = schema_cols[col]
-
-                        if not SQLValidator.is_compatible(column_type, literal_type):
-                            issues.append({
-                            "message": (
-                                f"Possible type mismatch: column '{col}' "
-                                f"expects {column_type}, but literal looks like {literal_type}"
-                            ),
-                            "offending": col,
-                            "severity": "warning",
-                            "line": None,
-                            "start_col": None,
-                            "end_col": None,
-                        })
-
-    # 3️⃣ Final structured output
-        output = []
-        for e in issues:
-            output.append({
-                "file": file,
-                "line": line,
-                "offending": e.get("offending"),
-                "start_col": e.get("start_col"),
-                "end_col": e.get("end_col"),
-                "message": e["message"],
-                "suggestion": e.get("suggestion"),
-                "severity": e.get("severity","error"),
-            })
-
-        return output
-
+    def analyze(self, query):
+        from src.sql_analyzer import SQLAnalyzer  # imports sqlparse
 
+        return SQLAnalyzer(query, self.analyzer_engine).analyze()
@@ -0,0 +1,322 @@
+# src/watcher.py
+#
+# `check --watch`: a terminal watcher keeping one warm validator.
+#
+# The target is checked once, then file changes are picked up from inotify
+# (through ctypes, Linux) or, where that is unavailable, by polling mtimes.
+# Bursts of saves are debounced into one batch; only the files in the batch
+# are re-checked and only diagnostics that appeared or disappeared are
+# printed. A change to the schema or config file reloads the validator and
+# re-checks everything.
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from src.runner import SOURCE_SUFFIXES, FileChecker, iter_files
+
+# Batch changes until no new event arrived for DEBOUNCE seconds (at most MAX_DELAY)
+DEBOUNCE = 0.2
+MAX_DELAY = 2.0
+POLL_INTERVAL = 0.5
+
+# Returned by a change source when it lost track (e.g. inotify queue overflow)
+RESCAN = "*"
+
+
+# ---------------- CHANGE SOURCES ----------------
+class PollingSource:
+    """Detects changes by comparing (mtime, size) of every watched file."""
+
+    def __init__(self, target, extra_files=(), interval=POLL_INTERVAL):
+        self.target = target
+        self.extra_files = list(extra_files)
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for path in [*iter_files(self.target), *self.extra_files]:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout):
+        """Paths that changed, appeared or disappeared; empty after timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {p for p in state.keys() | self.state.keys() if state.get(p) != self.state.get(p)}
+            self.state = state
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """
+    inotify watches on every directory under target (added as directories
+    appear) and on the directories holding the extra files.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ name)
+
+    def __init__(self, target, extra_files=()):
+        name = ctypes.util.find_library("c")
+        if name is None:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.dirs = {}      # wd -> directory prefix as it appears in iter_files paths (None: not a source dir)
+        self.abs_dirs = {}  # wd -> absolute directory, to match the extra files
+        self.extra = {}     # (directory, basename) -> extra file path as given
+        try:
+            if target.is_dir():
+                root = str(target)
+                self._watch_tree(root, "" if root == "." else root.rstrip(os.sep) + os.sep)
+            else:
+                self.extra[(os.path.abspath(os.path.dirname(str(target)) or "."), target.name)] = str(target)
+            for path in extra_files:
+                self.extra[(os.path.abspath(os.path.dirname(path) or "."), os.path.basename(path))] = path
+            for directory in {d for d, _ in self.extra}:
+                self._add_watch(directory, None)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, directory, prefix):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return  # vanished meanwhile
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        if prefix is not None:
+            self.dirs[wd] = prefix
+        else:
+            self.dirs.setdefault(wd, None)
+        self.abs_dirs[wd] = os.path.abspath(directory)
+
+    def _watch_tree(self, directory, prefix):
+        self._add_watch(directory, prefix)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._watch_tree(entry.path, prefix + entry.name + os.sep)
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0"))
+            offset += self.EVENT.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                self.abs_dirs.pop(wd, None)
+                continue
+
+            extra = self.extra.get((self.abs_dirs.get(wd), name))
+            if extra is not None:
+                changed.add(extra)
+            prefix = self.dirs.get(wd)
+            if prefix is None:
+                continue
+
+            path = prefix + name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._watch_tree(path, path + os.sep)
+                changed.add(path + os.sep)  # everything under it
+            elif name.endswith(SOURCE_SUFFIXES):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if getattr(self, "fd", -1) >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def change_source(target, extra_files=(), polling=False):
+    """inotify where available, mtime polling otherwise (or when asked)."""
+    if not polling:
+        try:
+            return InotifySource(target, extra_files)
+        except (OSError, AttributeError):
+            pass
+    return PollingSource(target, extra_files)
+
+
+# ---------------- WATCHER ----------------
+def _key(e):
+    """Diagnostics are compared without their line, so code moving up or down is not a change."""
+    return (e.file, e.message, e.offending, e.suggestion, e.severity)
+
+
+def format_diagnostic(e):
+    return f"{e.file}:{e.line} → {e.message} (suggest: {e.suggestion})"
+
+
+class Watcher:
+    """
+        watcher = Watcher(Path("src"))
+        watcher.start()          # full check, prints every diagnostic
+        watcher.run()            # until Ctrl+C: re-check changed files, print the difference
+    """
+
+    def __init__(self, target, schema_path="schema.json", config_path="default_config.yaml",
+                 polling=False, debounce=DEBOUNCE, echo=None):
+        self.target = Path(target)
+        self.schema_path = schema_path
+        self.config_path = config_path
+        self.debounce = debounce
+        self.echo = echo or (lambda line: print(line, flush=True))
+        self.checker = FileChecker(schema_path, config_path)
+        self.results = {}  # file -> diagnostics
+        self.source = change_source(self.target, [schema_path, config_path], polling)
+
+    @property
+    def backend(self):
+        return "inotify" if isinstance(self.source, InotifySource) else "polling"
+
+    def start(self):
+        self._recheck(list(iter_files(self.target)))
+        for errors in self.results.values():
+            for e in errors:
+                self.echo(format_diagnostic(e))
+        total = sum(len(errors) for errors in self.results.values())
+        self.echo(f"👀 Watching {self.target} ({self.backend}): {len(self.results)} files, {total} issues")
+
+    def run(self):
+        try:
+            while True:
+                self.poll(timeout=3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.source.close()
+
+    def poll(self, timeout):
+        """Wait up to timeout for a batch of changes and process it; False if none came."""
+        changed = self.source.wait(timeout)
+        if not changed:
+            return False
+
+        deadline = time.monotonic() + MAX_DELAY
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = self.source.wait(min(self.debounce, remaining))
+            if not more:
+                break
+            changed |= more
+
+        self._process(changed)
+        return True
+
+    def _process(self, changed):
+        if self.schema_path in changed or self.config_path in changed:
+            try:
+                checker = FileChecker(self.schema_path, self.config_path)
+                checker.validator  # load now, so a half-written file is reported here
+            except Exception as e:
+                self.echo(f"❌ Could not reload schema/config, keeping the previous one: {e}")
+                changed -= {self.schema_path, self.config_path}
+            else:
+                self.checker = checker
+                self.echo("🔄 Reloaded schema/config")
+                changed = {RESCAN}
+
+        if RESCAN in changed:
+            files = set(iter_files(self.target)) | set(self.results)
+        else:
+            files = set()
+            for path in changed:
+                if path.endswith(os.sep):  # a directory appeared or went away
+                    files.update(f for f in self.results if f.startswith(path))
+                    if os.path.isdir(path):
+                        files.update(iter_files(Path(path)))
+                elif path.endswith(SOURCE_SUFFIXES):
+                    files.add(path)
+
+        before = {f: self.results.get(f, []) for f in files}
+        self._recheck(sorted(files))
+
+        added, removed = [], []
+        for f in sorted(files):
+            old, new = before[f], self.results.get(f, [])
+            old_keys = [_key(e) for e in old]
+            new_keys = [_key(e) for e in new]
+            added.extend(e for e in new if not _consume(old_keys, _key(e)))
+            removed.extend(e for e in old if not _consume(new_keys, _key(e)))
+
+        for e in removed:
+            self.echo(f"- {format_diagnostic(e)}")
+        for e in added:
+            self.echo(f"+ {format_diagnostic(e)}")
+
+        total = sum(len(errors) for errors in self.results.values())
+        stamp = datetime.now().strftime("%H:%M:%S")
+        self.echo(f"[{stamp}] {len(files)} file(s) re-checked: {len(added)} new, {len(removed)} fixed, {total} total")
+
+    def _recheck(self, files):
+        for f in files:
+            if os.path.isfile(f):
+                errors, _ = self.checker.check(f)
+                self.results[f] = errors
+            else:
+                self.results.pop(f, None)
+
+
+def _consume(keys, key):
+    """Remove one occurrence of key from keys; False if there was none."""
+    try:
+        keys.remove(key)
+    except ValueError:
+        return False
+    return True
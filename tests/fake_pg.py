@@ -0,0 +1,102 @@
+# Minimal fake DB-API connection emulating the catalog queries SchemaExtractor
+# runs, so extraction can be tested without a Postgres server.
+
+import hashlib
+import re
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.conn.executed.append(sql)
+        sql = " ".join(sql.split())
+
+        declare = re.match(r"DECLARE (\w+) NO SCROLL CURSOR FOR (.*)", sql)
+        if declare:
+            name, query = declare.groups()
+            self.conn.portals[name] = iter(self.conn.run_query(query, params))
+            self.result = []
+            return
+
+        fetch = re.match(r"FETCH FORWARD (\d+) FROM (\w+)", sql)
+        if fetch:
+            size, name = int(fetch.group(1)), fetch.group(2)
+            portal = self.conn.portals[name]
+            self.result = [row for _, row in zip(range(size), portal)]
+            return
+
+        if sql.startswith("CLOSE"):
+            self.conn.portals.pop(sql.split()[1], None)
+            self.result = []
+            return
+
+        self.result = list(self.conn.run_query(sql, params))
+
+    def fetchall(self):
+        rows, self.result = self.result, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    columns: list of (schema, table, column, data_type, is_nullable) in ordinal
+    order; tables without columns can be listed in empty_tables as (schema, table).
+    """
+
+    def __init__(self, columns, empty_tables=()):
+        self.columns = list(columns)
+        self.empty_tables = list(empty_tables)
+        self.executed = []
+        self.portals = {}
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def run_query(self, query, params):
+        if "information_schema.tables t LEFT JOIN information_schema.columns" in query:
+            schemas = set(params[0])
+            rows = [(s, t, c, d, n) for s, t, c, d, n in self.columns if s in schemas]
+            rows += [(s, t, None, None, None) for s, t in self.empty_tables if s in schemas]
+            # ORDER BY schema, table, ordinal_position (stable sort keeps ordinal order)
+            if 'COLLATE "C"' in query:
+                rows.sort(key=lambda r: (r[0], r[1]))
+            else:
+                rows.sort(key=lambda r: (_collation_key(r[0]), _collation_key(r[1])))
+            if "t.table_schema || '.' || t.table_name = ANY" in query:
+                wanted = set(params[1])
+                rows = [r for r in rows if f"{r[0]}.{r[1]}" in wanted]
+            return rows
+
+        if "FROM pg_class c" in query:
+            schemas = set(params[0])
+            tables = {}
+            for s, t, c, d, n in self.columns:
+                if s in schemas:
+                    tables.setdefault((s, t), []).append(f"{c}:{d}:{n == 'NO'}")
+            for s, t in self.empty_tables:
+                if s in schemas:
+                    tables.setdefault((s, t), [])
+            return [
+                (s, t, hashlib.md5(",".join(cols).encode()).hexdigest() if cols else "")
+                for (s, t), cols in tables.items()
+            ]
+
+        raise AssertionError(f"unexpected query: {query}")
+
+
+def _collation_key(name):
+    """Order of a typical non-C database collation (en_US): case and punctuation ignored first."""
+    return re.sub(r"[^0-9a-z]", "", name.lower()), name.swapcase()
@@ -0,0 +1,213 @@
+--
+-- PostgreSQL database dump
+--
+
+-- Dumped from database version 15.4
+-- Dumped by pg_dump version 15.4
+
+SET statement_timeout = 0;
+SET lock_timeout = 0;
+SET idle_in_transaction_session_timeout = 0;
+SET client_encoding = 'UTF8';
+SET standard_conforming_strings = on;
+SELECT pg_catalog.set_config('search_path', '', false);
+SET check_function_bodies = false;
+SET xmloption = content;
+SET client_min_messages = warning;
+SET row_security = off;
+
+--
+-- Name: audit; Type: SCHEMA; Schema: -; Owner: app
+--
+
+CREATE SCHEMA audit;
+
+
+ALTER SCHEMA audit OWNER TO app;
+
+--
+-- Name: mood; Type: TYPE; Schema: public; Owner: app
+--
+
+CREATE TYPE public.mood AS ENUM (
+    'happy',
+    'sad'
+);
+
+
+ALTER TYPE public.mood OWNER TO app;
+
+--
+-- Name: email_address; Type: DOMAIN; Schema: public; Owner: app
+--
+
+CREATE DOMAIN public.email_address AS character varying(320)
+	CONSTRAINT email_address_check CHECK (((VALUE)::text ~~ '%@%'::text));
+
+
+ALTER DOMAIN public.email_address OWNER TO app;
+
+--
+-- Name: touch_updated_at(); Type: FUNCTION; Schema: public; Owner: app
+--
+
+CREATE FUNCTION public.touch_updated_at() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.updated_at := now();  -- ALTER TABLE public.employees DROP COLUMN salary;
+    RETURN NEW;
+END;
+$$;
+
+
+ALTER FUNCTION public.touch_updated_at() OWNER TO app;
+
+SET default_tablespace = '';
+
+SET default_table_access_method = heap;
+
+--
+-- Name: events; Type: TABLE; Schema: audit; Owner: app
+--
+
+CREATE TABLE audit.events (
+    event_id bigint NOT NULL,
+    kind text NOT NULL,
+    payload jsonb,
+    tags text[],
+    "occurredAt" timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE audit.events OWNER TO app;
+
+--
+-- Name: events_event_id_seq; Type: SEQUENCE; Schema: audit; Owner: app
+--
+
+ALTER TABLE audit.events ALTER COLUMN event_id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME audit.events_event_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+--
+-- Name: departments; Type: TABLE; Schema: public; Owner: app
+--
+
+CREATE TABLE public.departments (
+    department_id integer NOT NULL,
+    department_name character varying(100) NOT NULL,
+    location character varying(100),
+    budget numeric(12,2)
+);
+
+
+ALTER TABLE public.departments OWNER TO app;
+
+--
+-- Name: departments_department_id_seq; Type: SEQUENCE; Schema: public; Owner: app
+--
+
+CREATE SEQUENCE public.departments_department_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER TABLE public.departments_department_id_seq OWNER TO app;
+
+ALTER SEQUENCE public.departments_department_id_seq OWNED BY public.departments.department_id;
+
+--
+-- Name: employees; Type: TABLE; Schema: public; Owner: app
+--
+
+CREATE TABLE public.employees (
+    employee_id integer NOT NULL,
+    employee_name character varying(100) NOT NULL,
+    email public.email_address,
+    salary numeric(10,2),
+    department_id integer,
+    current_mood public.mood DEFAULT 'happy'::public.mood,
+    hired_on date,
+    is_active boolean DEFAULT true NOT NULL,
+    rating double precision,
+    updated_at timestamp(3) without time zone,
+    CONSTRAINT employees_salary_check CHECK ((salary IS NOT NULL))
+);
+
+
+ALTER TABLE public.employees OWNER TO app;
+
+--
+-- Name: employee_summary; Type: VIEW; Schema: public; Owner: app
+--
+
+CREATE VIEW public.employee_summary AS
+ SELECT employees.employee_id,
+    employees.employee_name
+   FROM public.employees;
+
+--
+-- Name: temp_import; Type: TABLE; Schema: public; Owner: app
+--
+
+CREATE UNLOGGED TABLE public.temp_import (
+    "line" text,
+    "Raw;Value" text
+);
+
+--
+-- Name: departments department_id; Type: DEFAULT; Schema: public; Owner: app
+--
+
+ALTER TABLE ONLY public.departments ALTER COLUMN department_id SET DEFAULT nextval('public.departments_department_id_seq'::regclass);
+
+--
+-- Data for Name: departments; Type: TABLE DATA; Schema: public; Owner: app
+--
+
+COPY public.departments (department_id, department_name, location, budget) FROM stdin;
+1	CREATE TABLE public.fake (x int);	Paris	10.00
+\.
+
+--
+-- Name: departments departments_pkey; Type: CONSTRAINT; Schema: public; Owner: app
+--
+
+ALTER TABLE ONLY public.departments
+    ADD CONSTRAINT departments_pkey PRIMARY KEY (department_id);
+
+ALTER TABLE ONLY public.employees
+    ADD CONSTRAINT employees_pkey PRIMARY KEY (employee_id);
+
+ALTER TABLE ONLY audit.events
+    ADD CONSTRAINT events_pkey PRIMARY KEY (event_id);
+
+--
+-- Name: employees_department_idx; Type: INDEX; Schema: public; Owner: app
+--
+
+CREATE INDEX employees_department_idx ON public.employees USING btree (department_id);
+
+CREATE TRIGGER employees_touch BEFORE UPDATE ON public.employees FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+
+ALTER TABLE ONLY public.employees
+    ADD CONSTRAINT employees_department_id_fkey FOREIGN KEY (department_id) REFERENCES public.departments(department_id) ON DELETE SET NULL;
+
+COMMENT ON TABLE public.employees IS 'All staff; ALTER TABLE public.employees DROP COLUMN email;';
+
+GRANT SELECT ON TABLE public.employees TO reporting;
+
+--
+-- PostgreSQL database dump complete
+--
+
@@ -0,0 +1,73 @@
+# Parity: the "fast" analyzer engine must return exactly what the sqlparse
+# engine returns, for every query it accepts (others fall back to sqlparse).
+# Results are compared as lists: both engines deduplicate names in first-seen
+# order, so the comparison does not depend on the string hash seed.
+
+from pathlib import Path
+import pytest
+from src.ast_parser import PythonSQLParser
+from src.fast_analyzer import analyze_fast
+from src.sql_analyzer import SQLAnalyzer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXTRA_CASES = [
+    "SELECT a, b FROM t",
+    "SELECT * FROM t",
+    "SELECT DISTINCT a FROM t",
+    "select a from t where b = 1",
+    "SELECT x.a AS y FROM s.t AS x",
+    "SELECT a FROM t x, u y WHERE x.b <> 1 OR y.c <= 'z'",
+    "SELECT a FROM t WHERE b = 1 AND c = d;",
+    "SELECT a FROM t ORDER BY b",
+    "SELECT a FROM t JOIN u ON t.x = u.y",
+    "SELECT name FROM t",
+    "SELECT a FROM t LIMIT 5",
+    "UPDATE t SET a = 1, b = 'x' WHERE c = 2",
+    "UPDATE t x SET x.a = b",
+    "INSERT INTO t (a, b) VALUES (1, 'x')",
+    "INSERT INTO s.t (a) VALUES (1)",
+    "INSERT INTO t VALUES (1)",
+    "DELETE FROM t WHERE a = 1",
+    "DELETE FROM s.t WHERE a = 1",
+    "UPDATE s.t SET a = 1",
+    "SELECT a FROM s.t JOIN u ON s.t.x = u.y ORDER BY t.b",
+    "DROP TABLE IF EXISTS t",
+    "TRUNCATE TABLE s.t;",
+    "-- comment\nSELECT a FROM t",
+]
+
+
+def _sample_queries():
+    queries = []
+    for name in ("testing.py", "sql_tests.py"):
+        queries.extend(q["query"] for q in PythonSQLParser(str(ROOT / name)).parse_file())
+    return queries + EXTRA_CASES
+
+
+@pytest.mark.parametrize("query", _sample_queries())
+def test_fast_engine_matches_sqlparse(query):
+    expected = SQLAnalyzer(query, engine="sqlparse").analyze()
+
+    assert SQLAnalyzer(query, engine="fast").analyze() == expected
+
+    fast = analyze_fast(query)
+    assert fast is None or fast == expected
+
+
+def test_fast_engine_handles_common_shapes():
+    handled = [q for q in _sample_queries() if analyze_fast(q) is not None]
+    assert len(handled) >= 20
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        SQLAnalyzer("SELECT 1", engine="nope")
+
+
+@pytest.mark.parametrize("engine", ["sqlparse", "fast"])
+def test_identifiers_keep_first_seen_order(engine):
+    result = SQLAnalyzer("SELECT d, b, a, c, b FROM t, s", engine=engine).analyze()
+
+    assert result["tables"] == ["t", "s"]
+    assert result["columns"] == ["d", "b", "a", "c"]
@@ -0,0 +1,60 @@
+import ast
+from src.ast_parser import SQL_START, PythonSQLParser, may_contain_sql
+
+# Sources whose only query reaches the AST as "SELECT a FROM t"
+HIDDEN_KEYWORDS = [
+    'q = "\\nSELECT a FROM t"\n',
+    'q = "\\tselect a FROM t"\n',
+    'q = r"SELECT a FROM t"\n',
+    'q = u"SELECT a FROM t"\n',
+    'q = Rb"x" if 0 else "SELECT a FROM t"\n',
+    'q = "\\x53ELECT a FROM t"\n',
+    'q = "\\123ELECT a FROM t"\n',
+    'q = "\\u0053ELECT a FROM t"\n',
+    'q = "\\N{LATIN CAPITAL LETTER S}ELECT a FROM t"\n',
+    'q = "SEL" "ECT a FROM t"\n',
+    'q = ("S"\n     \'ELECT a FROM t\')\n',
+    'q = ("SEL"  # split\n     r"ECT a FROM t")\n',
+    'q = """SEL""" u"ECT a FROM t"\n',
+    'q = "SEL\\\nECT a FROM t"\n',
+]
+
+
+def _queries(source):
+    return [q["query"] for q in PythonSQLParser("app.py").parse_source(source)]
+
+
+def _constants(source):
+    """SQL-like string constants, found without the pre-scan."""
+    return [n.value for n in ast.walk(ast.parse(source))
+            if type(n) is ast.Constant and type(n.value) is str and SQL_START.match(n.value)]
+
+
+def test_bytes_and_text_agree():
+    for source in HIDDEN_KEYWORDS + ["x = 1\n", "def f():\n    return 'hello'\n"]:
+        assert may_contain_sql(source) == may_contain_sql(source.encode()), source
+        assert _queries(source) == _queries(source.encode()), source
+
+
+def test_keywords_hidden_in_the_source_are_not_skipped():
+    for source in HIDDEN_KEYWORDS:
+        assert _constants(source), source  # the case really holds a query
+        assert may_contain_sql(source), source
+        assert [q.strip() for q in _queries(source)] == [q.strip() for q in _constants(source)], source
+
+
+def test_files_without_sql_are_skipped():
+    for source in ["x = 1\n", "print('hello world')\n", "def f(a, b):\n    return a + b\n",
+                   "msg = ('first part '\n       'second part')\n", "path = 'C:\\\\temp'\n"]:
+        assert not _constants(source)
+        assert not may_contain_sql(source), source
+        assert not may_contain_sql(source.encode()), source
+
+
+def test_a_file_with_sql_is_parsed(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_bytes(b"import db\n\n\ndef f():\n    return db.run(\"\"\"\n    select salry\n    FROM employees\"\"\")\n")
+
+    queries = PythonSQLParser(str(path)).parse_file()
+
+    assert [(q["line"], q["query"].split()) for q in queries] == [(5, ["select", "salry", "FROM", "employees"])]
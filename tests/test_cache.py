@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from click.testing import CliRunner
+import src.cache
+from src.cache import ResultCache
+from src.cli import cli
+from src.model import Diagnostic
+
+ROOT = Path(__file__).resolve().parent.parent
+CONTENT = b'q = "SELECT salry FROM employees"\n'
+
+
+def _inputs(tmp_path):
+    schema, config = tmp_path / "schema.json", tmp_path / "config.yaml"
+    shutil.copy(ROOT / "schema.json", schema)
+    shutil.copy(ROOT / "default_config.yaml", config)
+    return schema, config
+
+
+def _cache(tmp_path, schema, config, **kwargs):
+    return ResultCache(tmp_path / "cache", str(schema), str(config), **kwargs)
+
+
+def test_entries_round_trip_per_file(tmp_path):
+    schema, config = _inputs(tmp_path)
+    cache = _cache(tmp_path, schema, config)
+    key = cache.key(CONTENT, "py")
+    assert cache.get(key, "a.py") is None
+
+    cache.put(key, [Diagnostic("Column 'salry' not found", offending="salry", file="a.py", line=1)])
+
+    again = _cache(tmp_path, schema, config)
+    assert [(d.file, d.line, d.offending) for d in again.get(key, "b.py")] == [("b.py", 1, "salry")]
+    assert again.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_schema_config_and_version_changes_miss(tmp_path, monkeypatch):
+    schema, config = _inputs(tmp_path)
+    cache = _cache(tmp_path, schema, config)
+    cache.put(cache.key(CONTENT, "py"), [])
+
+    def hit():
+        fresh = _cache(tmp_path, schema, config)
+        return fresh.get(fresh.key(CONTENT, "py"), "a.py") is not None
+
+    assert hit()
+
+    schema.write_text(schema.read_text().replace("salary", "salry"))
+    assert not hit()
+    shutil.copy(ROOT / "schema.json", schema)
+    assert hit()
+
+    config.write_text(config.read_text() + "\n# tweak\n")
+    assert not hit()
+    shutil.copy(ROOT / "default_config.yaml", config)
+    assert hit()
+
+    monkeypatch.setattr(src.cache, "__version__", "99.0")
+    assert not hit()
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    schema, config = _inputs(tmp_path)
+    cache = _cache(tmp_path, schema, config)
+    keys = [cache.key(b"x = %d\n" % i, "py") for i in range(4)]
+    for age, key in zip((400, 300, 200, 100), keys):
+        cache.put(key, [])
+        entry = cache._entry_path(key)
+        os.utime(entry, (entry.stat().st_mtime - age,) * 2)
+
+    assert cache.get(keys[0], "a.py") == []  # oldest, but just used
+    cache.max_bytes = cache.size_bytes() // 2
+    cache.prune()
+
+    assert cache.stats["evictions"] == 2
+    assert [cache._entry_path(k).exists() for k in keys] == [True, False, False, True]
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_no_cache_neither_reads_nor_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    source = tmp_path / "app.py"
+    source.write_bytes(CONTENT)
+    cache_dir = tmp_path / "cache"
+    runner = CliRunner()
+
+    def errors(*flags):
+        result = runner.invoke(cli, ["check", str(source), "--json-output", "--cache-dir", str(cache_dir), *flags])
+        return json.loads(result.stdout)["errors"]
+
+    uncached = errors("--no-cache")
+    assert not cache_dir.exists()
+
+    assert errors() == uncached
+    assert len(list(cache_dir.rglob("*.json"))) == 1
+
+    # A poisoned entry is served with the cache, ignored without it
+    entry = next(cache_dir.rglob("*.json"))
+    entry.write_text(json.dumps({"errors": []}))
+    assert errors() == []
+    assert errors("--no-cache") == uncached
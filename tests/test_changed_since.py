@@ -0,0 +1,68 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from src.changes import GitError, changed_source_files
+from src.cli import cli
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BAD = 'q = "SELECT employe_name FROM employees"\n'
+GOOD = 'q = "SELECT employee_name FROM employees"\n'
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def _repo(tmp_path):
+    shutil.copy(ROOT / "schema.json", tmp_path / "schema.json")
+    shutil.copy(ROOT / "default_config.yaml", tmp_path / "default_config.yaml")
+    (tmp_path / "app").mkdir()
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / "app" / name).write_text(BAD)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+
+def test_only_changed_and_untracked_files(tmp_path, monkeypatch):
+    repo = _repo(tmp_path)
+    monkeypatch.chdir(repo)
+    (repo / "app" / "b.py").write_text(BAD + GOOD)
+    (repo / "app" / "new.py").write_text(BAD)
+    (repo / "app" / "notes.txt").write_text("x")
+    (repo / "app" / "c.py").unlink()
+
+    assert changed_source_files(Path("app"), "HEAD") == ["app/b.py", "app/new.py"]
+    assert changed_source_files(Path("."), "HEAD") == ["app/b.py", "app/new.py"]
+
+    result = CliRunner().invoke(cli, ["check", "app", "--changed-since", "HEAD", "--json-output", "--no-cache"])
+    assert sorted({e["file"] for e in json.loads(result.stdout)["errors"]}) == ["app/b.py", "app/new.py"]
+
+
+def test_schema_change_falls_back_to_full_run(tmp_path, monkeypatch):
+    repo = _repo(tmp_path)
+    monkeypatch.chdir(repo)
+    assert changed_source_files(Path("app"), "HEAD") == []
+
+    (repo / "schema.json").write_text((repo / "schema.json").read_text() + "\n")
+
+    assert changed_source_files(Path("app"), "HEAD", watched=["schema.json"]) is None
+    result = CliRunner().invoke(cli, ["check", "app", "--changed-since", "HEAD", "--json-output", "--no-cache"])
+    assert len({e["file"] for e in json.loads(result.stdout)["errors"]}) == 3
+
+
+def test_unknown_revision(tmp_path, monkeypatch):
+    monkeypatch.chdir(_repo(tmp_path))
+
+    with pytest.raises(GitError):
+        changed_source_files(Path("app"), "no-such-rev")
+
+    result = CliRunner().invoke(cli, ["check", "app", "--changed-since", "no-such-rev"])
+    assert result.exit_code == 2
+    assert "❌" in result.output
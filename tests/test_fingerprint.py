@@ -0,0 +1,52 @@
+from src.fingerprint import QueryMemo, fingerprint
+
+
+def test_literal_values_collapse():
+    assert fingerprint("SELECT a FROM t WHERE b = 'x' AND c = 1") == fingerprint(
+        "SELECT a FROM t WHERE b = 'other' AND c = 42")
+    assert fingerprint("SELECT a FROM t WHERE b = 'it''s'") == "SELECT a FROM t WHERE b = ?s"
+    assert fingerprint("SELECT  a\tFROM t") == fingerprint("SELECT a FROM t")
+
+
+def test_strings_with_significant_characters_stay_verbatim():
+    for literal in ("'a=b'", "'a<b'", "'a>b'", "'f(x)'", "'a,b'", "'a;b'", "'a\\b'"):
+        query = f"INSERT INTO t (a) VALUES ({literal})"
+        assert literal in fingerprint(query)
+    assert fingerprint("SELECT 'a=b'") != fingerprint("SELECT 'a=c'")
+
+
+def test_literal_types_and_placeholder_escaping():
+    assert fingerprint("SELECT 1, 2.5, 1e3, 'x'") == "SELECT ?i, ?f, ?f, ?s"
+    assert fingerprint("SELECT 1") != fingerprint("SELECT 1.0") != fingerprint("SELECT '1'")
+    # A literal "?" in the query never looks like a placeholder
+    assert fingerprint("SELECT a FROM t WHERE b = ?") == "SELECT a FROM t WHERE b = ??"
+    assert fingerprint("SELECT ?s") != fingerprint("SELECT 'x'")
+
+
+def test_keywords_identifiers_and_line_structure_stay_distinct():
+    base = "SELECT a FROM t"
+    for other in ("select a FROM t", "SELECT A FROM t", "SELECT b FROM t", 'SELECT "a" FROM t',
+                  "SELECT a\nFROM t", "SELECT a FROM t2"):
+        assert fingerprint(other) != fingerprint(base), other
+
+    assert fingerprint("SELECT a\n\nFROM t") != fingerprint("SELECT a\nFROM t")
+    # Literals spanning lines keep their newlines (line offsets of later statements)
+    assert fingerprint("SELECT 'a\nb';\nSELECT c") == "SELECT ?s\n;\nSELECT c"
+    assert fingerprint("SELECT 'a\nb';\nSELECT c") != fingerprint("SELECT 'ab';\nSELECT c")
+
+
+def test_memo_evicts_least_recently_used():
+    memo = QueryMemo(max_entries=2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1  # "b" is now the oldest
+    memo.put("c", 3)
+
+    assert len(memo) == 2
+    assert memo.get("b") is None
+    assert (memo.get("a"), memo.get("c")) == (1, 3)
+    assert (memo.hits, memo.misses) == (3, 1)
+
+    disabled = QueryMemo(max_entries=0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None and len(disabled) == 0
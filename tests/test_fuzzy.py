@@ -0,0 +1,59 @@
+import random
+from src.fuzzy import PREFIX_BONUS, SuggestionIndex, _score, normalize, suggest
+
+NAMES = [
+    "employee_id", "employee_name", "employees", "email", "emp_id", "EMPID", "empid", "emp__id",
+    "department_id", "departments", "dept", "location", "salary", "sales", "salary_history",
+    "order_id", "orders", "a", "ab", "id", "name", "Name", "nme", "updated_at", "created_at",
+]
+QUERIES = ["emp", "empid", "employe_name", "emial", "departmnt", "slary", "nme", "id", "x", "",
+           "_", "ordrs", "ORDER_ID", "aa", "created", "zzzzzz"]
+
+
+def test_index_matches_linear_scan():
+    index = SuggestionIndex(NAMES)
+
+    for query in QUERIES:
+        for cutoff in (0.0, PREFIX_BONUS, 0.3, 0.45, 0.6, 0.9, 1.0, 1.15, 1.2):
+            for top_k in (0, 1, 3, len(NAMES)):
+                expected = suggest(query, NAMES, cutoff, top_k)
+                assert index.suggest(query, cutoff, top_k) == expected, (query, cutoff, top_k)
+
+
+def test_ties_keep_candidate_order():
+    # Same normalized form → same score: suggest() keeps candidate order (stable sort)
+    names = ["emp__id", "EMPID", "other", "emp_id", "empid"]
+    assert SuggestionIndex(names).suggest("empid", top_k=4) == suggest("empid", names, top_k=4)
+    assert SuggestionIndex(names).suggest("empid", top_k=4) == ["emp__id", "EMPID", "emp_id", "empid"]
+
+    reordered = list(reversed(names))
+    assert SuggestionIndex(reordered).suggest("empid", top_k=2) == suggest("empid", reordered, top_k=2)
+
+
+def test_empty_candidates():
+    index = SuggestionIndex([])
+    assert len(index) == 0
+    assert index.suggest("employee") == suggest("employee", []) == []
+    assert index.suggest("") == []
+
+
+def test_cutoff_is_inclusive_at_the_exact_score():
+    names = ["salary", "sales", "slary"]
+    for query in ("slary", "sal", "salry"):
+        for name in names:
+            cutoff = _score(normalize(query), normalize(name))
+            expected = suggest(query, names, cutoff)
+            assert name in expected
+            assert SuggestionIndex(names).suggest(query, cutoff) == expected
+
+
+def test_random_candidate_lists():
+    rng = random.Random(3)
+    alphabet = "aeimnoprst_"
+    for _ in range(50):
+        names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10))) for _ in range(rng.randint(0, 40))]
+        index = SuggestionIndex(names)
+        for _ in range(10):
+            query = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            cutoff = rng.choice([0.2, 0.45, 0.5, 0.7])
+            assert index.suggest(query, cutoff) == suggest(query, names, cutoff), (query, names)
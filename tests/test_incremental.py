@@ -0,0 +1,158 @@
+import random
+from pathlib import Path
+from src.ast_parser import PythonSQLParser
+from src.incremental import IncrementalDocument
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA = str(ROOT / "schema.json")
+CONFIG = str(ROOT / "default_config.yaml")
+
+SOURCE = '''\
+import db
+
+
+class Repo:
+    def first(self):
+        return db.execute("SELECT employee_name FROM employees")
+
+    def second(self):
+        x = 1
+        return db.execute("SELECT employe_name FROM employees")
+
+
+TOTAL = "SELECT salary FROM employes"
+'''
+
+
+def _queries(doc):
+    return sorted((q["line"], q["query"]) for q in doc.queries)
+
+
+def _full(text):
+    return sorted((q["line"], q["query"]) for q in PythonSQLParser("app.py").parse_source(text))
+
+
+def _edit(text, line, new_lines, remove=0):
+    lines = text.splitlines(True)
+    lines[line - 1:line - 1 + remove] = new_lines
+    return "".join(lines)
+
+
+def test_edits_match_a_full_parse():
+    doc = IncrementalDocument(SQLValidator(SCHEMA, CONFIG), "app.py")
+    doc.update(SOURCE)
+
+    text = _edit(SOURCE, 10, ['        y = "DELETE FROM departmnts"\n'])  # insert inside second()
+    doc.update(text, 10, 10)
+    assert _queries(doc) == _full(text)
+
+    text = _edit(text, 5, ["    def first(self):\n", "        pass\n"], remove=2)  # rewrite first()
+    doc.update(text, 5, 6)
+    assert _queries(doc) == _full(text)
+
+    text = _edit(text, 9, [], remove=1)  # delete "x = 1"
+    doc.update(text, 9, 8)
+    assert _queries(doc) == _full(text)
+    assert doc.syntax_error is None
+
+
+def test_untouched_queries_reuse_diagnostics():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    doc = IncrementalDocument(validator, "app.py")
+    before = doc.update(SOURCE)
+
+    validated = []
+    original = validator.validate
+    validator.validate = lambda query, *args: validated.append(query) or original(query, *args)
+
+    text = _edit(SOURCE, 3, ["# a comment\n"])
+    after = doc.update(text, 3, 3)
+
+    assert validated == []
+    assert [d.line for d in after] == [d.line + 1 for d in before]
+
+
+def test_multi_statement_strings_keep_their_line_offsets():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    doc = IncrementalDocument(validator, "app.py")
+    source = 'x = 1\nm = """SELECT a FROM employees;\nSELECT b FROM departments"""\n'
+    doc.update(source)
+
+    text = _edit(source, 2, ["y = 2\n"])
+    after = doc.update(text, 2, 2)
+
+    full = IncrementalDocument(validator, "app.py").update(text)
+    assert [(d.line, d.offending) for d in after] == [(d.line, d.offending) for d in full]
+    assert [d.line for d in after] == [3, 4]
+
+
+def test_syntax_error_keeps_results_outside_the_edit():
+    doc = IncrementalDocument(SQLValidator(SCHEMA, CONFIG), "app.py")
+    doc.update(SOURCE)
+
+    broken = _edit(SOURCE, 9, ["        x = (\n"], remove=1)
+    doc.update(broken, 9, 9)
+
+    assert doc.syntax_error is not None
+    assert (13, "SELECT salary FROM employes") in _queries(doc)
+
+    doc.update(SOURCE, 9, 9)
+    assert doc.syntax_error is None
+    assert _queries(doc) == _full(SOURCE)
+
+
+def test_replacing_the_header_of_the_next_statement_reparses_it():
+    doc = IncrementalDocument(SQLValidator(SCHEMA, CONFIG), "app.py")
+    source = 'm = 3\ns = """\nUPDATE employees\nSET nme = 1\n"""\n'
+    doc.update(source)
+
+    text = _edit(source, 1, ['q = "SELECT emial FROM employees"\n'], remove=2)
+    doc.update(text, 1, 1)
+
+    assert doc.syntax_error is not None  # the closing quotes now open a string
+
+
+# Snippets random edits are assembled from
+UNITS = [
+    "x = 1\n",
+    "def f():\n    y = 'SELECT nme FROM employees'\n    return y\n",
+    "class A:\n    def g(self):\n        q = \"UPDATE employees SET nme = 1\"\n        pass\n",
+    's = """\nUPDATE employees\nSET nme = 1\n"""\n',
+    "if x:\n    z = 'SELECT emial FROM employees'\nelse:\n    z = 2\n",
+    'm = """SELECT emial FROM employees;\nSELECT b FROM departments"""\n',
+    "@dec\ndef h():\n    for i in y:\n        continue\n",
+    "# comment\n",
+    "\n",
+]
+
+
+def _state(doc):
+    if doc.syntax_error is not None:
+        return "broken"
+    return sorted((d.line, d.offending, d.message) for d in doc.diagnostics())
+
+
+def test_random_edits_match_a_full_parse():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    rng = random.Random(0)
+    pieces = [line for unit in UNITS for line in unit.splitlines(True)]
+
+    for _ in range(30):
+        text = "".join(rng.choice(UNITS) for _ in range(rng.randint(2, 6)))
+        doc = IncrementalDocument(validator, "app.py")
+        doc.update(text)
+        for _ in range(10):
+            lines = text.splitlines(True)
+            line = rng.randint(1, len(lines) + 1)
+            remove = rng.randint(0, min(4, len(lines) - line + 1))
+            if rng.random() < 0.5:
+                new = "".join(rng.choice(UNITS) for _ in range(rng.randint(1, 2))).splitlines(True)
+            else:
+                new = [rng.choice(pieces) for _ in range(rng.randint(0, 2))]
+            text = _edit(text, line, new, remove)
+            doc.update(text, line, line + len(new) - 1)
+
+            full = IncrementalDocument(validator, "app.py")
+            full.update(text)
+            assert _state(doc) == _state(full), text
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from click.testing import CliRunner
+from src.cli import cli
+from src.runner import discover_files, iter_files
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_lazy_discovery_matches_sorted_rglob(tmp_path):
+    for name in ("a-b.py", "a/z.py", "a.py", "A/B.py", ".hidden/q.py", "a/notes.txt", "a/m.sql"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+
+    expected = sorted(str(p) for pattern in ("*.py", "*.sql") for p in tmp_path.rglob(pattern))
+
+    assert list(iter_files(tmp_path)) == expected
+    assert discover_files(tmp_path) == expected
+
+
+def test_jsonl_streams_diagnostics_then_summary(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    runner = CliRunner()
+
+    jsonl = runner.invoke(cli, ["check", "tests", "--format", "jsonl", "--no-cache", "-j", "1"])
+    whole = runner.invoke(cli, ["check", "tests", "--json-output", "--no-cache", "-j", "1"])
+
+    records = [json.loads(line) for line in jsonl.output.splitlines()]
+    diagnostics = [r for r in records[:-1] if r.pop("type") == "diagnostic"]
+    summary = records[-1]
+
+    assert diagnostics == json.loads(whole.output)["errors"]
+    assert summary["type"] == "summary"
+    assert summary["diagnostics"] == len(diagnostics)
+    assert summary["files"] == len(discover_files(Path("tests")))
+    assert 0 < summary["files_with_errors"] <= summary["files"]
+
+
+def test_parallel_check_matches_serial(tmp_path, monkeypatch):
+    sources = [ROOT / "testing.py", ROOT / "sql_tests.py", ROOT / "tests" / "complex_test.py",
+               ROOT / "tests" / "wrong_join.py"]
+    for i, source in enumerate(sources * 3):
+        path = tmp_path / "app" / f"pkg{i % 4}" / f"{i}_{source.name}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(source.read_bytes())
+    (tmp_path / "app" / "migration.sql").write_text("SELECT salry FROM employees;\nDELETE FROM employes;\n")
+
+    monkeypatch.chdir(ROOT)
+    runner = CliRunner()
+
+    def errors(jobs):
+        result = runner.invoke(cli, ["check", str(tmp_path / "app"), "--json-output", "--no-cache", "-j", jobs])
+        return json.loads(result.output)["errors"]
+
+    serial = errors("1")
+    assert len({e["file"] for e in serial}) > 4
+    assert errors("2") == serial
+    assert errors("4") == serial
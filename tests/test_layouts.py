@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+import pytest
+from src.layouts import SCHEMA_LAYOUTS, SCHEMAS, TABLE_LAYOUTS, expand
+from src.model import schema_object
+from src.schema_extractor import SchemaExtractor
+from src.snapshot import CompiledSchema, load_schema
+from src.validator import SQLValidator
+from fake_pg import FakeConnection
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TENANTS = [f"tenant_{i}" for i in range(300)]
+
+
+def _columns():
+    rows = [("public", "plans", "plan_id", "integer", "NO")]
+    for tenant in TENANTS:
+        rows += [
+            (tenant, "orders", "order_id", "integer", "NO"),
+            (tenant, "orders", "status", "text", "YES"),
+            (tenant, "users", "user_id", "integer", "NO"),
+            (tenant, "users", "email", "character varying", "YES"),
+        ]
+        if tenant == "tenant_7":  # one tenant is a migration ahead
+            rows.append((tenant, "orders", "discount", "numeric", "YES"))
+    return rows
+
+
+def _extract(path, **kwargs):
+    conn = FakeConnection(_columns())
+    SchemaExtractor(connection=conn, schemas=["public", *TENANTS]).save_to_file(str(path), **kwargs)
+
+
+@pytest.fixture
+def deduplicated(tmp_path):
+    path = tmp_path / "schema.json"
+    _extract(path, dedup=True)
+    return path
+
+
+def test_snapshot_stores_each_layout_once(tmp_path, deduplicated):
+    flat = tmp_path / "flat.json"
+    _extract(flat)
+    schema = json.loads(deduplicated.read_text())
+
+    assert len(schema[TABLE_LAYOUTS]) == 3
+    assert len(schema[SCHEMA_LAYOUTS]) == 2
+    assert len(schema[SCHEMAS]) == len(TENANTS)
+    assert "plans" in schema and "tenant_1.orders" not in schema
+    assert deduplicated.stat().st_size * 10 < flat.stat().st_size
+    assert dict(expand(schema)) == json.loads(flat.read_text())
+
+
+def test_compiled_snapshot_keeps_the_indirection(tmp_path):
+    path = tmp_path / "schema.json"
+    _extract(path, dedup=True, compile=True)
+
+    compiled = load_schema(path)
+    assert isinstance(compiled, CompiledSchema)
+    assert list(compiled) == ["plans", TABLE_LAYOUTS, SCHEMA_LAYOUTS, SCHEMAS]
+    assert dict(expand(compiled)) == dict(expand(json.loads(path.read_text(), object_pairs_hook=schema_object)))
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_validator_resolves_tenant_tables_through_layouts(tmp_path, compiled):
+    path = tmp_path / "schema.json"
+    _extract(path, dedup=True, compile=compiled)
+    validator = SQLValidator(str(path), str(ROOT / "default_config.yaml"))
+    index = validator.index
+
+    assert index.resolve("tenant_42.orders") == "tenant_42.orders"
+    assert index.resolve("tenant_42.invoices") is None
+    assert index.resolve("plans") == "plans"
+    assert index.entry("tenant_1.orders") is index.entry("tenant_299.orders")
+
+    assert validator.validate("SELECT status FROM tenant_42.orders", "app.py", 1) == []
+    assert validator.validate("SELECT discount FROM tenant_7.orders", "app.py", 1) == []
+
+    errors = validator.validate("SELECT discount FROM tenant_8.orders", "app.py", 1)
+    assert [e.offending for e in errors] == ["discount"]
+
+    errors = validator.validate("SELECT email FROM tenant_42.user", "app.py", 1)
+    assert [(e.offending, e.suggestion) for e in errors] == [("tenant_42.user", "tenant_42.users")]
+
+
+def test_refresh_keeps_snapshot_deduplicated(deduplicated):
+    conn = FakeConnection(_columns() + [("tenant_3", "users", "name", "text", "YES")])
+    extractor = SchemaExtractor(connection=conn, schemas=["public", *TENANTS])
+
+    diff = extractor.refresh(str(deduplicated))
+
+    assert diff["changed"] == {"tenant_3.users": {"added_columns": ["name"], "removed_columns": [], "modified_columns": []}}
+    schema = json.loads(deduplicated.read_text())
+    assert len(schema[TABLE_LAYOUTS]) == 4 and len(schema[SCHEMA_LAYOUTS]) == 3
+    assert dict(expand(schema))["tenant_3.users"]["columns"][-1]["name"] == "name"
@@ -0,0 +1,72 @@
+import json
+import pickle
+from pathlib import Path
+from src.layouts import SCHEMAS
+from src.model import Column, Diagnostic, Table, schema_object
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_schema_json_loads_into_tables_and_columns():
+    text = (ROOT / "schema.json").read_text()
+    schema = json.loads(text, object_pairs_hook=schema_object)
+
+    assert isinstance(schema["employees"], Table)
+    assert schema["employees"].columns[0] == Column("employee_id", "integer", False)
+    assert {t: table.to_dict() for t, table in schema.items()} == json.loads(text)
+
+    # Layout maps and columns written in another key order
+    other = json.loads(
+        '{"$schemas": {"name": "s1", "type": "s1", "nullable": "s1"},'
+        ' "t": {"columns": [{"type": "text", "nullable": null, "name": "x"}]}}',
+        object_pairs_hook=schema_object,
+    )
+    assert other[SCHEMAS] == {"name": "s1", "type": "s1", "nullable": "s1"}
+    assert other["t"] == Table([Column("x", "text")])
+
+
+def test_columns_written_by_other_tools_load(tmp_path):
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({
+        "users": {"columns": [{"name": "id", "type": "integer"},
+                              {"type": "text", "name": "email", "default": None, "comment": "login"}]},
+        "orders": {"columns": [{"name": "user_id", "type": "integer"}], "comment": "extra table key"},
+    }))
+
+    loaded = json.loads(schema.read_text(), object_pairs_hook=schema_object)
+    assert loaded["users"] == Table([Column("id", "integer"), Column("email", "text")])
+    assert loaded["orders"] == Table([Column("user_id", "integer")])
+
+    validator = SQLValidator(str(schema), str(ROOT / "default_config.yaml"))
+    assert validator.validate("SELECT email FROM users", "a.py", 1) == []
+    assert [d.offending for d in validator.validate("SELECT emial FROM users", "a.py", 1)] == ["emial"]
+
+    # Outside a "columns" list, a map with "name" and "type" keys stays a map
+    assert json.loads('{"$schemas": {"name": "s1", "type": "s1"}}', object_pairs_hook=schema_object) == {
+        SCHEMAS: {"name": "s1", "type": "s1"}}
+
+
+def test_identifiers_are_interned():
+    a = json.loads('{"columns": [{"name": "employee_name", "type": "text", "nullable": true}]}',
+                   object_pairs_hook=schema_object)
+    b = json.loads('{"columns": [{"name": "employee_name", "type": "text", "nullable": true}]}',
+                   object_pairs_hook=schema_object)
+    assert a.columns[0].name is b.columns[0].name
+
+
+def test_diagnostics_fan_out_from_shared_issues():
+    validator = SQLValidator(str(ROOT / "schema.json"), str(ROOT / "default_config.yaml"))
+    query = "SELECT employe_name FROM employees"
+
+    first = validator.validate(query, "a.py", 3)
+    second = validator.validate(query, "b.py", 9)
+
+    assert [(d.file, d.line) for d in first + second] == [("a.py", 3), ("b.py", 9)]
+    assert first[0].message is second[0].message
+    assert first[0].to_dict() == {
+        "file": "a.py", "line": 3, "offending": "employe_name", "start_col": None, "end_col": None,
+        "message": "Column 'employe_name' not found", "suggestion": "employee_name", "severity": "error",
+    }
+    assert Diagnostic.from_dict(first[0].to_dict()) == first[0]
+    assert pickle.loads(pickle.dumps(first)) == first
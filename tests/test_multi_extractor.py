@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from pathlib import Path
+from src.multi_extractor import ConnectionPool, MultiExtractor, Target
+from src.validator import SQLValidator
+from fake_pg import FakeConnection
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DATABASES = {
+    "billing": [
+        ("public", "invoices", "invoice_id", "integer", "NO"),
+        ("public", "invoices", "amount", "numeric", "NO"),
+        ("audit", "events", "event_id", "bigint", "NO"),
+        ("audit", "events", "kind", "text", "YES"),
+    ],
+    "accounts": [
+        ("public", "users", "user_id", "integer", "NO"),
+        ("auth", "sessions", "session_id", "text", "NO"),
+        ("audit", "events", "event_id", "bigint", "NO"),
+        ("audit", "events", "kind", "text", "YES"),
+    ],
+}
+
+
+class Factory:
+    """Fake connection factory: tracks open connections, can fail or stall."""
+
+    def __init__(self, databases=DATABASES, failures=0, delay=0.0):
+        self.databases = databases
+        self.failures = failures
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.open = self.peak = self.created = 0
+
+    def __call__(self, target):
+        with self.lock:
+            self.created += 1
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection refused")
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+        time.sleep(self.delay)
+        conn = FakeConnection(self.databases[target.database])
+        original = conn.close
+
+        def close():
+            with self.lock:
+                self.open -= 1
+            original()
+
+        conn.close = close
+        return conn
+
+
+def _targets(**options):
+    return [
+        Target("billing", schemas=["public", "audit"], **options),
+        Target("accounts", schemas=["public", "auth", "audit"], **options),
+    ]
+
+
+def test_merges_all_databases_and_schemas():
+    factory = Factory(delay=0.01)
+    result = MultiExtractor(_targets(), connect=factory, workers=8, pool_size=2).extract()
+
+    assert list(result.tables) == ["audit.events", "auth.sessions", "invoices", "users"]
+    assert result.failures == {}
+    assert result.conflicts == []
+    assert factory.peak <= 2
+    assert factory.open == 0  # every connection closed at the end
+
+
+def test_conflicting_definitions_keep_the_first_target():
+    databases = dict(DATABASES, accounts=[("audit", "events", "event_id", "integer", "NO")])
+    result = MultiExtractor(_targets(), connect=Factory(databases), pool_size=3).extract()
+
+    assert result.conflicts == ["audit.events"]
+    assert result.tables["audit.events"]["columns"][0]["type"] == "bigint"
+
+
+def test_failed_connections_are_retried():
+    factory = Factory(failures=2)
+    result = MultiExtractor(_targets(retries=2), connect=factory, workers=1, pool_size=1, backoff=0).extract()
+
+    assert result.failures == {}
+    assert len(result.tables) == 4
+
+
+def test_exhausted_retries_and_timeouts_are_reported():
+    result = MultiExtractor([Target("billing", retries=1)], connect=Factory(failures=5), backoff=0).extract()
+    assert list(result.failures) == [("localhost:5432/billing", "public")]
+    assert "ConnectionError" in result.failures[("localhost:5432/billing", "public")]
+
+    slow = Factory(delay=0.05)
+    result = MultiExtractor([Target("billing", timeout=0.01, retries=0)], connect=slow).extract()
+    assert "TimeoutError" in result.failures[("localhost:5432/billing", "public")]
+    assert slow.open == 0
+
+
+def test_pool_reuses_idle_connections_and_evicts_for_other_targets():
+    factory = Factory()
+    pool = ConnectionPool(factory, max_size=1)
+    billing, accounts = Target("billing"), Target("accounts")
+
+    first = pool.acquire(billing)
+    pool.release(billing, first)
+    assert pool.acquire(billing) is first
+    pool.release(billing, first)
+
+    pool.acquire(accounts)  # pool full: the idle billing connection is closed
+    assert factory.open == 1 and factory.created == 2
+    assert pool.open == 1
+
+
+def test_validator_resolves_schema_qualified_tables(tmp_path):
+    result = MultiExtractor(_targets(), connect=Factory()).extract()
+    result.save(str(tmp_path / "schema.json"))
+    validator = SQLValidator(str(tmp_path / "schema.json"), str(ROOT / "default_config.yaml"))
+
+    assert validator.validate("SELECT kind FROM audit.events") == []
+    assert validator.validate("SELECT amount FROM public.invoices") == []
+    assert validator.validate("DELETE FROM auth.sessions") == []
+
+    [error] = validator.validate("SELECT session_id FROM audit.sessions")
+    assert error.message == "Table 'audit.sessions' not found"
+    assert error.suggestion == "auth.sessions"
+
+    [error] = validator.validate("SELECT kynd FROM audit.events")
+    assert error.suggestion == "kind"
+    assert json.loads((tmp_path / "schema.json").read_text()) == result.tables
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+from src.profiler import Profiler
+from src.runner import check_files
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA = str(ROOT / "schema.json")
+CONFIG = str(ROOT / "default_config.yaml")
+
+
+def test_profiled_run_records_stages_and_offenders():
+    profiler = Profiler(top_n=2)
+    files = [str(ROOT / "testing.py"), str(ROOT / "sql_tests.py")]
+
+    plain = list(check_files(files, 1, SCHEMA, CONFIG))
+    profiled = list(check_files(files, 4, SCHEMA, CONFIG, profiler=profiler))
+
+    assert profiled == plain
+    report = json.loads(profiler.format("json"))
+    assert {"read", "parse", "file", "validate", "analyze", "check_tables"} <= set(report["stages"])
+    assert report["stages"]["file"]["calls"] == 2
+    assert len(report["slowest_files"]) == 2
+    assert len(report["slowest_queries"]) == 2
+    assert "query_memo" in report["caches"]
+
+
+def test_detached_profiler_leaves_methods_unwrapped():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    validator.set_profiler(Profiler())
+    assert "validate" in vars(validator)
+
+    validator.set_profiler(None)
+    assert "validate" not in vars(validator)
+    assert validator.validate("SELECT employee_id FROM employees") == []
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+from src.profiler import Profiler
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA = str(ROOT / "schema.json")
+CONFIG = str(ROOT / "default_config.yaml")
+
+
+class SelectStarRule:
+    name = "select_star"
+
+    def __init__(self):
+        self.contexts = []
+
+    def check(self, context):
+        self.contexts.append(context)
+        if context.columns == [] and "*" in context.query:
+            return [{"message": "Avoid SELECT *", "offending": "*", "severity": "warning"}]
+        return []
+
+
+def test_rules_share_one_analysis():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    rule = SelectStarRule()
+    validator.add_rule(rule)
+
+    analyzed = []
+    original = validator.analyze
+    validator.analyze = lambda query: analyzed.append(query) or original(query)
+
+    issues = validator.validate("SELECT * FROM employes WHERE salary = 'high'")
+
+    assert analyzed == ["SELECT * FROM employes WHERE salary = 'high'"]
+    assert [i.message for i in issues][-1] == "Avoid SELECT *"
+    assert rule.contexts[0].tables and rule.contexts[0].valid_tables == []
+
+
+def test_type_rule_uses_resolved_tables():
+    validator = SQLValidator(SCHEMA, CONFIG)
+
+    [warning] = validator.validate("UPDATE public.employees SET employee_id = 'x'")
+    assert warning.severity == "warning"
+    assert warning.offending == "employee_id"
+
+    [warning] = validator.validate("INSERT INTO employees (employee_id) VALUES ('x')")
+    assert warning.offending == "employee_id"
+
+
+def test_disabled_rules_do_not_run(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text((ROOT / "default_config.yaml").read_text().replace(
+        "disabled: []", "disabled: [type_mismatch]"))
+    validator = SQLValidator(SCHEMA, str(config))
+
+    assert [r.name for r in validator.rules] == ["unknown_table", "unknown_column"]
+    assert validator.validate("UPDATE employees SET employee_id = 'x'") == []
+
+
+def test_profiler_times_each_rule():
+    validator = SQLValidator(SCHEMA, CONFIG)
+    profiler = Profiler()
+    validator.set_profiler(profiler)
+    validator.add_rule(SelectStarRule())
+
+    validator.validate("SELECT * FROM employees")
+    stages = json.loads(profiler.format("json"))["stages"]
+
+    assert {"rule.unknown_table", "rule.unknown_column", "rule.type_mismatch", "rule.select_star"} <= set(stages)
+
+    validator.set_profiler(None)
+    assert all("check" not in vars(rule) for rule in validator.rules)
@@ -0,0 +1,132 @@
+import io
+import json
+import sys
+from pathlib import Path
+from src.schema_builder import DDLSchemaBuilder, migration_files
+from src.schema_extractor import SchemaExtractor
+from fake_pg import FakeConnection
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# information_schema.columns for a database restored from fixtures/pg_dump_schema.sql
+DUMP_COLUMNS = [
+    ("audit", "events", "event_id", "bigint", "NO"),
+    ("audit", "events", "kind", "text", "NO"),
+    ("audit", "events", "payload", "jsonb", "YES"),
+    ("audit", "events", "tags", "ARRAY", "YES"),
+    ("audit", "events", "occurredAt", "timestamp with time zone", "NO"),
+    ("public", "departments", "department_id", "integer", "NO"),
+    ("public", "departments", "department_name", "character varying", "NO"),
+    ("public", "departments", "location", "character varying", "YES"),
+    ("public", "departments", "budget", "numeric", "YES"),
+    ("public", "employees", "employee_id", "integer", "NO"),
+    ("public", "employees", "employee_name", "character varying", "NO"),
+    ("public", "employees", "email", "character varying", "YES"),
+    ("public", "employees", "salary", "numeric", "YES"),
+    ("public", "employees", "department_id", "integer", "YES"),
+    ("public", "employees", "current_mood", "USER-DEFINED", "YES"),
+    ("public", "employees", "hired_on", "date", "YES"),
+    ("public", "employees", "is_active", "boolean", "NO"),
+    ("public", "employees", "rating", "double precision", "YES"),
+    ("public", "employees", "updated_at", "timestamp without time zone", "YES"),
+    ("public", "temp_import", "line", "text", "YES"),
+    ("public", "temp_import", "Raw;Value", "text", "YES"),
+]
+
+
+def _build(tmp_path, *inputs, schemas=("public",), **kwargs):
+    builder = DDLSchemaBuilder(schemas=list(schemas))
+    for path in inputs:
+        builder.feed_path(str(path))
+    output = tmp_path / "built.json"
+    builder.save_to_file(str(output), **kwargs)
+    return builder, output
+
+
+def _extract(tmp_path, columns, schemas=("public",), **kwargs):
+    output = tmp_path / "extracted.json"
+    extractor = SchemaExtractor(connection=FakeConnection(columns), schemas=list(schemas))
+    extractor.save_to_file(str(output), **kwargs)
+    return output
+
+
+def test_pg_dump_matches_extracted_snapshot(tmp_path):
+    schemas = ("public", "audit")
+    builder, built = _build(tmp_path, FIXTURES / "pg_dump_schema.sql", schemas=schemas)
+    extracted = _extract(tmp_path, DUMP_COLUMNS, schemas=schemas)
+
+    assert built.read_bytes() == extracted.read_bytes()
+    assert builder.warnings == []
+    # Only public by default; COPY data, comments and function bodies are never applied
+    builder, built = _build(tmp_path, FIXTURES / "pg_dump_schema.sql")
+    assert sorted(json.loads(built.read_text())) == ["departments", "employees", "temp_import"]
+
+
+def test_compiled_and_deduplicated_output_match(tmp_path):
+    _, built = _build(tmp_path, FIXTURES / "pg_dump_schema.sql", compile=True, dedup=True)
+    extracted = _extract(tmp_path, [c for c in DUMP_COLUMNS if c[0] == "public"], compile=True, dedup=True)
+
+    assert built.read_bytes() == extracted.read_bytes()
+    # Identical apart from the source mtime recorded in the header
+    built_snapshot, extracted_snapshot = (p.with_suffix(".pgsg").read_bytes() for p in (built, extracted))
+    assert built_snapshot[:48] + built_snapshot[56:] == extracted_snapshot[:48] + extracted_snapshot[56:]
+
+
+def test_migrations_directory_is_replayed_in_order(tmp_path):
+    migrations = tmp_path / "migrations"
+    migrations.mkdir()
+    (migrations / "1_init.sql").write_text(
+        "CREATE TABLE users (id serial PRIMARY KEY, name varchar(50), nick text);\n"
+        "CREATE TABLE IF NOT EXISTS users (ignored int);\n"
+        "CREATE TABLE \"Zones\" (id int NOT NULL);\n"
+        "CREATE TABLE b_items (id int);\n"
+    )
+    (migrations / "2_orders.sql").write_text(
+        "CREATE TABLE orders (\n"
+        "    order_id bigint GENERATED ALWAYS AS IDENTITY,\n"
+        "    user_id int REFERENCES users(id),\n"
+        "    total numeric(10, 2) NOT NULL DEFAULT 0,\n"
+        "    placed_at timestamptz\n"
+        ");\n"
+    )
+    (migrations / "2_orders.down.sql").write_text("DROP TABLE orders;\n")
+    (migrations / "10_alter.sql").write_text(
+        "ALTER TABLE users ADD COLUMN email varchar(255) NOT NULL, DROP COLUMN nick;\n"
+        "ALTER TABLE users RENAME COLUMN name TO full_name;\n"
+        "ALTER TABLE orders ALTER COLUMN total TYPE float8, ALTER COLUMN placed_at SET NOT NULL;\n"
+        "ALTER TABLE orders RENAME TO purchases;\n"
+        "CREATE TABLE scratch (x int);\n"
+        "DROP TABLE IF EXISTS scratch;\n"
+    )
+    assert [Path(p).name for p in migration_files(str(migrations))] == ["1_init.sql", "2_orders.sql", "10_alter.sql"]
+
+    builder, built = _build(tmp_path, migrations)
+    # The fake orders rows by an en_US-like collation unless asked for code point order
+    extracted = _extract(tmp_path, [
+        ("public", "b_items", "id", "integer", "YES"),
+        ("public", "Zones", "id", "integer", "NO"),
+        ("public", "purchases", "order_id", "bigint", "NO"),
+        ("public", "purchases", "user_id", "integer", "YES"),
+        ("public", "purchases", "total", "double precision", "NO"),
+        ("public", "purchases", "placed_at", "timestamp with time zone", "NO"),
+        ("public", "users", "id", "integer", "NO"),
+        ("public", "users", "full_name", "character varying", "YES"),
+        ("public", "users", "email", "character varying", "NO"),
+    ])
+
+    assert built.read_bytes() == extracted.read_bytes()
+    assert builder.statements == 11
+    assert list(json.loads(built.read_text())) == ["Zones", "b_items", "purchases", "users"]
+
+
+def test_unsupported_statements_are_warnings(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(
+        "CREATE TABLE a (id int);\n"
+        "CREATE TABLE b AS SELECT * FROM a;\n"
+        "CREATE TABLE c OF address_type;\n"
+    ))
+    builder, built = _build(tmp_path, "-")
+
+    assert json.loads(built.read_text()) == {"a": {"columns": [{"name": "id", "type": "integer", "nullable": True}]}}
+    assert len(builder.warnings) == 2
+    assert capsys.readouterr().out.count("⚠️") == 2
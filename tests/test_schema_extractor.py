@@ -0,0 +1,99 @@
+import io
+import json
+from src.schema_extractor import SchemaExtractor, write_schema_json
+from fake_pg import FakeConnection
+
+COLUMNS = [
+    ("public", "employees", "employee_id", "integer", "NO"),
+    ("public", "employees", "employee_name", "character varying", "NO"),
+    ("public", "departments", "department_id", "integer", "NO"),
+    ("public", "departments", "location", "character varying", "YES"),
+    ("audit", "events", "event_id", "bigint", "NO"),
+]
+
+
+def test_bulk_extraction_is_one_round_trip():
+    conn = FakeConnection(COLUMNS, empty_tables=[("public", "placeholder")])
+    extractor = SchemaExtractor(connection=conn, fetch_size=2)
+
+    schema = extractor.extract_schema()
+
+    assert list(schema) == ["departments", "employees", "placeholder"]
+    assert schema["employees"]["columns"] == [
+        {"name": "employee_id", "type": "integer", "nullable": False},
+        {"name": "employee_name", "type": "character varying", "nullable": False},
+    ]
+    assert schema["placeholder"] == {"columns": []}
+    # one DECLARE, then FETCHes and CLOSE — never one query per table
+    assert sum("DECLARE" in q for q in conn.executed) == 1
+
+
+def test_selected_schemas_are_namespaced():
+    extractor = SchemaExtractor(connection=FakeConnection(COLUMNS), schemas=["public", "audit"])
+
+    assert list(extractor.extract_schema()) == ["audit.events", "departments", "employees"]
+
+
+def test_streamed_json_matches_json_dump(tmp_path):
+    extractor = SchemaExtractor(connection=FakeConnection(COLUMNS))
+    out = tmp_path / "schema.json"
+
+    extractor.save_to_file(str(out))
+
+    expected = json.dumps(SchemaExtractor(connection=FakeConnection(COLUMNS)).extract_schema(), indent=2)
+    assert out.read_text() == expected
+
+    empty = io.StringIO()
+    write_schema_json([], empty)
+    assert empty.getvalue() == "{}"
+
+
+def test_refresh_re_extracts_only_changed_tables(tmp_path):
+    out = tmp_path / "schema.json"
+    SchemaExtractor(connection=FakeConnection(COLUMNS)).save_to_file(str(out))
+
+    changed = [c for c in COLUMNS if c[1] != "departments"] + [
+        ("public", "departments", "department_id", "bigint", "NO"),
+        ("public", "projects", "project_id", "integer", "NO"),
+    ]
+    changed = [c for c in changed if c[2] != "employee_name"]
+    conn = FakeConnection(changed)
+
+    diff = SchemaExtractor(connection=conn).refresh(str(out))
+
+    assert diff["added"] == ["projects"]
+    assert diff["removed"] == []
+    assert diff["changed"] == {
+        "departments": {"added_columns": [], "removed_columns": ["location"], "modified_columns": ["department_id"]},
+        "employees": {"added_columns": [], "removed_columns": ["employee_name"], "modified_columns": []},
+    }
+    assert json.loads(out.read_text()) == SchemaExtractor(connection=FakeConnection(changed)).extract_schema()
+
+    # Nothing changed → no column extraction at all
+    conn = FakeConnection(changed)
+    diff = SchemaExtractor(connection=conn).refresh(str(out))
+    assert diff == {"added": [], "removed": [], "changed": {}}
+    assert not any("information_schema" in q for q in conn.executed)
+
+
+def test_refresh_drops_removed_tables(tmp_path):
+    out = tmp_path / "schema.json"
+    SchemaExtractor(connection=FakeConnection(COLUMNS)).save_to_file(str(out))
+
+    remaining = [c for c in COLUMNS if c[1] != "employees"]
+    diff = SchemaExtractor(connection=FakeConnection(remaining)).refresh(str(out))
+
+    assert diff["removed"] == ["employees"]
+    assert list(json.loads(out.read_text())) == ["departments"]
+
+
+def test_tables_are_ordered_by_code_point(tmp_path):
+    columns = [("public", t, "id", "integer", "NO") for t in ("b_items", "Zones", "bitems", "alpha", "Beta")]
+    out = tmp_path / "schema.json"
+    SchemaExtractor(connection=FakeConnection(columns)).save_to_file(str(out))
+    written = out.read_bytes()
+
+    assert list(json.loads(written)) == ["Beta", "Zones", "alpha", "b_items", "bitems"]
+    # Same order as refresh's: an unchanged database never rewrites the snapshot
+    SchemaExtractor(connection=FakeConnection(columns)).refresh(str(out))
+    assert out.read_bytes() == written
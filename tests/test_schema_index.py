@@ -0,0 +1,119 @@
+import json
+from itertools import product
+from src.model import schema_object
+from src.schema_index import SQL_TYPE_GROUPS, SchemaIndex
+
+SCHEMA_JSON = {
+    "departments": {"columns": [
+        {"name": "department_id", "type": "integer", "nullable": False},
+        {"name": "location", "type": "character varying", "nullable": True},
+    ]},
+    "employees": {"columns": [
+        {"name": "employee_id", "type": "integer", "nullable": False},
+        {"name": "Email", "type": "text", "nullable": True},
+        {"name": "is_active", "type": "boolean", "nullable": False},
+        {"name": "rating", "type": "double precision", "nullable": True},
+        {"name": "department_id", "type": "bigint", "nullable": True},
+        {"name": "payload", "type": "jsonb", "nullable": True},
+    ]},
+    "Audit": {"columns": [{"name": "id", "type": "int4", "nullable": False}]},
+    "sales.orders": {"columns": [
+        {"name": "order_id", "type": "integer", "nullable": False},
+        {"name": "location", "type": "varchar(20)", "nullable": True},
+    ]},
+}
+
+TABLES = ["employees", "departments", "Audit", "audit", "EMPLOYEES", "public.employees",
+          "sales.orders", "orders", "sales.employees", "other.employees", "missing", "a.b.c"]
+COLUMNS = ["employee_id", "Email", "email", "location", "LOCATION", "order_id", "id",
+           "department_id", "payload", "nope"]
+
+
+def _index():
+    return SchemaIndex(json.loads(json.dumps(SCHEMA_JSON), object_pairs_hook=schema_object))
+
+
+# The list scans SchemaIndex replaced (pre-index SQLValidator), over the plain dict
+def _scan_columns(tables):
+    cols = []
+    for t in tables:
+        if t in SCHEMA_JSON:
+            cols.extend(c["name"] for c in SCHEMA_JSON[t]["columns"])
+    return cols
+
+
+def _scan_type(table, column):
+    for c in SCHEMA_JSON.get(table, {"columns": []})["columns"]:
+        if c["name"] == column:
+            return c["type"]
+    return None
+
+
+def _scan_is_compatible(column_type, literal_group):
+    column_type = column_type.lower()
+    if column_type.startswith("character") or column_type.startswith("varchar"):
+        column_type = "varchar"
+    elif column_type.startswith("int"):
+        column_type = "integer"
+    elif column_type.startswith("bool"):
+        column_type = "boolean"
+    elif column_type.startswith("double"):
+        column_type = "double"
+    for group, types in SQL_TYPE_GROUPS.items():
+        if column_type in types:
+            return group == literal_group
+    return True
+
+
+def test_resolve_qualified_and_unqualified_names():
+    index = _index()
+
+    assert index.resolve("employees") == "employees"
+    assert index.resolve("public.employees") == "employees"
+    assert index.resolve("sales.orders") == "sales.orders"
+    # A schema with entries of its own never falls back to the default schema
+    assert index.resolve("sales.employees") is None
+    # Schemas the snapshot does not know (single-schema snapshot): bare name
+    assert index.resolve("other.employees") == "employees"
+    assert index.resolve("orders") is None
+    assert index.resolve("missing") is None
+    assert index.resolve("public.missing") is None
+
+
+def test_names_are_case_sensitive_like_the_list_scan():
+    index = _index()
+
+    for table in TABLES:
+        assert (table in index.tables) == (table in list(SCHEMA_JSON)), table
+    assert index.resolve("Audit") == "Audit"
+    assert index.resolve("audit") is None
+    assert index.resolve("EMPLOYEES") is None
+    assert index.has_column(["employees"], "Email")
+    assert not index.has_column(["employees"], "email")
+
+
+def test_lookups_match_list_scans():
+    index = _index()
+    table_sets = [[t] for t in TABLES] + [["employees", "departments"], ["missing", "sales.orders"], []]
+
+    for tables, column in product(table_sets, COLUMNS):
+        assert index.has_column(tables, column) == (column in _scan_columns(tables)), (tables, column)
+    for tables in table_sets:
+        assert index.columns_of(tables) == _scan_columns(tables), tables
+
+    for table, column in product(TABLES, COLUMNS):
+        assert index.column_type(table, column) == _scan_type(table, column), (table, column)
+        if _scan_type(table, column) is not None:
+            for group in ("numeric", "string", "boolean"):
+                expected = _scan_is_compatible(_scan_type(table, column), group)
+                assert index.is_compatible(table, column, group) == expected, (table, column, group)
+
+
+def test_column_origins_and_order():
+    index = _index()
+
+    assert index.origin_tables("location") == ["departments", "sales.orders"]
+    assert index.origin_tables("department_id") == ["departments", "employees"]
+    assert index.origin_tables("nope") == []
+    assert list(index.all_columns) == [c["name"] for t in SCHEMA_JSON.values() for c in t["columns"]]
+    assert index.table_names == tuple(SCHEMA_JSON)
@@ -0,0 +1,85 @@
+import io
+import json
+from pathlib import Path
+from src.server import INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, ValidationServer
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA = str(ROOT / "schema.json")
+CONFIG = str(ROOT / "default_config.yaml")
+
+SOURCE = '''\
+import db
+
+
+class Repo:
+    def first(self):
+        return db.execute("SELECT employee_name FROM employees")
+
+    def second(self):
+        x = 1
+        return db.execute("SELECT employe_name FROM employees")
+
+
+TOTAL = "SELECT salary FROM employes"
+'''
+
+
+def _edit(text, line, new_lines, remove=0):
+    lines = text.splitlines(True)
+    lines[line - 1:line - 1 + remove] = new_lines
+    return "".join(lines)
+
+
+def test_server_validates_ranges_incrementally():
+    server = ValidationServer(SCHEMA, CONFIG)
+
+    def call(params):
+        request = {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": params}
+        return server.handle(json.dumps(request))["result"]
+
+    call({"file": "app.py", "text": SOURCE})
+    text = _edit(SOURCE, 13, ['TOTAL = "SELECT salary FROM employees"\n'], remove=1)
+    result = call({"file": "app.py", "text": text, "range": {"start": 13, "end": 13}})
+
+    assert result["syntaxError"] is None
+    assert [e["line"] for e in result["errors"]] == [10]
+
+
+def test_server_reports_bad_params_and_internal_errors_apart():
+    server = ValidationServer(SCHEMA, CONFIG)
+
+    def code(params):
+        request = {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": params}
+        return server.handle(json.dumps(request))["error"]["code"]
+
+    assert code(["app.py"]) == INVALID_PARAMS
+    assert code({}) == INVALID_PARAMS
+    assert code({"file": "app.py", "text": 3}) == INVALID_PARAMS
+    assert code({"file": "app.py", "text": SOURCE, "range": {"start": "1", "end": 1}}) == INVALID_PARAMS
+
+    def fail(*args):
+        raise KeyError("columns")
+
+    server.validator.validate = fail  # a bug inside the handler, not the caller's fault
+    assert code({"file": "app.py", "text": SOURCE}) == INTERNAL_ERROR
+
+
+def test_dispatch_and_notifications():
+    server = ValidationServer(SCHEMA, CONFIG)
+
+    assert server.handle("{not json")["error"]["code"] == PARSE_ERROR
+    assert server.handle(json.dumps({"id": 1, "method": 3}))["error"]["code"] == INVALID_REQUEST
+    assert server.handle(json.dumps({"id": 2, "method": "nope"}))["error"]["code"] == METHOD_NOT_FOUND
+    assert server.handle(json.dumps({"method": "close", "params": {"file": "a.py"}})) is None  # notification
+
+    stdin = io.StringIO(
+        json.dumps({"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"file": "a.py", "text": SOURCE}})
+        + "\n\n" + json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}) + "\n"
+        + json.dumps({"jsonrpc": "2.0", "id": 3, "method": "reload"}) + "\n"
+    )
+    stdout = io.StringIO()
+    server.serve(stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2]  # nothing read after shutdown
+    assert [e["line"] for e in responses[0]["result"]["errors"]] == [10, 13]
@@ -0,0 +1,89 @@
+import json
+import os
+from pathlib import Path
+from src.model import Table
+from src.schema_extractor import SchemaExtractor
+from src.snapshot import CompiledSchema, compile_schema, load_schema, snapshot_path
+from src.validator import SQLValidator
+from fake_pg import FakeConnection
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _write_schema(tmp_path, schema):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(schema, indent=2))
+    return path
+
+
+def test_compiled_snapshot_round_trips(tmp_path):
+    schema = json.loads((ROOT / "schema.json").read_text())
+    schema["ünïcode"] = {"columns": [{"name": "näme", "type": "text", "nullable": None}]}
+    schema["empty"] = {"columns": []}
+    path = _write_schema(tmp_path, schema)
+
+    compiled = CompiledSchema(compile_schema(path))
+
+    assert list(compiled) == list(schema)
+    assert {t: compiled[t].to_dict() for t in compiled} == schema
+
+
+def test_tables_are_decoded_on_first_access(tmp_path):
+    path = _write_schema(tmp_path, json.loads((ROOT / "schema.json").read_text()))
+    compiled = CompiledSchema(compile_schema(path))
+
+    assert "employees" in compiled and "nope" not in compiled
+    assert compiled.decoded_tables() == 0
+    compiled["employees"]
+    assert compiled.decoded_tables() == 1
+
+
+def test_stale_snapshot_falls_back_to_json(tmp_path):
+    path = _write_schema(tmp_path, {"a": {"columns": []}})
+    compile_schema(path)
+    assert isinstance(load_schema(path), CompiledSchema)
+
+    path.write_text(json.dumps({"b": {"columns": []}}, indent=2))
+    os.utime(path, ns=(0, 0))
+
+    assert load_schema(path) == {"b": Table([])}
+
+
+def test_same_size_rewrite_with_restored_mtime_is_stale(tmp_path):
+    path = _write_schema(tmp_path, {"a": {"columns": []}})
+    compile_schema(path)
+    stat = path.stat()
+
+    path.write_text(json.dumps({"b": {"columns": []}}, indent=2))  # same size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # touch -r
+
+    assert path.stat().st_size == stat.st_size
+    assert load_schema(path) == {"b": Table([])}
+
+
+def test_validator_reports_same_issues_from_snapshot(tmp_path):
+    path = _write_schema(tmp_path, json.loads((ROOT / "schema.json").read_text()))
+    config = str(ROOT / "default_config.yaml")
+    query = "SELECT employe_name FROM employes WHERE salary = 'x'"
+
+    expected = SQLValidator(str(path), config).validate(query, "f.py", 1)
+    compile_schema(path)
+    validator = SQLValidator(str(path), config)
+
+    assert isinstance(validator.schema, CompiledSchema)
+    assert validator.validate(query, "f.py", 1) == expected
+
+
+def test_extractor_writes_snapshot_in_same_pass(tmp_path):
+    conn = FakeConnection([
+        ("public", "employees", "employee_id", "integer", "NO"),
+        ("public", "departments", "location", "character varying", "YES"),
+    ])
+    out = tmp_path / "schema.json"
+
+    SchemaExtractor(connection=conn).save_to_file(str(out), compile=True)
+
+    compiled = load_schema(out)
+    assert isinstance(compiled, CompiledSchema)
+    assert snapshot_path(out).exists()
+    assert {t: compiled[t].to_dict() for t in compiled} == json.loads(out.read_text())
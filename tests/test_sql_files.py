@@ -0,0 +1,111 @@
+import io
+import json
+import tracemalloc
+from pathlib import Path
+from click.testing import CliRunner
+from src.cli import cli
+from src.sql_splitter import SQLFileParser, iter_statements, split_statements
+from src.validator import SQLValidator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = """\
+-- migration 042
+BEGIN;
+SELECT 'a;b' AS x, "odd;name" FROM employees; /* c; */ SELECT 2;
+
+CREATE FUNCTION f() RETURNS int AS $body$
+  SELECT 1; -- inside the body
+$body$ LANGUAGE sql;
+/* outer /* nested; */ still comment; */
+\\connect other
+COPY public.employees (employee_id) FROM stdin;
+1;2
+\\.
+UPDATE employees
+   SET salary = 1,
+       employee_name = 'x'
+"""
+
+
+def test_statements_and_line_numbers():
+    statements = list(iter_statements(io.StringIO(SCRIPT)))
+
+    assert statements == [
+        (2, "BEGIN"),
+        (3, "SELECT 'a;b' AS x, \"odd;name\" FROM employees"),
+        (3, "SELECT 2"),
+        (5, "CREATE FUNCTION f() RETURNS int AS $body$\n  SELECT 1; -- inside the body\n$body$ LANGUAGE sql"),
+        (10, "COPY public.employees (employee_id) FROM stdin"),
+        (13, "UPDATE employees\n   SET salary = 1,\n       employee_name = 'x'"),
+    ]
+
+
+def test_overlong_statements_are_skipped_not_buffered():
+    lines = ["SELECT 1;\n", "INSERT INTO t VALUES\n"] + ["(1),\n"] * 100 + ["(1);\n", "SELECT 2;\n"]
+
+    assert list(iter_statements(lines, max_chars=200)) == [(1, "SELECT 1"), (2, None), (104, "SELECT 2")]
+
+
+def test_memory_stays_flat_for_large_files(tmp_path):
+    path = tmp_path / "dump.sql"
+    with open(path, "w") as f:
+        for i in range(50_000):
+            f.write(f"-- row {i}\nINSERT INTO employees (employee_id) VALUES ({i});\n")
+    assert path.stat().st_size > 2_500_000
+
+    tracemalloc.start()
+    count = sum(1 for _ in SQLFileParser(str(path)).iter_queries())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 50_000
+    assert peak < 200_000
+
+
+def test_check_sql_file_reports_statement_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    path = tmp_path / "migration.sql"
+    path.write_text(SCRIPT.replace("salary = 1", "salry = 1").replace("FROM employees;", "FROM employes;"))
+
+    result = CliRunner().invoke(cli, ["check", str(path), "--json-output", "--no-cache"])
+    errors = json.loads(result.stdout)["errors"]
+
+    assert [(e["line"], e["offending"]) for e in errors] == [(3, "employes"), (13, "salry")]
+
+
+def test_every_statement_of_a_python_string_is_checked():
+    validator = SQLValidator(str(ROOT / "schema.json"), str(ROOT / "default_config.yaml"))
+    query = "SELECT employee_name FROM employees;\n\nSELECT salry FROM employees;\nDELETE FROM employes;"
+
+    errors = validator.validate(query, "app.py", 10)
+
+    assert [(e.line, e.offending) for e in errors] == [(12, "salry"), (13, "employes")]
+    assert split_statements("SELECT 1; SELECT ';'") == [(0, "SELECT 1"), (0, "SELECT ';'")]
+
+
+def test_cache_keeps_sql_and_python_files_apart(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    content = "SELECT salry FROM employees;\n"
+    (tmp_path / "a.sql").write_text(content)
+    (tmp_path / "b.py").write_text(content)  # same bytes: not valid Python, no queries
+
+    def errors(name):
+        result = CliRunner().invoke(cli, ["check", str(tmp_path / name), "--json-output",
+                                          "--cache-dir", str(tmp_path / "cache")])
+        return [e["offending"] for e in json.loads(result.stdout)["errors"]]
+
+    assert errors("a.sql") == ["salry"]
+    assert errors("b.py") == []
+
+
+def test_memoized_statement_offsets_follow_multi_line_literals():
+    validator = SQLValidator(str(ROOT / "schema.json"), str(ROOT / "default_config.yaml"))
+    one_line = "SELECT employee_name FROM employees WHERE employee_name = 'x';\nSELECT salry FROM employees"
+    two_lines = "SELECT employee_name FROM employees WHERE employee_name = 'a\nb';\nSELECT salry FROM employees"
+
+    def salry_lines(query):
+        return [e.line for e in validator.validate(query, "app.py", 10) if e.offending == "salry"]
+
+    assert salry_lines(one_line) == [11]
+    assert salry_lines(two_lines) == [12]  # not the memoized offset of one_line
@@ -0,0 +1,59 @@
+# Start-up budget: the CLI must not pay for modules its code path does not use.
+# Import costs are read from `python -X importtime` (microseconds, on stderr).
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of src.cli (click included), generous for slow CI machines
+IMPORT_BUDGET_MS = 250
+
+HEAVY = ("sqlparse", "yaml", "difflib", "src.fuzzy", "src.validator", "multiprocessing")
+
+
+def _importtime(*args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative, proc.stdout
+
+
+def _heavy(modules):
+    return sorted(m for m in modules if m.split(".")[0] in HEAVY or m in HEAVY)
+
+
+def test_cli_import_within_budget():
+    modules, _ = _importtime("-c", "import src.cli")
+
+    assert _heavy(modules) == []
+    assert modules["src.cli"] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_file_without_sql_never_imports_sqlparse(tmp_path):
+    source = tmp_path / "plain.py"
+    source.write_text("def add(a, b):\n    return a + b\n")
+
+    modules, out = _importtime("-m", "src.cli", "check", str(source), "--no-cache")
+
+    assert "No SQL issues" in out
+    assert _heavy(modules) == []
+
+
+def test_cache_hit_never_imports_sqlparse(tmp_path):
+    args = ["-m", "src.cli", "check", "testing.py", "--cache-dir", str(tmp_path / "cache")]
+
+    cold, first = _importtime(*args)
+    warm, second = _importtime(*args)
+
+    assert "sqlparse" in cold
+    assert second == first
+    assert _heavy(warm) == []
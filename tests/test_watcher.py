@@ -0,0 +1,92 @@
+import json
+import shutil
+from pathlib import Path
+import pytest
+from src.watcher import InotifySource, Watcher
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GOOD = 'q = "SELECT employee_name FROM employees"\n'
+BAD = 'q = "SELECT employe_name FROM employees"\n'
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def project(request, tmp_path, monkeypatch):
+    shutil.copy(ROOT / "schema.json", tmp_path / "schema.json")
+    shutil.copy(ROOT / "default_config.yaml", tmp_path / "default_config.yaml")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "a.py").write_text(BAD)
+    (tmp_path / "app" / "b.py").write_text(GOOD)
+    monkeypatch.chdir(tmp_path)
+
+    lines = []
+    watcher = Watcher(Path("app"), polling=request.param == "polling", debounce=0.05, echo=lines.append)
+    if watcher.backend != request.param:
+        watcher.source.close()
+        pytest.skip("inotify not available")
+    if watcher.backend == "polling":
+        watcher.source.interval = 0.02
+    watcher.start()
+    yield watcher, lines
+    watcher.source.close()
+
+
+def _changes(watcher, lines):
+    del lines[:]
+    assert watcher.poll(timeout=5)
+    return [line for line in lines if line[0] in "+-"]
+
+
+def test_prints_only_changed_diagnostics(project):
+    watcher, lines = project
+    assert lines[0].startswith("app/a.py:1 → Column 'employe_name' not found")
+    assert "2 files, 1 issues" in lines[-1]
+
+    Path("app/b.py").write_text("\n" + BAD)
+    assert _changes(watcher, lines) == ["+ app/b.py:2 → Column 'employe_name' not found (suggest: employee_name)"]
+
+    # The same issue moving down a line is not a change
+    Path("app/b.py").write_text("\n\n" + BAD)
+    assert _changes(watcher, lines) == []
+
+    Path("app/a.py").unlink()
+    Path("app/sub").mkdir()
+    Path("app/sub/c.sql").write_text("SELECT salry FROM employees;\n")
+    changes = _changes(watcher, lines)
+    while not any("c.sql" in line for line in changes):  # the new directory may come in a second batch
+        changes += _changes(watcher, lines)
+    assert sorted(changes) == [
+        "+ app/sub/c.sql:1 → Column 'salry' not found (suggest: salary)",
+        "- app/a.py:1 → Column 'employe_name' not found (suggest: employee_name)",
+    ]
+
+
+def test_schema_change_reloads_and_rechecks(project):
+    watcher, lines = project
+
+    schema = json.loads(Path("schema.json").read_text())
+    schema["employees"]["columns"].append({"name": "employe_name", "type": "text", "nullable": True})
+    Path("schema.json").write_text(json.dumps(schema))
+
+    changes = _changes(watcher, lines)
+    assert "🔄 Reloaded schema/config" in lines
+    assert changes == ["- app/a.py:1 → Column 'employe_name' not found (suggest: employee_name)"]
+
+    Path("schema.json").write_text("{ half written")
+    _changes(watcher, lines)
+    assert lines[0].startswith("❌ Could not reload schema/config")
+    assert watcher.checker.validator.index.resolve("employees") == "employees"
+
+
+def test_inotify_reports_source_files_only(tmp_path):
+    try:
+        source = InotifySource(tmp_path)
+    except OSError:
+        pytest.skip("inotify not available")
+    try:
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "m.py").write_text("x = 1\n")
+        changed = source.wait(5) or source.wait(5)  # notes.txt may arrive in a batch of its own
+        assert changed == {str(tmp_path / "m.py")}
+    finally:
+        source.close()